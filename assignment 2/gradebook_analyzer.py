@@ -3,7 +3,31 @@
 # Course: Ai/ML
 # Title: Analyzing and Reporting Student Grades
 
+import argparse
+import json
+import math
 import statistics
+import sys
+from collections import Counter
+
+# Lowest mark for each grade, best grade first; marks below every cut-off get FAIL_GRADE
+DEFAULT_CUTOFFS = {"A": 90, "B": 80, "C": 70, "D": 60}
+FAIL_GRADE = "F"
+PASS_MARK = 40
+
+# Default column names of a batch CSV (matched case-insensitively); course is optional
+NAME_COLUMN = "Name"
+MARKS_COLUMN = "Marks"
+COURSE_COLUMN = "Course"
+
+# Batch mode reads CSVs this many rows at a time
+CHUNK_ROWS = 1_000_000
+# Marks kept per course for exact percentiles; beyond that they are sketched
+EXACT_LIMIT = 10_000
+# Bin width of sketched percentiles, which are within half a bin of the exact value
+SKETCH_RESOLUTION = 0.01
+# Format version of files written by --save-stats
+STATS_VERSION = 1
 
 def display_welcome_message():
     """Display welcome message and main menu"""
@@ -114,44 +138,64 @@ def display_statistics(marks_dict):
     print("="*60 + "\n")
 
 
-def assign_grade(marks):
+def grade_labels(cutoffs=DEFAULT_CUTOFFS):
+    """Return all grades, best first: the cut-off grades followed by FAIL_GRADE"""
+    return list(cutoffs) + [FAIL_GRADE]
+
+
+def parse_cutoffs(text):
     """
-    Assign grade based on marks using if-elif-else logic.
-    A: 90+, B: 80-89, C: 70-79, D: 60-69, F: <60
+    Parse cut-offs like "A=90,B=80,C=70,D=60" (best grade first) into a dict.
+    Marks below the last cut-off get FAIL_GRADE.
     """
-    if marks >= 90:
-        return "A"
-    elif marks >= 80:
-        return "B"
-    elif marks >= 70:
-        return "C"
-    elif marks >= 60:
-        return "D"
-    else:
-        return "F"
+    cutoffs = {}
+    for part in text.split(","):
+        grade, sep, value = part.partition("=")
+        grade = grade.strip()
+        if not sep or not grade:
+            raise ValueError(f"Cut-off {part.strip()!r} must look like GRADE=MARK")
+        try:
+            cutoffs[grade] = float(value)
+        except ValueError:
+            raise ValueError(f"Cut-off mark for grade {grade} must be a number, got {value.strip()!r}")
+
+    values = list(cutoffs.values())
+    if any(low >= high for high, low in zip(values, values[1:])):
+        raise ValueError("Cut-offs must be listed from the best grade down, with decreasing marks")
+    if FAIL_GRADE in cutoffs:
+        raise ValueError(f"Grade {FAIL_GRADE} is given to marks below every cut-off and cannot have one")
+    return cutoffs
+
+
+def assign_grade(marks, cutoffs=DEFAULT_CUTOFFS):
+    """
+    Assign grade based on marks, checking the cut-offs from the best grade down.
+    Default: A: 90+, B: 80-89, C: 70-79, D: 60-69, F: <60
+    """
+    for grade, cutoff in cutoffs.items():
+        if marks >= cutoff:
+            return grade
+    return FAIL_GRADE
 
 
-def calculate_grades(marks_dict):
+def calculate_grades(marks_dict, cutoffs=DEFAULT_CUTOFFS):
     """
     Create and return dictionary with student names and their grades.
     """
-    grades = {name: assign_grade(mark) for name, mark in marks_dict.items()}
+    grades = {name: assign_grade(mark, cutoffs) for name, mark in marks_dict.items()}
     return grades
 
 
-def display_grade_distribution(grades):
+def display_grade_distribution(grades, labels=None):
     """Display count of students per grade category"""
-    grade_count = {}
-    
-    for grade in ["A", "B", "C", "D", "F"]:
-        count = list(grades.values()).count(grade)
-        grade_count[grade] = count
+    # One pass over the grades instead of one count() per grade
+    grade_count = Counter(grades.values())
     
     print("\n" + "="*60)
     print("GRADE DISTRIBUTION")
     print("="*60)
     
-    for grade in ["A", "B", "C", "D", "F"]:
+    for grade in labels or grade_labels():
         print(f"Grade {grade}: {grade_count[grade]} student(s)")
     
     print("="*60 + "\n")
@@ -221,8 +265,537 @@ def analyze_gradebook(marks_dict):
     display_results_table(marks_dict, grades)
 
 
-def main():
+# ---------- Batch mode: whole CSV exports, graded with numpy/pandas ----------
+
+def grade_indices(marks, cutoffs=DEFAULT_CUTOFFS):
+    """
+    Vectorized assign_grade: for a numpy array of marks, return each mark's
+    position in grade_labels(cutoffs) (0 = best grade), by a binary search of
+    the cut-offs instead of an if/elif chain per mark.
+    """
+    import numpy as np
+
+    ascending = np.array(list(cutoffs.values()), dtype=float)[::-1]
+    # Number of cut-offs at or below each mark; none -> FAIL_GRADE (last position)
+    reached = np.searchsorted(ascending, marks, side="right")
+    return len(ascending) - reached
+
+
+class MarkStats:
+    """
+    One-pass, mergeable statistics of a stream of marks (each within 0-100).
+
+    Count, mean, variance, min, max, the pass count and the grade histogram
+    are exact however many marks are added. Percentiles are exact while at
+    most exact_limit marks have been seen; beyond that the marks are counted
+    in a histogram of `resolution`-wide bins over 0-100 instead of being kept,
+    so memory stays fixed and every percentile is within resolution / 2 of
+    the exact one.
+
+    Accumulators with the same cut-offs, pass mark and resolution combine
+    with merge(), so statistics of separate shards (e.g. one per school) add
+    up to the statistics of all their marks.
+    """
+
+    def __init__(self, cutoffs=DEFAULT_CUTOFFS, pass_mark=PASS_MARK,
+                 exact_limit=EXACT_LIMIT, resolution=SKETCH_RESOLUTION):
+        import numpy as np
+
+        if not 0 < resolution <= 100:
+            raise ValueError(f"Resolution must be above 0 and at most 100, got {resolution}")
+        self.cutoffs = dict(cutoffs)
+        self.pass_mark = pass_mark
+        self.exact_limit = exact_limit
+        self.resolution = resolution
+        self.count = 0
+        self.mean = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.passed = 0
+        self.grade_counts = np.zeros(len(self.cutoffs) + 1, dtype=np.int64)
+        # Sum of squared deviations from the mean
+        self._m2 = 0.0
+        # Arrays of the marks while percentiles are exact, then bin counts instead
+        self._exact = []
+        self._sketch = None
+
+    @property
+    def is_exact(self):
+        """True while percentiles are computed from the marks themselves"""
+        return self._sketch is None
+
+    @property
+    def variance(self):
+        """Population variance of the marks"""
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def std_dev(self):
+        return math.sqrt(self.variance)
+
+    def compatible(self, other):
+        """True if other grades marks the same way, so the two can be merged"""
+        return (list(self.cutoffs.items()), self.pass_mark, self.resolution) == \
+            (list(other.cutoffs.items()), other.pass_mark, other.resolution)
+
+    def _add_moments(self, count, mean, m2):
+        # Chan et al.'s update: the count, mean and M2 of the union of two disjoint sets
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def _to_sketch(self):
+        import numpy as np
+
+        if self._sketch is None:
+            self._sketch = np.zeros(int(round(100 / self.resolution)) + 1, dtype=np.int64)
+            kept, self._exact = self._exact, []
+            for marks in kept:
+                self._add_to_sketch(marks)
+
+    def _add_to_sketch(self, marks):
+        import numpy as np
+
+        bins = np.rint(marks / self.resolution).astype(np.int64)
+        self._sketch += np.bincount(bins, minlength=len(self._sketch))
+
+    def update(self, marks):
+        """Add a mark or a numpy array of marks; returns self"""
+        import numpy as np
+
+        marks = np.atleast_1d(np.asarray(marks, dtype=float))
+        if len(marks) == 0:
+            return self
+        mean = float(marks.mean())
+        self._add_moments(len(marks), mean, float(np.square(marks - mean).sum()))
+        self.min = min(self.min, float(marks.min()))
+        self.max = max(self.max, float(marks.max()))
+        self.passed += int(np.count_nonzero(marks >= self.pass_mark))
+        self.grade_counts += np.bincount(grade_indices(marks, self.cutoffs), minlength=len(self.grade_counts))
+
+        if self._sketch is None and self.count <= self.exact_limit:
+            # Copied so a slice of a large chunk does not keep the whole chunk alive
+            self._exact.append(marks.copy())
+        else:
+            self._to_sketch()
+            self._add_to_sketch(marks)
+        return self
+
+    def merge(self, other):
+        """Add the marks of another compatible accumulator to this one; returns self"""
+        if not self.compatible(other):
+            raise ValueError("Only statistics with the same cut-offs, pass mark and resolution can be merged")
+        if not other.count:
+            return self
+        self._add_moments(other.count, other.mean, other._m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.passed += other.passed
+        self.grade_counts += other.grade_counts
+
+        if self._sketch is None and other._sketch is None and self.count <= self.exact_limit:
+            # Kept arrays are never modified in place, so they can be shared
+            self._exact.extend(other._exact)
+        else:
+            self._to_sketch()
+            if other._sketch is None:
+                for marks in other._exact:
+                    self._add_to_sketch(marks)
+            else:
+                self._sketch += other._sketch
+        return self
+
+    def percentile(self, q):
+        """
+        The q-th percentile (0-100) of the marks, interpolated between the two
+        nearest marks like numpy.percentile (so the 50th is the median as
+        statistics.median computes it).
+        """
+        import numpy as np
+
+        if not self.count:
+            raise ValueError("No marks have been added")
+        if not 0 <= q <= 100:
+            raise ValueError(f"Percentile must be between 0 and 100, got {q}")
+        if self._sketch is None:
+            if len(self._exact) > 1:
+                self._exact = [np.concatenate(self._exact)]
+            return float(np.percentile(self._exact[0], q))
+
+        # The marks ranked either side of the percentile lie in the bins where
+        # the running count first passes their rank; take those bins' centres
+        position = q / 100 * (self.count - 1)
+        ranks = [math.floor(position), math.ceil(position)]
+        low, high = np.searchsorted(np.cumsum(self._sketch), ranks, side="right") * self.resolution
+        value = low + (high - low) * (position - ranks[0])
+        return float(min(max(value, self.min), self.max))
+
+    def median(self):
+        return self.percentile(50)
+
+    def to_dict(self):
+        """The state as plain JSON-serializable data (see from_dict)"""
+        import numpy as np
+
+        state = {
+            "cutoffs": self.cutoffs,
+            "pass_mark": self.pass_mark,
+            "exact_limit": self.exact_limit,
+            "resolution": self.resolution,
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self._m2,
+            "min": self.min,
+            "max": self.max,
+            "passed": self.passed,
+            "grade_counts": self.grade_counts.tolist(),
+        }
+        if self._sketch is None:
+            state["marks"] = np.concatenate(self._exact).tolist() if self._exact else []
+        else:
+            # Only the occupied bins, as [bin numbers, counts]
+            bins = np.flatnonzero(self._sketch)
+            state["sketch"] = [bins.tolist(), self._sketch[bins].tolist()]
+        return state
+
+    @classmethod
+    def from_dict(cls, state):
+        import numpy as np
+
+        stats = cls(state["cutoffs"], state["pass_mark"], state["exact_limit"], state["resolution"])
+        stats.count = state["count"]
+        stats.mean = state["mean"]
+        stats._m2 = state["m2"]
+        stats.min = state["min"]
+        stats.max = state["max"]
+        stats.passed = state["passed"]
+        stats.grade_counts = np.array(state["grade_counts"], dtype=np.int64)
+        if "sketch" in state:
+            stats._sketch = np.zeros(int(round(100 / stats.resolution)) + 1, dtype=np.int64)
+            bins, counts = state["sketch"]
+            stats._sketch[bins] = counts
+        elif state["marks"]:
+            stats._exact = [np.array(state["marks"], dtype=float)]
+        return stats
+
+
+def merge_course_stats(stats, other, make_stats):
+    """
+    Merge other (course -> MarkStats) into stats, adding courses it does not
+    have yet as fresh accumulators from make_stats() (which also checks that
+    other's statistics are compatible).
+    """
+    for course, course_stats in other.items():
+        if course not in stats:
+            stats[course] = make_stats()
+        stats[course].merge(course_stats)
+    return stats
+
+
+def save_course_stats(stats, path):
+    """Save course -> MarkStats as JSON, for merging later with load_course_stats"""
+    state = {"version": STATS_VERSION, "courses": {course: s.to_dict() for course, s in stats.items()}}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+
+
+def load_course_stats(path):
+    """Load course -> MarkStats saved by save_course_stats"""
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    if not isinstance(state, dict) or state.get("version") != STATS_VERSION:
+        raise ValueError(f"{path} is not a statistics file saved by this version of the analyzer")
+    try:
+        return {course: MarkStats.from_dict(s) for course, s in state["courses"].items()}
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"{path} has malformed statistics ({e!r})")
+
+
+def _find_column(columns, wanted, required=True):
+    matches = [c for c in columns if str(c).strip().lower() == wanted.lower()]
+    if not matches:
+        if required:
+            raise ValueError(f"Column '{wanted}' not found (columns: {', '.join(map(str, columns))})")
+        return None
+    return matches[0]
+
+
+def _clean_chunk(df, names, marks, course):
+    """
+    (DataFrame with 'course', 'name' (if names) and 'marks', rows dropped) for
+    one chunk read by iter_marks_csv.
+    """
+    import numpy as np
+    import pandas as pd
+
+    marks_values = pd.to_numeric(df[marks], errors="coerce")
+    valid = marks_values.between(0, 100).to_numpy()
+
+    if course is not None:
+        courses = df[course]
+        valid = valid & courses.notna().to_numpy()
+    else:
+        courses = pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), categories=["All"])
+    columns = {"course": courses}
+    if names is not None:
+        columns["name"] = df[names]
+    columns["marks"] = marks_values.to_numpy(dtype=float)
+    result = pd.DataFrame(columns)[valid]
+    return result.reset_index(drop=True), int((~valid).sum())
+
+
+def iter_marks_csv(path, name_col=NAME_COLUMN, marks_col=MARKS_COLUMN, course_col=COURSE_COLUMN,
+                   with_names=True, chunk_rows=CHUNK_ROWS):
+    """
+    Read a marks CSV chunk_rows rows at a time, so files of any size fit in
+    memory. Yields (DataFrame, rows dropped) per chunk; the DataFrame has
+    'course', 'name' (only if with_names; skipping it makes reading much
+    faster) and 'marks'. Without a course column every row belongs to course
+    'All'. Rows whose marks are missing, not numeric or outside 0-100, or
+    whose course is missing, are dropped.
+    """
+    import pandas as pd
+
+    header = pd.read_csv(path, nrows=0).columns
+    names = _find_column(header, name_col) if with_names else None
+    marks = _find_column(header, marks_col)
+    course = _find_column(header, course_col, required=False)
+
+    usecols = [c for c in (course, names, marks) if c is not None]
+    dtypes = {names: str} if with_names else {}
+    if course is not None:
+        dtypes[course] = "category"
+
+    rows_read = 0
+    # Fast path: the C parser reads clean marks straight into floats
+    with pd.read_csv(path, usecols=usecols, dtype={**dtypes, marks: float}, chunksize=chunk_rows) as reader:
+        while True:
+            try:
+                chunk = next(reader)
+            except StopIteration:
+                return
+            except ValueError:
+                # This chunk has marks that are not numbers; read on from it
+                # with marks as text, coercing those to NaN
+                break
+            rows_read += len(chunk)
+            yield _clean_chunk(chunk, names, marks, course)
+    with pd.read_csv(path, usecols=usecols, dtype=dtypes, chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            # Chunks have the same size as before, so whole chunks are skipped
+            if rows_read:
+                rows_read -= len(chunk)
+                continue
+            yield _clean_chunk(chunk, names, marks, course)
+
+
+def accumulate_courses(df, stats, make_stats):
+    """
+    Add the marks of a DataFrame from iter_marks_csv to stats (course ->
+    MarkStats), starting new courses with make_stats().
+    """
+    import numpy as np
+    import pandas as pd
+
+    codes, courses = pd.factorize(df["course"])
+    marks = df["marks"].to_numpy(dtype=float)
+    # Group the marks by course with a stable sort of the course codes,
+    # narrowed so numpy can radix-sort them
+    narrow_codes = codes.astype(np.min_scalar_type(max(len(courses) - 1, 0)))
+    sorted_marks = marks[np.argsort(narrow_codes, kind="stable")]
+    counts = np.bincount(codes, minlength=len(courses))
+    ends = np.cumsum(counts)
+    starts = ends - counts
+    for course, start, end in zip(courses, starts, ends):
+        if course not in stats:
+            stats[course] = make_stats()
+        stats[course].update(sorted_marks[start:end])
+    return stats
+
+
+def combine_stats(stats, make_stats):
+    """A new MarkStats holding the marks of every accumulator in stats (e.g. all courses)"""
+    total = make_stats()
+    for course_stats in stats:
+        total.merge(course_stats)
+    return total
+
+
+def summarize_courses(stats, percentiles=()):
+    """
+    One row per course (in name order) from course -> MarkStats: statistics,
+    pass/fail split, grade distribution and a p<q> column per extra percentile.
+    """
+    import pandas as pd
+
+    rows = []
+    for course in sorted(stats):
+        s = stats[course]
+        row = {
+            "course": course,
+            "students": s.count,
+            "average": s.mean,
+            "median": s.median(),
+            "std_dev": s.std_dev,
+            "max": s.max,
+            "min": s.min,
+            "passed": s.passed,
+            "failed": s.count - s.passed,
+            "pass_rate": s.passed / s.count,
+        }
+        for q in percentiles:
+            row[f"p{q:g}"] = s.percentile(q)
+        for grade, count in zip(grade_labels(s.cutoffs), s.grade_counts):
+            row[f"grade_{grade}"] = int(count)
+        row["exact_percentiles"] = s.is_exact
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def parse_percentiles(text):
+    """Parse percentiles like "10,25,75,90" into a list of floats"""
+    percentiles = []
+    for part in text.split(","):
+        try:
+            q = float(part)
+        except ValueError:
+            raise ValueError(f"Percentile {part.strip()!r} must be a number")
+        if not 0 <= q <= 100:
+            raise ValueError(f"Percentile {q:g} must be between 0 and 100")
+        percentiles.append(q)
+    return percentiles
+
+
+def _display_stats(title, s, percentiles):
+    print(f"{title}  ({s.count} student(s))")
+    # Sketched percentiles are within half a bin of the exact value
+    approx = "" if s.is_exact else f" (±{s.resolution / 2:g})"
+    print(f"Average: {s.mean:.2f}   Median: {s.median():.2f}{approx}   Std dev: {s.std_dev:.2f}")
+    print(f"Max: {s.max:.2f}   Min: {s.min:.2f}")
+    if percentiles:
+        print("Percentiles: " + "   ".join(f"p{q:g}: {s.percentile(q):.2f}" for q in percentiles) + approx)
+    print(f"Passed: {s.passed}   Failed: {s.count - s.passed}   Pass rate: {s.passed / s.count:.1%}")
+    print("Grades: " + "   ".join(f"{grade}: {n}" for grade, n in zip(grade_labels(s.cutoffs), s.grade_counts)))
+
+
+def display_batch_report(stats, overall, percentiles=(), dropped=0):
+    """Display the per-course and overall results of batch mode"""
+    print("\n" + "="*60)
+    print("BATCH RESULTS")
+    print("="*60)
+    print(f"Courses: {len(stats)}   Students: {overall.count}")
+    if dropped:
+        print(f"Skipped {dropped} row(s) with missing or invalid marks or no course")
+
+    for course in sorted(stats):
+        print("\n" + "-"*60)
+        _display_stats(f"Course: {course}", stats[course], percentiles)
+    if len(stats) > 1:
+        print("\n" + "-"*60)
+        _display_stats("All courses", overall, percentiles)
+
+    print("="*60 + "\n")
+
+
+def run_batch(args):
+    """
+    Non-interactive mode: grade CSV exports chunk by chunk, merge in any saved
+    statistics and report per course
+    """
+    import numpy as np
+
+    try:
+        cutoffs = parse_cutoffs(args.cutoffs) if args.cutoffs else DEFAULT_CUTOFFS
+        percentiles = parse_percentiles(args.percentiles) if args.percentiles else []
+
+        def make_stats():
+            return MarkStats(cutoffs, args.pass_mark, args.exact_limit, args.resolution)
+
+        # Check the settings before reading anything
+        make_stats()
+        labels = np.array(grade_labels(cutoffs))
+        stats, dropped = {}, 0
+        graded = open(args.graded_output, "w", newline="", encoding="utf-8") if args.graded_output else None
+        try:
+            for path in args.batch or []:
+                for chunk, chunk_dropped in iter_marks_csv(
+                    path, args.name_column, args.marks_column, args.course_column,
+                    with_names=graded is not None, chunk_rows=args.chunk_rows,
+                ):
+                    dropped += chunk_dropped
+                    accumulate_courses(chunk, stats, make_stats)
+                    if graded is not None:
+                        grades = labels[grade_indices(chunk["marks"].to_numpy(), cutoffs)]
+                        chunk.assign(grade=grades).to_csv(graded, header=graded.tell() == 0, index=False)
+        finally:
+            if graded is not None:
+                graded.close()
+        for path in args.merge_stats or []:
+            merge_course_stats(stats, load_course_stats(path), make_stats)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    if not stats:
+        print("Error: No valid marks found!")
+        return 1
+
+    display_batch_report(stats, combine_stats(stats.values(), make_stats), percentiles, dropped)
+
+    if args.output:
+        summarize_courses(stats, percentiles).to_csv(args.output, index=False)
+        print(f"Course summary saved to: {args.output}")
+    if args.graded_output:
+        print(f"Graded rows saved to: {args.graded_output}")
+    if args.save_stats:
+        save_course_stats(stats, args.save_stats)
+        print(f"Course statistics saved to: {args.save_stats}")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="GradeBook Analyzer. Without --batch or --merge-stats, runs the interactive menu."
+    )
+    parser.add_argument(
+        "--batch", metavar="CSV", nargs="+",
+        help="grade every row of one or more marks CSVs (e.g. one per school) without prompting",
+    )
+    parser.add_argument(
+        "--merge-stats", metavar="JSON", nargs="+", help="also combine course statistics saved by --save-stats"
+    )
+    parser.add_argument("--save-stats", metavar="JSON", help="save the course statistics for a later --merge-stats")
+    parser.add_argument("--cutoffs", help='grade cut-offs, best first (default: "A=90,B=80,C=70,D=60")')
+    parser.add_argument("--pass-mark", type=float, default=PASS_MARK, help=f"lowest passing mark (default: {PASS_MARK})")
+    parser.add_argument("--percentiles", help='extra percentiles to report, e.g. "10,25,75,90"')
+    parser.add_argument("--name-column", default=NAME_COLUMN, help=f"student name column (default: {NAME_COLUMN})")
+    parser.add_argument("--marks-column", default=MARKS_COLUMN, help=f"marks column (default: {MARKS_COLUMN})")
+    parser.add_argument(
+        "--course-column", default=COURSE_COLUMN, help=f"course column, optional in the file (default: {COURSE_COLUMN})"
+    )
+    parser.add_argument("--output", help="write the per-course summary to this CSV")
+    parser.add_argument("--graded-output", help="write every row with its grade to this CSV")
+    parser.add_argument(
+        "--chunk-rows", type=int, default=CHUNK_ROWS, help=f"rows read from a CSV at a time (default: {CHUNK_ROWS})"
+    )
+    parser.add_argument(
+        "--exact-limit", type=int, default=EXACT_LIMIT,
+        help=f"marks per course kept for exact percentiles before sketching them (default: {EXACT_LIMIT})",
+    )
+    parser.add_argument(
+        "--resolution", type=float, default=SKETCH_RESOLUTION,
+        help=f"bin width of sketched percentiles, which are within half of it (default: {SKETCH_RESOLUTION})",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main function with user loop for re-running analysis"""
+    args = parse_args(argv)
+    if args.batch or args.merge_stats:
+        return run_batch(args)
+
     display_welcome_message()
     
     marks_dict = None
@@ -263,4 +836,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,5 @@
+# benchmarks/__init__.py
+
+"""
+Benchmark suite and synthetic data generator for the energy dashboard pipeline.
+"""
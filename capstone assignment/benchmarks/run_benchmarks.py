@@ -0,0 +1,172 @@
+# benchmarks/run_benchmarks.py
+
+"""
+Time each pipeline stage on synthetic campus data of several sizes.
+
+Usage (from the 'capstone assignment' folder):
+
+    python -m benchmarks.run_benchmarks --sizes small medium --output bench.json
+    python -m benchmarks.run_benchmarks --baseline bench.json --tolerance 0.25
+
+Each stage is timed `--repeat` times (best run wins) and then run once more
+under tracemalloc to record peak allocated memory, so memory tracing never
+inflates the timings. With --baseline, any stage slower than the baseline by
+more than --tolerance is reported and the exit code is 1.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import pandas as pd
+
+from benchmarks.synthetic import SyntheticSpec, generate_campus_data
+from energy_dashboard.aggregation import AggregationEngine
+from energy_dashboard.ingestion import load_energy_data
+from energy_dashboard.models import BuildingManager
+from energy_dashboard.persistence import save_building_summary, save_cleaned_data
+from energy_dashboard.visualization import create_dashboard
+
+SIZES: Dict[str, SyntheticSpec] = {
+    "small": SyntheticSpec(buildings=5, interval_minutes=60, days=30, files=5, dirty_ratio=0.01),
+    "medium": SyntheticSpec(buildings=50, interval_minutes=15, days=90, files=50, dirty_ratio=0.01),
+    "large": SyntheticSpec(buildings=200, interval_minutes=15, days=365, files=200, dirty_ratio=0.01),
+}
+
+
+def _measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": min(timings), "peak_mb": peak / 2**20}
+
+
+def run_size(name: str, spec: SyntheticSpec, repeat: int) -> List[Dict[str, object]]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp) / "data"
+        out_dir = Path(tmp) / "output"
+        generate_campus_data(spec, str(data_dir))
+
+        df_raw, _ = load_energy_data(str(data_dir))
+        df_raw["kwh"] = pd.to_numeric(df_raw["kwh"], errors="coerce")
+        df_clean = df_raw.dropna(subset=["timestamp", "kwh", "building"])
+        aggregates = AggregationEngine(df_clean)
+        daily, weekly, summary = aggregates.daily, aggregates.weekly, aggregates.building_summary
+
+        def aggregate():
+            engine = AggregationEngine(df_clean)
+            return engine.daily, engine.weekly, engine.building_summary, engine.campus_numbers
+
+        def model():
+            manager = BuildingManager()
+            manager.load_from_dataframe(df_clean)
+            return manager.generate_all_reports()
+
+        def persist():
+            save_cleaned_data(df_clean, output_dir=str(out_dir))
+            save_building_summary(summary, output_dir=str(out_dir))
+
+        out_dir.mkdir(parents=True, exist_ok=True)
+        stages = {
+            "ingestion": lambda: load_energy_data(str(data_dir)),
+            "aggregation": aggregate,
+            "models": model,
+            "dashboard": lambda: create_dashboard(daily, weekly, summary, str(out_dir / "dashboard.png")),
+            "persistence": persist,
+        }
+
+        for stage, func in stages.items():
+            measured = _measure(func, repeat)
+            results.append({
+                "size": name,
+                "stage": stage,
+                "rows": len(df_clean),
+                **measured,
+            })
+            print(f"{name:<8} {stage:<12} {measured['seconds']:>9.3f}s {measured['peak_mb']:>9.1f} MB")
+    return results
+
+
+def compare(results: List[Dict[str, object]], baseline_path: str, tolerance: float) -> List[str]:
+    """
+    Return a message for every (size, stage) slower than baseline * (1 + tolerance).
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    previous = {(r["size"], r["stage"]): r for r in baseline["results"]}
+
+    regressions = []
+    for result in results:
+        base = previous.get((result["size"], result["stage"]))
+        if base is None or base["seconds"] <= 0:
+            continue
+        ratio = result["seconds"] / base["seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{result['size']}/{result['stage']}: {base['seconds']:.3f}s -> "
+                f"{result['seconds']:.3f}s ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the energy dashboard pipeline.")
+    parser.add_argument("--sizes", nargs="+", choices=sorted(SIZES), default=["small", "medium"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, e.g. 0.25 = 25%%")
+    args = parser.parse_args(argv)
+
+    results = []
+    for name in args.sizes:
+        results.extend(run_size(name, SIZES[name], args.repeat))
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "sizes": {name: asdict(SIZES[name]) for name in args.sizes},
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        if regressions:
+            print("Regressions:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
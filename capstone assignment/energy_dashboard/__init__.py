@@ -5,8 +5,21 @@ Energy Dashboard package.
 
 Modules:
 - ingestion: reading and validating raw CSV data
+- readers: pluggable CSV parser backends (pandas, multi-threaded pyarrow)
 - aggregation: computing daily/weekly/building statistics
 - models: OOP classes for buildings and meter readings
 - visualization: matplotlib dashboard plots
 - persistence: exporting CSVs and summary report
+- streaming: chunked ingestion + aggregation for inputs larger than RAM
+- cache: per-file columnar ingestion cache keyed by source fingerprint
+- store: incrementally updated aggregate store with an append API
+- instrumentation: opt-in per-stage timing and memory recording
+- query: indexed time-range queries over loaded readings
+- trends: trend comments for the text report
+- cli: command-line entry point (python -m energy_dashboard)
+- watch: watch mode that updates outputs as data/ changes
+- anomalies: vectorized outlier, stuck-meter and zero-run detection
+- peaks: top-K per-building, campus-wide and coincident peak loads
+- readinglog: memory-mapped append-only binary log of readings
+- server: asyncio HTTP query service with an ETag-aware LRU result cache
 """
\ No newline at end of file
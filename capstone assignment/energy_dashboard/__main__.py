@@ -0,0 +1,7 @@
+# energy_dashboard/__main__.py
+
+import sys
+
+from energy_dashboard.cli import main
+
+sys.exit(main())
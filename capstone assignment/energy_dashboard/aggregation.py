@@ -1,88 +1,442 @@
 # energy_dashboard/aggregation.py
 
-from typing import Dict, Tuple
+from functools import cached_property
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from energy_dashboard.anomalies import add_anomaly_counts, detect_anomalies
+from energy_dashboard.instrumentation import instrumented
+from energy_dashboard.peaks import add_peak_columns, campus_top_k, coincident_peaks, load_at, top_k_peaks
+from energy_dashboard.readinglog import ReadingLog
+from energy_dashboard.trends import add_trend_columns
+
+if TYPE_CHECKING:
+    from energy_dashboard.store import AggregateStore
+
 
 def prepare_time_index(df: pd.DataFrame) -> pd.DataFrame:
     """
     Ensure the DataFrame uses a DateTimeIndex based on 'timestamp'.
     """
-    df = df.copy()
-    df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
+    timestamps = df["timestamp"]
+    if not pd.api.types.is_datetime64_any_dtype(timestamps):
+        timestamps = pd.to_datetime(timestamps, errors="coerce")
+    # assign() returns a new frame, so the caller's frame is never modified
+    df = df.assign(timestamp=timestamps)
     df = df.dropna(subset=["timestamp"])
     df = df.set_index("timestamp")
     return df
 
 
-def calculate_daily_totals(df: pd.DataFrame) -> pd.DataFrame:
+def week_bucket(timestamps: pd.Series) -> pd.Series:
+    """
+    Label each timestamp with the bucket resample("W") would put it in
+    (weeks ending on Sunday, labelled by that Sunday at midnight).
+    """
+    return timestamps.dt.to_period("W-SUN").dt.end_time.dt.normalize()
+
+
+def expand_period_buckets(buckets: pd.Series, freq: str, value_col: str) -> pd.DataFrame:
+    """
+    Turn sparse (building, period start) -> kWh buckets into the dense layout
+    resample() produces: one row per building per period between that
+    building's first and last bucket, with empty periods filled with 0.
+    """
+    if buckets is None or buckets.empty:
+        return pd.DataFrame(columns=["building", "timestamp", value_col])
+
+    buckets.index = buckets.index.set_names(["building", "timestamp"])
+    frames = []
+    for building, series in buckets.groupby(level="building", sort=True):
+        series = series.droplevel("building").sort_index()
+        full_range = pd.date_range(series.index.min(), series.index.max(), freq=freq)
+        series = series.reindex(full_range, fill_value=0.0)
+        frames.append(
+            pd.DataFrame({"building": building, "timestamp": series.index, value_col: series.values})
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+# Rollup pyramid levels, finest first, with their nominal bucket width.
+ROLLUP_LEVELS = {
+    "hourly": pd.Timedelta(hours=1),
+    "daily": pd.Timedelta(days=1),
+    "weekly": pd.Timedelta(weeks=1),
+    "monthly": pd.Timedelta(days=30.44),
+}
+ROLLUP_COLUMNS = ["building", "timestamp", "sum_kwh", "min_kwh", "max_kwh", "count"]
+
+
+_HOUR_NS = pd.Timedelta(hours=1).value
+_DAY_NS = pd.Timedelta(days=1).value
+
+
+def _reading_rollup(time_indexed: pd.DataFrame, bucket_ns: np.ndarray, step: int) -> pd.DataFrame:
+    """
+    Roll raw readings up into buckets `step` ns wide, given each reading's
+    bucket start in epoch ns.
+
+    Rows are grouped on one integer key per (building, bucket), which is
+    much cheaper than grouping on the building and timestamp columns and
+    yields the same groups in the same order.
+    """
+    buildings = time_indexed["building"]
+    categorical = isinstance(buildings.dtype, pd.CategoricalDtype)
+    if categorical:
+        codes, names = buildings.cat.codes.to_numpy(), buildings.cat.categories
+    else:
+        codes, names = pd.factorize(buildings, sort=True)
+    kwh = time_indexed["kwh"].reset_index(drop=True)
+    if (codes < 0).any():
+        # Readings without a building are left out, as groupby() does
+        keep = codes >= 0
+        codes, bucket_ns, kwh = codes[keep], bucket_ns[keep], kwh[keep]
+    if len(codes) == 0:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+
+    first = bucket_ns.min()
+    width = (bucket_ns.max() - first) // step + 1
+    key = codes.astype(np.int64) * width + (bucket_ns - first) // step
+    rollup = kwh.groupby(key).agg(["sum", "min", "max", "count"])
+    key = rollup.index.to_numpy()
+    building_codes = key // width
+    return pd.DataFrame({
+        "building": (
+            pd.Categorical.from_codes(building_codes, dtype=buildings.dtype) if categorical
+            else names.take(building_codes)
+        ),
+        "timestamp": (first + key % width * step).view("datetime64[ns]"),
+        "sum_kwh": rollup["sum"].to_numpy(),
+        "min_kwh": rollup["min"].to_numpy(),
+        "max_kwh": rollup["max"].to_numpy(),
+        "count": rollup["count"].to_numpy(),
+    })
+
+
+def _combine_rollup(finer: pd.DataFrame, buckets: pd.Series) -> pd.DataFrame:
+    """
+    Roll a finer level up into coarser `buckets` (one label per finer row).
+    """
+    coarser = finer.groupby([finer["building"], buckets.rename("timestamp")], observed=True).agg(
+        sum_kwh=("sum_kwh", "sum"),
+        min_kwh=("min_kwh", "min"),
+        max_kwh=("max_kwh", "max"),
+        count=("count", "sum"),
+    )
+    return coarser.reset_index()[ROLLUP_COLUMNS]
+
+
+def build_rollup_pyramid(time_indexed: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Build hourly, daily, weekly and monthly sum/min/max/count per building.
+
+    Hourly, daily and weekly are grouped from the raw readings, so their sums
+    are exactly those of resample("D"/"W").sum(); summing hourly sums instead
+    would differ in the last bits. Monthly is derived from daily. Buckets
+    are sparse: periods without readings have no row. Weekly buckets use the
+    same Sunday labels as resample("W"); monthly buckets are labelled by the
+    first day of the month.
+
+    Expects a frame indexed by timestamp with 'building' and 'kwh' columns
+    (see prepare_time_index).
+    """
+    if time_indexed.empty:
+        empty = pd.DataFrame(columns=ROLLUP_COLUMNS)
+        return {level: empty.copy() for level in ROLLUP_LEVELS}
+
+    if not time_indexed.index.is_monotonic_increasing:
+        # resample() sums each bucket in time order; do the same so sums match
+        time_indexed = time_indexed.sort_index(kind="stable")
+    ts_ns = time_indexed.index.as_unit("ns").asi8
+    days = ts_ns // _DAY_NS * _DAY_NS
+    # Weeks end on Sunday and are labelled by it, as in week_bucket; 1970-01-01 was a Thursday
+    sundays = days + (6 - (days // _DAY_NS + 3) % 7) * _DAY_NS
+    hourly = _reading_rollup(time_indexed, ts_ns // _HOUR_NS * _HOUR_NS, _HOUR_NS)
+    daily = _reading_rollup(time_indexed, days, _DAY_NS)
+    weekly = _reading_rollup(time_indexed, sundays, 7 * _DAY_NS)
+    monthly = _combine_rollup(daily, daily["timestamp"].dt.to_period("M").dt.start_time)
+
+    return {"hourly": hourly, "daily": daily, "weekly": weekly, "monthly": monthly}
+
+
+def select_rollup_level(start, end, max_points: int = 500) -> str:
+    """
+    Pick the finest rollup level that covers [start, end] in at most
+    max_points buckets per building (falls back to the coarsest level).
+    """
+    span = pd.Timestamp(end) - pd.Timestamp(start)
+    for level, width in ROLLUP_LEVELS.items():
+        if span / width <= max_points:
+            return level
+    return list(ROLLUP_LEVELS)[-1]
+
+
+def rollup_window(
+    pyramid: Dict[str, pd.DataFrame],
+    start=None,
+    end=None,
+    max_points: int = 500,
+) -> Tuple[str, pd.DataFrame]:
+    """
+    Serve a time window from the pyramid at the level that fits it.
+
+    Missing start/end default to the extent of the data. Returns the chosen
+    level and its rows inside the window.
+    """
+    daily = pyramid["daily"]
+    if daily.empty:
+        return "daily", daily
+    start = pd.Timestamp(start) if start is not None else daily["timestamp"].min()
+    end = pd.Timestamp(end) if end is not None else daily["timestamp"].max() + pd.Timedelta(days=1)
+
+    level = select_rollup_level(start, end, max_points)
+    rows = pyramid[level]
+    mask = (rows["timestamp"] >= start) & (rows["timestamp"] < end)
+    return level, rows[mask]
+
+
+class AggregationEngine:
+    """
+    Compute every aggregate the dashboard needs from one cleaned DataFrame.
+
+    Raw readings are grouped into the hourly, daily and weekly levels of the
+    rollup pyramid and per building; daily and weekly are the dense form of
+    their pyramid levels, and every sum is taken over the readings
+    themselves, so results match the plain resample()/groupby() versions
+    exactly. Each result is computed on first access
+    and cached, so share one engine between callers (the module-level
+    helpers accept an engine in place of a DataFrame).
+
+    Expects 'building', 'timestamp', 'kwh' columns, or a ReadingLog, which
+    is read through its zero-copy views (see ReadingLog.to_frame). Rows
+    without a timestamp are left out of every aggregate.
+
+    If an AggregateStore (or SourceAggregateStore) holding the same readings
+    is given, daily, weekly, building_summary and campus_numbers are read
+    from it instead of recomputed; the reading-level results (peaks,
+    anomalies, rollups) still come from df.
+    """
+
+    def __init__(self, df: pd.DataFrame | ReadingLog, store: Optional["AggregateStore"] = None):
+        if isinstance(df, ReadingLog):
+            df = df.to_frame()
+        self.df = df
+        self.store = store
+
+    @cached_property
+    def time_indexed(self) -> pd.DataFrame:
+        return prepare_time_index(self.df)
+
+    @cached_property
+    def rollups(self) -> Dict[str, pd.DataFrame]:
+        """
+        Hourly/daily/weekly/monthly rollup pyramid (see build_rollup_pyramid).
+        """
+        return build_rollup_pyramid(self.time_indexed)
+
+    def _dense(self, level: str, step: pd.Timedelta, value_col: str) -> pd.DataFrame:
+        """
+        A rollup level's sums in the dense layout resample() produces: one row
+        per building per period between its first and last bucket, 0 where
+        a period has no readings.
+        """
+        buckets = self.rollups[level]
+        if buckets.empty:
+            return pd.DataFrame(columns=["building", "timestamp", value_col])
+
+        # Rollup rows are grouped by building and in time order within each
+        codes, buildings = pd.factorize(buckets["building"])
+        # Keep the readings' datetime unit, as resample() does
+        unit, _ = np.datetime_data(self.time_indexed.index.dtype)
+        timestamps = buckets["timestamp"].to_numpy().astype(f"datetime64[{unit}]")
+        step = np.timedelta64(step.value, "ns").astype(f"timedelta64[{unit}]")
+        first = timestamps[np.r_[0, np.flatnonzero(np.diff(codes)) + 1]]
+        periods = (timestamps[np.r_[np.flatnonzero(np.diff(codes)), len(codes) - 1]] - first) // step + 1
+        offsets = np.cumsum(periods) - periods
+
+        values = np.zeros(periods.sum(), dtype=buckets["sum_kwh"].dtype)
+        values[offsets[codes] + (timestamps - first[codes]) // step] = buckets["sum_kwh"].to_numpy()
+        building_codes = np.repeat(np.arange(len(periods)), periods)
+        return pd.DataFrame({
+            "building": buildings.take(building_codes),
+            "timestamp": np.repeat(first, periods) + (np.arange(len(values)) - offsets[building_codes]) * step,
+            value_col: values,
+        })
+
+    @cached_property
+    def daily(self) -> pd.DataFrame:
+        """
+        Daily total kWh per building (one row per building per day).
+        """
+        if self.store is not None:
+            return self.store.daily_frame()
+        return self._dense("daily", pd.Timedelta(days=1), "daily_kwh")
+
+    @cached_property
+    def weekly(self) -> pd.DataFrame:
+        """
+        Weekly total kWh per building (one row per building per week).
+        """
+        if self.store is not None:
+            return self.store.weekly_frame()
+        return self._dense("weekly", pd.Timedelta(weeks=1), "weekly_kwh")
+
+    @cached_property
+    def building_summary(self) -> pd.DataFrame:
+        """
+        Summary statistics (total, mean, min, max, count) per building.
+        """
+        if self.store is not None:
+            # Sorted by name, as groupby orders the (sorted) building categories
+            return self.store.summary_frame()
+        # From the readings, not the daily rollup, so totals and means are
+        # exactly those of a plain groupby
+        return self.df.groupby("building", observed=True)["kwh"].agg(
+            total_kwh="sum", mean_kwh="mean", min_kwh="min", max_kwh="max", readings_count="count"
+        ).reset_index()
+
+    @cached_property
+    def anomalies(self) -> pd.DataFrame:
+        """
+        Outliers, stuck meters and zero runs per building (see detect_anomalies).
+        """
+        return detect_anomalies(self.df)
+
+    @cached_property
+    def peaks(self) -> pd.DataFrame:
+        """
+        Top-K readings of every building (see top_k_peaks).
+        """
+        return top_k_peaks(self.df)
+
+    @cached_property
+    def campus_peaks(self) -> pd.DataFrame:
+        """
+        Top-K single readings campus-wide (see campus_top_k).
+        """
+        return campus_top_k(self.df)
+
+    @cached_property
+    def coincident_peaks(self) -> pd.DataFrame:
+        """
+        Top-K intervals by summed campus load (see coincident_peaks).
+        """
+        return coincident_peaks(self.df)
+
+    @cached_property
+    def loads_at_campus_peak(self) -> pd.Series:
+        """
+        Each building's load during the largest coincident campus interval.
+        """
+        if self.coincident_peaks.empty:
+            return pd.Series(dtype=float)
+        return load_at(self.df, self.coincident_peaks["timestamp"].iloc[0])
+
+    @cached_property
+    def export_summary(self) -> pd.DataFrame:
+        """
+        Building summary plus peak, anomaly and trend columns, as written to building_summary.csv.
+        """
+        summary = add_peak_columns(self.building_summary, self.peaks, self.loads_at_campus_peak)
+        summary = add_anomaly_counts(summary, self.anomalies)
+        return add_trend_columns(summary, self.daily, self.weekly)
+
+    @cached_property
+    def campus_numbers(self) -> Tuple[float, str, pd.Timestamp]:
+        """
+        Total campus consumption, highest consuming building and peak load time.
+        """
+        if self.store is not None:
+            return self.store.campus_numbers()
+        if self.df is None or self.df.empty:
+            return 0.0, "N/A", pd.NaT
+
+        # Total campus consumption and highest consuming building
+        total_campus_kwh = float(self.df["kwh"].sum())
+        building_totals = self.building_summary.set_index("building")["total_kwh"]
+        highest_building = building_totals.idxmax() if not building_totals.empty else "N/A"
+
+        # Peak load time: the earliest of the largest readings, over every
+        # reading (also those without a building, which the rollups leave out)
+        kwh = self.time_indexed["kwh"].to_numpy()
+        if not len(kwh) or np.isnan(kwh).all():
+            return total_campus_kwh, highest_building, pd.NaT
+        peak_time = self.time_indexed.index[kwh == np.nanmax(kwh)].min()
+
+        return total_campus_kwh, highest_building, peak_time
+
+
+def _engine(df: pd.DataFrame | ReadingLog | AggregationEngine) -> AggregationEngine:
+    return df if isinstance(df, AggregationEngine) else AggregationEngine(df)
+
+
+@instrumented
+def calculate_daily_totals(
+    df: Optional[pd.DataFrame | ReadingLog | AggregationEngine],
+    store: Optional["AggregateStore"] = None,
+) -> pd.DataFrame:
     """
     Calculate daily total kWh per building.
 
     Returns a DataFrame with date index and one row per building per day.
+    If an AggregateStore is given, its maintained aggregates are returned instead.
+    df may also be a ReadingLog, or an AggregationEngine to reuse its cached results.
     """
-    df = prepare_time_index(df)
-    daily = df.groupby("building").resample("D")["kwh"].sum().reset_index()
-    daily = daily.rename(columns={"kwh": "daily_kwh"})
-    return daily
+    if store is not None:
+        return store.daily_frame()
+    return _engine(df).daily
 
 
-def calculate_weekly_aggregates(df: pd.DataFrame) -> pd.DataFrame:
+@instrumented
+def calculate_weekly_aggregates(
+    df: Optional[pd.DataFrame | ReadingLog | AggregationEngine],
+    store: Optional["AggregateStore"] = None,
+) -> pd.DataFrame:
     """
     Calculate weekly total kWh per building.
 
     Returns a DataFrame with week start date and one row per building per week.
+    If an AggregateStore is given, its maintained aggregates are returned instead.
+    df may also be a ReadingLog, or an AggregationEngine to reuse its cached results.
     """
-    df = prepare_time_index(df)
-    weekly = df.groupby("building").resample("W")["kwh"].sum().reset_index()
-    weekly = weekly.rename(columns={"kwh": "weekly_kwh"})
-    return weekly
+    if store is not None:
+        return store.weekly_frame()
+    return _engine(df).weekly
 
 
-def building_wise_summary(df: pd.DataFrame) -> pd.DataFrame:
+@instrumented
+def building_wise_summary(
+    df: Optional[pd.DataFrame | ReadingLog | AggregationEngine],
+    store: Optional["AggregateStore"] = None,
+) -> pd.DataFrame:
     """
     Compute summary statistics (mean, min, max, total) for each building.
 
     Returns a DataFrame with one row per building.
+    If an AggregateStore is given, its maintained aggregates are returned instead.
+    df may also be a ReadingLog, or an AggregationEngine to reuse its cached results.
     """
-    grouped = df.groupby("building")["kwh"]
-
-    summary = grouped.agg(
-        total_kwh="sum",
-        mean_kwh="mean",
-        min_kwh="min",
-        max_kwh="max",
-        readings_count="count",
-    ).reset_index()
-
-    return summary
+    if store is not None:
+        return store.summary_frame()
+    return _engine(df).building_summary
 
 
-def campus_summary_numbers(df: pd.DataFrame, daily: pd.DataFrame) -> Tuple[float, str, pd.Timestamp]:
+@instrumented
+def campus_summary_numbers(
+    df: pd.DataFrame | AggregationEngine, daily: pd.DataFrame
+) -> Tuple[float, str, pd.Timestamp]:
     """
     Helper to compute:
     - total campus consumption
     - highest consuming building
     - peak load time (timestamp with max kwh)
+
+    df may also be an AggregationEngine, to reuse its cached results.
     """
     # Guard against empty data
-    if df is None or df.empty:
+    if df is None or (not isinstance(df, AggregationEngine) and df.empty):
         return 0.0, "N/A", pd.NaT
 
-    # Total campus consumption
-    total_campus_kwh = float(df["kwh"].sum())
-
-    # Highest consuming building
-    building_totals = df.groupby("building")["kwh"].sum()
-    highest_building = building_totals.idxmax() if not building_totals.empty else "N/A"
-
-    # Peak load time (timestamp at which kwh is maximum)
-    try:
-        peak_idx = df["kwh"].idxmax()
-        peak_row = df.loc[peak_idx]
-        peak_time = peak_row.get("timestamp", pd.NaT)
-    except Exception:
-        peak_time = pd.NaT
-
-    return total_campus_kwh, highest_building, peak_time
\ No newline at end of file
+    return _engine(df).campus_numbers
@@ -0,0 +1,190 @@
+# energy_dashboard/anomalies.py
+
+"""
+Vectorized anomaly detection over all buildings at once.
+
+Three kinds of events are reported:
+- outlier:  a reading far from its seasonal baseline. The baseline is the
+            rolling median of the building's previous `window` readings in
+            the same hour-of-week slot. The spread is a rolling MAD: the
+            median absolute residual (kwh - baseline) over the building's
+            previous `scale_window` readings. Readings whose robust z-score
+            0.6745 * residual / MAD exceeds z_threshold are flagged.
+- stuck:    at least stuck_min_run consecutive identical non-zero readings.
+- zero_run: at least zero_min_run consecutive zero readings.
+
+Everything is done with array operations on one sorted copy of the
+readings; there are no per-row or per-building Python loops.
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.api.indexers import BaseIndexer
+
+from energy_dashboard.instrumentation import instrumented
+
+ANOMALY_KINDS = ["outlier", "stuck", "zero_run"]
+ANOMALY_COLUMNS = ["building", "kind", "start", "end", "readings", "kwh", "baseline_kwh", "score"]
+# Building summary column for each kind of event
+COUNT_COLUMNS = {"outlier": "outliers", "stuck": "stuck_runs", "zero_run": "zero_runs"}
+
+_NS_PER_HOUR = 3_600_000_000_000
+# 1970-01-01 was a Thursday (dayofweek 3)
+_EPOCH_DAYOFWEEK = 3
+
+
+def hour_of_week(ts_ns: np.ndarray) -> np.ndarray:
+    """
+    Monday 00:00 -> 0 ... Sunday 23:00 -> 167, from int64 epoch nanoseconds.
+    """
+    hours = ts_ns // _NS_PER_HOUR
+    return (((hours // 24) + _EPOCH_DAYOFWEEK) % 7) * 24 + hours % 24
+
+
+class _PrecedingInGroupIndexer(BaseIndexer):
+    """
+    Window of up to window_size earlier rows of the same group, excluding the
+    row itself. Rows must be sorted by group; group_starts[i] is the position
+    of the first row of row i's group.
+    """
+
+    def get_window_bounds(self, num_values=0, min_periods=None, center=None, closed=None, step=None):
+        end = np.arange(num_values, dtype=np.int64)
+        start = np.maximum(end - self.window_size, self.group_starts)
+        return start, end
+
+
+def _preceding_median(values: np.ndarray, groups: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    """
+    Rolling median of each row's preceding `window` rows in its group (groups sorted).
+    """
+    is_first = np.ones(len(groups), dtype=bool)
+    is_first[1:] = groups[1:] != groups[:-1]
+    group_starts = np.maximum.accumulate(np.where(is_first, np.arange(len(groups)), 0))
+    indexer = _PrecedingInGroupIndexer(window_size=window, group_starts=group_starts)
+    return pd.Series(values).rolling(indexer, min_periods=min_periods).median().to_numpy()
+
+
+def _seasonal_scores(
+    codes: np.ndarray, ts_ns: np.ndarray, kwh: np.ndarray, window: int, min_periods: int, scale_window: int
+):
+    """
+    Baseline and robust z-score per reading; inputs sorted by building, then time.
+    """
+    # Regroup by (building, hour-of-week slot), keeping time order inside each slot
+    slots = hour_of_week(ts_ns)
+    order = np.lexsort((ts_ns, slots, codes))
+    slot_groups = codes[order].astype(np.int64) * 168 + slots[order]
+    baseline = np.empty(len(kwh))
+    baseline[order] = _preceding_median(kwh[order], slot_groups, window, min_periods)
+
+    residual = kwh - baseline
+    mad = _preceding_median(np.abs(residual), codes, scale_window, min_periods=scale_window // 4)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        score = np.where(mad > 0, 0.6745 * residual / mad, np.nan)
+    return baseline, score
+
+
+@instrumented
+def detect_anomalies(
+    df: pd.DataFrame,
+    window: int = 8,
+    min_periods: int = 4,
+    scale_window: int = 336,
+    z_threshold: float = 3.5,
+    stuck_min_run: int = 6,
+    zero_min_run: int = 4,
+) -> pd.DataFrame:
+    """
+    Find outliers, stuck meters and zero runs in 'building', 'timestamp', 'kwh' readings.
+
+    Returns one row per event with ANOMALY_COLUMNS, sorted by building and
+    start. Outliers span a single reading and carry their baseline and signed
+    z-score; runs carry their length in `readings` and the repeated value in
+    `kwh`. Readings inside a flagged run are not reported again as outliers.
+    """
+    readings = df.dropna(subset=["building", "timestamp", "kwh"])
+    if readings.empty:
+        return pd.DataFrame(columns=ANOMALY_COLUMNS)
+
+    codes, names = pd.factorize(readings["building"])
+    names = np.asarray(names, dtype=object)
+    ts_ns = readings["timestamp"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    kwh = readings["kwh"].to_numpy(dtype=np.float64)
+
+    order = np.lexsort((ts_ns, codes))
+    codes, ts_ns, kwh = codes[order], ts_ns[order], kwh[order]
+
+    # Runs of identical consecutive readings within a building
+    new_run = np.ones(len(kwh), dtype=bool)
+    new_run[1:] = (codes[1:] != codes[:-1]) | (kwh[1:] != kwh[:-1])
+    run_starts = np.flatnonzero(new_run)
+    run_lengths = np.diff(np.append(run_starts, len(kwh)))
+    run_kwh = kwh[run_starts]
+    is_zero_run = (run_kwh == 0) & (run_lengths >= zero_min_run)
+    is_stuck = (run_kwh != 0) & (run_lengths >= stuck_min_run)
+    in_flagged_run = (is_zero_run | is_stuck)[np.cumsum(new_run) - 1]
+
+    baseline, score = _seasonal_scores(codes, ts_ns, kwh, window, min_periods, scale_window)
+    is_outlier = (np.abs(score) > z_threshold) & ~in_flagged_run
+    outliers = np.flatnonzero(is_outlier)
+
+    runs = np.flatnonzero(is_zero_run | is_stuck)
+    run_ends = run_starts[runs] + run_lengths[runs] - 1
+
+    events = pd.DataFrame({
+        "building": names[np.concatenate([codes[outliers], codes[run_starts[runs]]])],
+        "kind": np.concatenate([
+            np.full(len(outliers), "outlier", dtype=object),
+            np.where(is_zero_run[runs], "zero_run", "stuck").astype(object),
+        ]),
+        "start": np.concatenate([ts_ns[outliers], ts_ns[run_starts[runs]]]).view("datetime64[ns]"),
+        "end": np.concatenate([ts_ns[outliers], ts_ns[run_ends]]).view("datetime64[ns]"),
+        "readings": np.concatenate([np.ones(len(outliers), dtype=np.int64), run_lengths[runs]]),
+        "kwh": np.concatenate([kwh[outliers], run_kwh[runs]]),
+        "baseline_kwh": np.concatenate([baseline[outliers], np.full(len(runs), np.nan)]),
+        "score": np.concatenate([score[outliers], np.full(len(runs), np.nan)]),
+    })
+    return events.sort_values(["building", "start"], kind="stable", ignore_index=True)
+
+
+def add_anomaly_counts(summary: pd.DataFrame, events: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a copy of a building summary with outliers / stuck_runs / zero_runs columns.
+    """
+    counts = events.groupby(["building", "kind"]).size().unstack(fill_value=0)
+    counts = counts.reindex(index=summary["building"].astype(object), columns=ANOMALY_KINDS, fill_value=0)
+    result = summary.copy()
+    for kind, column in COUNT_COLUMNS.items():
+        result[column] = counts[kind].fillna(0).astype(np.int64).to_numpy()
+    return result
+
+
+def describe_anomalies(events: pd.DataFrame, limit: int = 5) -> str:
+    """
+    Short text for the summary report: counts by kind, then the strongest
+    outliers and the longest runs (up to `limit` lines).
+    """
+    if events.empty:
+        return "No anomalies detected."
+
+    kinds = events["kind"].value_counts()
+    lines = [
+        f"{kinds.get('outlier', 0)} outlier reading(s), "
+        f"{kinds.get('stuck', 0)} stuck-meter run(s), "
+        f"{kinds.get('zero_run', 0)} zero-consumption run(s)."
+    ]
+
+    outliers = events[events["kind"] == "outlier"]
+    outliers = outliers.loc[outliers["score"].abs().sort_values(ascending=False, kind="stable").index]
+    runs = events[events["kind"] != "outlier"].sort_values("readings", ascending=False, kind="stable")
+    for row in pd.concat([outliers, runs]).head(limit).itertuples(index=False):
+        if row.kind == "outlier":
+            lines.append(
+                f"- {row.building} at {row.start}: {row.kwh:.2f} kWh vs baseline "
+                f"{row.baseline_kwh:.2f} kWh (z={row.score:+.1f})"
+            )
+        else:
+            what = "zero consumption" if row.kind == "zero_run" else f"stuck at {row.kwh:.2f} kWh"
+            lines.append(f"- {row.building}: {what} for {row.readings} readings, {row.start} to {row.end}")
+    return "\n".join(lines)
@@ -0,0 +1,205 @@
+# energy_dashboard/cache.py
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Default cache location, relative to the data directory. load_energy_data only
+# picks up *.csv files at the top level, so the cache never gets ingested.
+DEFAULT_CACHE_DIRNAME = ".energy_cache"
+
+# Bump when the on-disk layout changes so stale caches are ignored.
+CACHE_VERSION = 4
+
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+def content_hash(path: Path) -> str:
+    """
+    Return the SHA-256 hex digest of a file, read in 1 MiB blocks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_fingerprint(path: Path, with_hash: bool = True) -> Dict[str, object]:
+    """
+    Describe a source file by absolute path, size, mtime and (optionally) content hash.
+    """
+    stat = path.stat()
+    fingerprint: Dict[str, object] = {
+        "path": str(path.resolve()),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+    if with_hash:
+        fingerprint["sha256"] = content_hash(path)
+    return fingerprint
+
+
+def _entry_dir(csv_file: Path, cache_dir: Path) -> Path:
+    return cache_dir / csv_file.name
+
+
+def _read_meta(entry_dir: Path) -> Optional[dict]:
+    try:
+        with open(entry_dir / "meta.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != CACHE_VERSION:
+        return None
+    return meta
+
+
+def _write_meta(entry_dir: Path, meta: dict) -> None:
+    tmp_path = entry_dir / "meta.json.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, entry_dir / "meta.json")
+
+
+def load_cached_frame(
+    csv_file: Path,
+    cache_dir: Path,
+    options: Optional[Dict[str, object]] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Return the cached normalized frame for csv_file, or None on a cache miss.
+
+    `options` are the parse options the entry must have been written with.
+
+    Size and mtime are checked first; the content hash is only computed when
+    they differ, so unchanged files are validated without being read. A file
+    that was touched but not modified is still a hit (its metadata is refreshed).
+    Column arrays, including the codes of categorical columns, are
+    memory-mapped rather than read eagerly.
+    """
+    entry_dir = _entry_dir(csv_file, cache_dir)
+    meta = _read_meta(entry_dir)
+    if meta is None or meta.get("options") != (options or {}):
+        return None
+
+    cached = meta["fingerprint"]
+    current = file_fingerprint(csv_file, with_hash=False)
+    if current["path"] != cached["path"]:
+        return None
+
+    if (current["size"], current["mtime_ns"]) != (cached["size"], cached["mtime_ns"]):
+        if current["size"] != cached["size"]:
+            return None
+        current["sha256"] = content_hash(csv_file)
+        if current["sha256"] != cached["sha256"]:
+            return None
+        meta["fingerprint"] = current
+        _write_meta(entry_dir, meta)
+
+    data = {}
+    for i, column in enumerate(meta["columns"]):
+        values = np.load(entry_dir / f"{i}.npy", mmap_mode="r")
+        if column["kind"] == "categorical":
+            values = pd.Categorical.from_codes(
+                values, dtype=pd.CategoricalDtype(column["categories"], ordered=column["ordered"])
+            )
+        elif column["kind"] == "string":
+            series = pd.Series(values).astype(object)
+            nulls = np.load(entry_dir / f"{i}.null.npy")
+            series[nulls] = None
+            values = series.astype(column["dtype"])
+        data[column["name"]] = values
+
+    # copy=False keeps the columns backed by the mapped files
+    return pd.DataFrame(data, columns=[c["name"] for c in meta["columns"]], copy=False)
+
+
+def load_cached_rejects(csv_file: Path, cache_dir: Path) -> Optional[pd.DataFrame]:
+    """
+    Rows rejected when the cached entry was parsed, or None if there is no entry.
+
+    Only meaningful right after load_cached_frame returned a hit.
+    """
+    meta = _read_meta(_entry_dir(csv_file, cache_dir))
+    if meta is None:
+        return None
+    rejects = meta.get("rejects", {"columns": [], "rows": []})
+    frame = pd.DataFrame(rejects["rows"], columns=rejects["columns"])
+    if "line" in frame.columns:
+        frame["line"] = frame["line"].astype("Int64")
+    return frame
+
+
+def store_cached_frame(
+    csv_file: Path,
+    cache_dir: Path,
+    df: pd.DataFrame,
+    fingerprint: Optional[Dict[str, object]] = None,
+    options: Optional[Dict[str, object]] = None,
+    rejects: Optional[pd.DataFrame] = None,
+) -> None:
+    """
+    Write df as one .npy file per column, keyed by csv_file's fingerprint.
+    Categorical columns are stored as their integer codes, with the
+    categories in the metadata.
+    Rows rejected while parsing (usually few) are kept in the metadata.
+
+    Pass the fingerprint taken *before* parsing so that a file modified while
+    it was being read is not cached under its new fingerprint.
+
+    The entry is built in a temporary directory and swapped in with a rename,
+    so a crash never leaves a half-written entry behind.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    entry_dir = _entry_dir(csv_file, cache_dir)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=f".{csv_file.name}.", dir=cache_dir))
+
+    try:
+        columns = []
+        for i, name in enumerate(df.columns):
+            series = df[name]
+            column = {"name": str(name), "dtype": str(series.dtype)}
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # Codes are -1 where the value is missing
+                column["kind"] = "categorical"
+                column["categories"] = series.cat.categories.tolist()
+                column["ordered"] = bool(series.cat.ordered)
+                np.save(tmp_dir / f"{i}.npy", series.cat.codes.to_numpy())
+            elif pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series):
+                column["kind"] = "native"
+                np.save(tmp_dir / f"{i}.npy", series.to_numpy())
+            else:
+                column["kind"] = "string"
+                nulls = series.isna().to_numpy()
+                np.save(tmp_dir / f"{i}.npy", series.astype(object).fillna("").astype(str).to_numpy().astype("U"))
+                np.save(tmp_dir / f"{i}.null.npy", nulls)
+            columns.append(column)
+
+        meta = {
+            "version": CACHE_VERSION,
+            "fingerprint": fingerprint or file_fingerprint(csv_file),
+            "options": options or {},
+            "columns": columns,
+            "rows": len(df),
+        }
+        if rejects is not None:
+            meta["rejects"] = {
+                "columns": [str(c) for c in rejects.columns],
+                "rows": rejects.astype(object).where(rejects.notna(), None).values.tolist(),
+            }
+        _write_meta(tmp_dir, meta)
+
+        if entry_dir.exists():
+            shutil.rmtree(entry_dir)
+        os.replace(tmp_dir, entry_dir)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
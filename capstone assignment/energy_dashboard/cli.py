@@ -0,0 +1,410 @@
+# energy_dashboard/cli.py
+
+"""
+Command-line entry point: python -m energy_dashboard <command> [options]
+
+Commands:
+- ingest:    load and validate data/ and report what was read
+- aggregate: write building_summary.csv and the rollup pyramid
+             (--stream: fold the CSVs chunk by chunk, see streaming.py)
+- report:    write summary.txt
+- dashboard: render dashboard.png (or one dashboard per building)
+- export:    write the cleaned data in a chosen format
+- all:       run the full five-stage pipeline (what main.py does)
+- watch:     keep summary.txt and building_summary.csv current as data/ changes
+- log:       append new CSVs in data/ to the binary reading log
+- serve:     answer queries over HTTP from data loaded once (see server.py)
+
+Every command also accepts a reading log as --data-dir; it is then
+memory-mapped instead of parsed (see energy_dashboard.readinglog).
+
+Heavy modules are imported inside each command, so the non-plotting
+commands never import matplotlib, and `--help` imports neither matplotlib
+nor pandas.
+"""
+
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from energy_dashboard import instrumentation
+from energy_dashboard.instrumentation import stage
+
+logger = logging.getLogger("energy_dashboard")
+
+
+def _load_clean(args):
+    """
+    Stage 1: ingest data_dir and drop rows unusable downstream.
+    """
+    from energy_dashboard.ingestion import load_energy_data_with_stats
+
+    logger.info("[1/5] Loading data from '%s' folder...", args.data_dir)
+    quarantine_path = args.quarantine or str(Path(args.output_dir) / "quarantine.csv")
+    with stage("[1/5] ingestion") as s:
+        df_raw, error_logs, file_stats = load_energy_data_with_stats(
+            args.data_dir,
+            parallel=args.parallel,
+            max_workers=args.workers,
+            use_cache=args.use_cache,
+            kwh_dtype=args.kwh_dtype,
+            timezone=args.timezone,
+            reader=args.reader,
+            quarantine_path=quarantine_path,
+        )
+        if error_logs:
+            logger.warning("Some issues were found while loading data:")
+            for err in error_logs:
+                logger.warning("  - %s", err)
+        else:
+            logger.info("All CSV files loaded successfully.")
+        for row in file_stats.itertuples(index=False):
+            logger.debug("  %s: %d accepted, %d rejected", row.file, row.accepted, row.rejected)
+        rejected = int(file_stats["rejected"].sum())
+        if rejected:
+            logger.info("  Rejected %d row(s); see %s", rejected, quarantine_path)
+
+        # Keep a copy of cleaned data ('timestamp' is already typed by ingestion)
+        df_clean = df_raw.dropna(subset=["timestamp", "kwh", "building"])
+        s.rows_in, s.rows_out = len(df_raw), len(df_clean)
+    return df_clean
+
+
+def _aggregate(df_clean):
+    """
+    Stage 2: daily/weekly/building aggregates, rollups and campus numbers.
+    """
+    from energy_dashboard.aggregation import AggregationEngine
+
+    logger.info("[2/5] Calculating daily and weekly aggregates, and building summary...")
+    with stage("[2/5] aggregation") as s:
+        aggregates = AggregationEngine(df_clean)
+        # Compute the shared results inside the stage so their cost is attributed
+        # here; daily and weekly come from the rollup pyramid, built once on the way.
+        for result in ("daily", "weekly", "building_summary"):
+            getattr(aggregates, result)
+        s.rows_in = len(df_clean)
+        s.rows_out = len(aggregates.daily) + len(aggregates.weekly)
+    return aggregates
+
+
+def _render_dashboard(aggregates, args) -> List[str]:
+    from energy_dashboard.visualization import create_building_dashboards, create_dashboard
+
+    logger.info("[4/5] Creating dashboard visualization...")
+    with stage("[4/5] dashboard") as s:
+        dashboard_path = str(Path(args.output_dir) / "dashboard.png")
+        create_dashboard(
+            daily_df=aggregates.daily,
+            weekly_df=aggregates.weekly,
+            building_summary=aggregates.building_summary,
+            output_path=dashboard_path,
+            rollups=aggregates.rollups,
+            fast=args.fast,
+        )
+        paths = [dashboard_path]
+        if args.per_building:
+            paths += create_building_dashboards(
+                aggregates.daily,
+                aggregates.weekly,
+                aggregates.building_summary,
+                output_dir=str(Path(args.output_dir) / "buildings"),
+                max_workers=args.workers,
+            )
+        s.rows_in = len(aggregates.daily)
+    logger.info("  Dashboard saved as: %s", dashboard_path)
+    return paths
+
+
+def cmd_ingest(args) -> None:
+    df_clean = _load_clean(args)
+    logger.info(
+        "  %d readings from %d building(s), %s to %s",
+        len(df_clean),
+        df_clean["building"].nunique(),
+        df_clean["timestamp"].min(),
+        df_clean["timestamp"].max(),
+    )
+
+
+def _stream_aggregate(args) -> None:
+    """
+    Stages 1-2 for `aggregate --stream`: fold data_dir chunk by chunk instead
+    of loading it whole. Writes building_summary.csv (without the peak,
+    anomaly and trend columns, which need every reading at once) and the
+    daily and weekly totals instead of the rollup pyramid.
+    """
+    from energy_dashboard.persistence import save_building_summary, write_frame
+    from energy_dashboard.streaming import DEFAULT_CHUNKSIZE, stream_energy_aggregates
+
+    ignored = [flag for flag, used in (
+        ("--use-cache", args.use_cache), ("--parallel", args.parallel), ("--reader", args.reader != "pandas")
+    ) if used]
+    if ignored:
+        logger.warning("Ignoring %s with --stream (always the pandas reader, one file at a time)", ", ".join(ignored))
+
+    chunk_rows = DEFAULT_CHUNKSIZE if args.chunk_rows is None else args.chunk_rows
+    quarantine_path = args.quarantine or str(Path(args.output_dir) / "quarantine.csv")
+    logger.info("[1-2/5] Streaming data from '%s' folder in chunks of %d rows...", args.data_dir, chunk_rows)
+    with stage("[1-2/5] streaming aggregation") as s:
+        daily, weekly, summary, error_logs = stream_energy_aggregates(
+            args.data_dir,
+            chunksize=chunk_rows,
+            kwh_dtype=args.kwh_dtype,
+            timezone=args.timezone,
+            quarantine_path=quarantine_path,
+        )
+        if error_logs:
+            logger.warning("Some issues were found while loading data:")
+            for err in error_logs:
+                logger.warning("  - %s", err)
+        else:
+            logger.info("All CSV files loaded successfully.")
+        s.rows_in = int(summary["readings_count"].sum())
+        s.rows_out = len(daily) + len(weekly)
+
+    logger.info("  Building summary saved to: %s", save_building_summary(summary, args.output_dir))
+    logger.info("  Daily totals saved to: %s", write_frame(daily, args.output_dir, "daily_totals"))
+    logger.info("  Weekly totals saved to: %s", write_frame(weekly, args.output_dir, "weekly_totals"))
+
+
+def cmd_aggregate(args) -> None:
+    from energy_dashboard.persistence import save_building_summary, save_rollups
+
+    if args.stream:
+        _stream_aggregate(args)
+        return
+
+    aggregates = _aggregate(_load_clean(args))
+    logger.info("  Building summary saved to: %s", save_building_summary(aggregates.export_summary, args.output_dir))
+    logger.info("  Rollup pyramid saved to: %s", save_rollups(aggregates.rollups, args.output_dir))
+
+
+def cmd_report(args) -> None:
+    from energy_dashboard.persistence import save_report
+
+    aggregates = _aggregate(_load_clean(args))
+    logger.info("  Text summary saved to: %s", save_report(aggregates, args.output_dir))
+
+
+def cmd_dashboard(args) -> None:
+    _render_dashboard(_aggregate(_load_clean(args)), args)
+
+
+def cmd_export(args) -> None:
+    from energy_dashboard.persistence import save_cleaned_data
+
+    df_clean = _load_clean(args)
+    logger.info("  Cleaned data saved to: %s", save_cleaned_data(df_clean, args.output_dir, fmt=args.format))
+
+
+def cmd_all(args) -> None:
+    from energy_dashboard.models import BuildingManager
+    from energy_dashboard.persistence import save_building_summary, save_cleaned_data, save_report, save_rollups
+
+    df_clean = _load_clean(args)
+    aggregates = _aggregate(df_clean)
+
+    # ---------- Task 3: Object-Oriented Modeling ----------
+    logger.info("[3/5] Loading readings into Building objects...")
+    with stage("[3/5] modeling") as s:
+        manager = BuildingManager()
+        manager.load_from_dataframe(df_clean)
+        building_reports = manager.generate_all_reports()
+        s.rows_in, s.rows_out = len(df_clean), len(building_reports)
+    logger.debug("  OOP reports (sample):")
+    for report in building_reports[:3]:
+        logger.debug("   > %s", report)
+
+    Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+    _render_dashboard(aggregates, args)
+
+    # ---------- Task 5: Persistence & Summary ----------
+    logger.info("[5/5] Saving cleaned data, summary CSV, and text report...")
+    with stage("[5/5] persistence") as s:
+        cleaned_path = save_cleaned_data(df_clean, output_dir=args.output_dir, fmt=args.format)
+        summary_csv_path = save_building_summary(aggregates.export_summary, output_dir=args.output_dir)
+        rollup_dir = save_rollups(aggregates.rollups, output_dir=args.output_dir)
+        summary_txt_path = save_report(aggregates, args.output_dir)
+        s.rows_in = len(df_clean)
+
+    logger.info("  Cleaned data saved to: %s", cleaned_path)
+    logger.info("  Building summary saved to: %s", summary_csv_path)
+    logger.info("  Rollup pyramid saved to: %s", rollup_dir)
+    logger.info("  Text summary saved to: %s", summary_txt_path)
+
+
+def cmd_watch(args) -> None:
+    from energy_dashboard.watch import DataDirWatcher
+
+    DataDirWatcher(
+        data_dir=args.data_dir,
+        output_dir=args.output_dir,
+        debounce=args.debounce,
+        poll_interval=args.poll_interval,
+        use_inotify=not args.polling,
+        use_cache=args.use_cache,
+        kwh_dtype=args.kwh_dtype,
+        timezone=args.timezone,
+        reader=args.reader,
+        quarantine_path=args.quarantine,
+        dashboard=args.dashboard,
+    ).run()
+
+
+def cmd_log(args) -> None:
+    from energy_dashboard.ingestion import append_to_reading_log
+    from energy_dashboard.readinglog import DEFAULT_LOG_DIRNAME
+
+    log_path = args.log_path or str(Path(args.output_dir) / DEFAULT_LOG_DIRNAME)
+    _, error_logs = append_to_reading_log(
+        args.data_dir,
+        log_path,
+        kwh_dtype=args.kwh_dtype,
+        timezone=args.timezone,
+        reader=args.reader,
+        quarantine_path=args.quarantine or str(Path(args.output_dir) / "quarantine.csv"),
+    )
+    if error_logs:
+        logger.warning("Some issues were found while appending to the reading log:")
+        for err in error_logs:
+            logger.warning("  - %s", err)
+
+
+def cmd_serve(args) -> None:
+    from energy_dashboard.server import QueryService
+
+    QueryService(
+        data_dir=args.data_dir,
+        cache_size=args.cache_size,
+        poll_interval=args.poll_interval,
+        debounce=args.debounce,
+        use_cache=args.use_cache,
+        kwh_dtype=args.kwh_dtype,
+        timezone=args.timezone,
+        reader=args.reader,
+    ).run(args.host, args.port)
+
+
+COMMANDS = {
+    "ingest": (cmd_ingest, "load and validate the data directory"),
+    "aggregate": (cmd_aggregate, "write building_summary.csv and the rollup pyramid"),
+    "report": (cmd_report, "write summary.txt"),
+    "dashboard": (cmd_dashboard, "render dashboard.png"),
+    "export": (cmd_export, "write the cleaned data"),
+    "all": (cmd_all, "run the full pipeline"),
+    "watch": (cmd_watch, "update outputs whenever the data directory changes"),
+    "log": (cmd_log, "append new CSV files to the binary reading log"),
+    "serve": (cmd_serve, "serve summaries, series, peaks and dashboards over HTTP"),
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--data-dir", default="data", help="folder with input CSVs (default: data)")
+    common.add_argument("--output-dir", default="output", help="folder for outputs (default: output)")
+    common.add_argument("--use-cache", action="store_true", help="use the per-file ingestion cache")
+    common.add_argument("--parallel", action="store_true", help="parse input files in parallel")
+    common.add_argument("--workers", type=int, default=None, help="worker count for parallel steps")
+    common.add_argument("--kwh-dtype", choices=["float32", "float64"], default="float64")
+    common.add_argument(
+        "--reader",
+        choices=["auto", "pandas", "pyarrow"],
+        default="pandas",
+        help="CSV parser backend; pyarrow is multi-threaded but reports no line numbers (default: pandas)",
+    )
+    common.add_argument(
+        "--quarantine", default=None, help="where to write rejected rows (default: <output-dir>/quarantine.csv)"
+    )
+    common.add_argument("--timezone", default=None, help="timezone of naive timestamps (normalizes to UTC)")
+    common.add_argument(
+        "--instrument",
+        choices=["timing", "memory"],
+        default=None,
+        help="record per-stage timings (and memory); also set by ENERGY_DASHBOARD_INSTRUMENT",
+    )
+    common.add_argument("-v", "--verbose", action="store_true", help="debug logging")
+
+    parser = argparse.ArgumentParser(prog="energy_dashboard", description="Campus Energy Dashboard")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (_, help_text) in COMMANDS.items():
+        sub = subparsers.add_parser(name, parents=[common], help=help_text)
+        if name in ("export", "all"):
+            sub.add_argument(
+                "--format",
+                default="csv",
+                choices=["csv", "csv.gz", "csv.zst", "parquet"],
+                help="cleaned data output format (default: csv)",
+            )
+        if name == "aggregate":
+            sub.add_argument("--stream", action="store_true", help="fold the CSVs in chunks instead of loading them whole")
+            sub.add_argument(
+                "--chunk-rows", type=int, default=None, help="rows per chunk with --stream (default: 500000)"
+            )
+        if name in ("dashboard", "all"):
+            sub.add_argument("--fast", action="store_true", help="downsampled top-N rendering")
+            sub.add_argument("--per-building", action="store_true", help="also render one dashboard per building")
+        if name in ("watch", "serve"):
+            sub.add_argument("--debounce", type=float, default=1.0, help="seconds of quiet before updating (default: 1.0)")
+            sub.add_argument("--poll-interval", type=float, default=2.0, help="polling period in seconds (default: 2.0)")
+        if name == "watch":
+            sub.add_argument("--polling", action="store_true", help="poll even where inotify is available")
+            sub.add_argument("--dashboard", action="store_true", help="also re-render the fast dashboard")
+        if name == "serve":
+            sub.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+            sub.add_argument("--port", type=int, default=8050, help="port to listen on (default: 8050)")
+            sub.add_argument("--cache-size", type=int, default=256, help="cached results kept (default: 256)")
+        if name == "log":
+            sub.add_argument(
+                "--log-path", default=None, help="reading log directory (default: <output-dir>/readings.log)"
+            )
+    return parser
+
+
+# ENERGY_DASHBOARD_INSTRUMENT values that turn instrumentation on; "0", "false",
+# "no" and "" (or anything else) leave it off.
+_INSTRUMENT_ENV_MODES = {"1": "timing", "true": "timing", "yes": "timing", "time": "timing", "memory": "memory"}
+
+
+def _instrument_mode(args) -> Optional[str]:
+    if args.instrument:
+        return args.instrument
+    value = os.environ.get("ENERGY_DASHBOARD_INSTRUMENT", "").strip().lower()
+    if value and value not in _INSTRUMENT_ENV_MODES and value not in ("0", "false", "no"):
+        logger.warning("Ignoring unrecognized ENERGY_DASHBOARD_INSTRUMENT=%r", value)
+    return _INSTRUMENT_ENV_MODES.get(value)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(levelname)s: %(message)s",
+    )
+    logger.info("=== Campus Energy Dashboard ===")
+
+    # ENERGY_DASHBOARD_INSTRUMENT=1 records per-stage timings,
+    # ENERGY_DASHBOARD_INSTRUMENT=memory also records peak allocated memory.
+    instrument_mode = _instrument_mode(args)
+    if instrument_mode:
+        instrumentation.enable(track_memory=instrument_mode == "memory")
+
+    handler, _ = COMMANDS[args.command]
+    handler(args)
+
+    if instrumentation.is_enabled():
+        logger.info("Stage timings:\n%s", instrumentation.summary_table())
+        Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+        timings_path = instrumentation.export_json(str(Path(args.output_dir) / "instrumentation.json"))
+        logger.info("  Instrumentation data saved to: %s", timings_path)
+
+    logger.info("All tasks completed successfully!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
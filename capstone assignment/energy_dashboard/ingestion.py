@@ -2,15 +2,459 @@
 
 import os
 import logging
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Tuple, List
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from energy_dashboard.cache import (
+    DEFAULT_CACHE_DIRNAME,
+    content_hash,
+    file_fingerprint,
+    load_cached_frame,
+    load_cached_rejects,
+    store_cached_frame,
+)
+from energy_dashboard.instrumentation import instrumented
+from energy_dashboard.persistence import atomic_path
+from energy_dashboard.readers import CSV_READERS, DEFAULT_READER, BadLine, resolve_reader
+from energy_dashboard.readinglog import ReadingLog, is_reading_log
+
 logger = logging.getLogger(__name__)
 
+# Explicit ingestion schema. 'building' and 'month' are categoricals, 'kwh' is
+# a float of KWH_DTYPES, and 'timestamp' is datetime64[ns] (int64 nanoseconds).
+CATEGORICAL_COLUMNS = ("building", "month")
+KWH_DTYPES = ("float32", "float64")
+DEFAULT_KWH_DTYPE = "float64"
+TIMESTAMP_DTYPE = "datetime64[ns]"
+
+# Candidate timestamp formats, tried in order against a sample of each file.
+# Month-first precedes day-first to match pandas' own default (dayfirst=False).
+TIMESTAMP_FORMATS = (
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%dT%H:%M",
+    "%Y-%m-%d %H:%M:%S%z",
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%d",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%d-%m-%Y %H:%M:%S",
+    "%d-%m-%Y %H:%M",
+)
+FORMAT_SAMPLE_SIZE = 200
+# Share of the sample a format must parse to be chosen (tolerates dirty rows).
+FORMAT_MIN_MATCH = 0.9
+
+# Layout of rejected rows, as written to the quarantine file
+REJECT_COLUMNS = ["file", "line", "reason", "value"]
+# Layout of the per-file counts returned by load_energy_data_with_stats
+FILE_STATS_COLUMNS = ["file", "accepted", "rejected"]
+
+
+class FileLoad(NamedTuple):
+    """
+    One file's share of the ingestion: accepted rows (None if the file was
+    skipped), (logging level, message) pairs, rejected rows as REJECT_COLUMNS,
+    and whether it was served from the cache.
+    """
+
+    df: Optional[pd.DataFrame]
+    messages: List[Tuple[int, str]]
+    rejects: pd.DataFrame
+    cache_hit: bool = False
+
+
+class LoadResult(NamedTuple):
+    """
+    What load_energy_data_with_stats returns: load_energy_data's frame and
+    error messages, plus accepted/rejected row counts per file as
+    FILE_STATS_COLUMNS.
+    """
+
+    df: pd.DataFrame
+    error_logs: List[str]
+    file_stats: pd.DataFrame
+
+
+def detect_timestamp_format(values: pd.Series) -> Optional[str]:
+    """
+    Return the first of TIMESTAMP_FORMATS that parses the most of a sample of
+    values (at least FORMAT_MIN_MATCH of it), or None if none qualifies.
+    """
+    # Look at a bounded prefix so detection cost does not grow with file size
+    sample = values.iloc[: FORMAT_SAMPLE_SIZE * 5].dropna().head(FORMAT_SAMPLE_SIZE).astype(str)
+    if sample.empty:
+        return None
+
+    best_format, best_parsed = None, 0
+    for fmt in TIMESTAMP_FORMATS:
+        parsed = pd.to_datetime(sample, format=fmt, errors="coerce", utc="%z" in fmt)
+        parsed = int(parsed.notna().sum())
+        if parsed > best_parsed:
+            best_format, best_parsed = fmt, parsed
+            if parsed == len(sample):
+                break
+
+    if best_parsed < FORMAT_MIN_MATCH * len(sample):
+        return None
+    return best_format
+
+
+def parse_timestamps(
+    values: pd.Series,
+    timezone: Optional[str] = None,
+    fmt: Optional[str] = None,
+) -> Tuple[pd.Series, Optional[str]]:
+    """
+    Parse raw timestamp values into naive datetime64[ns].
+
+    The format is detected once from a sample (unless a previously detected
+    `fmt` is passed in) and the whole column is parsed with that explicit
+    format; if no candidate fits, pandas' per-value format inference is used
+    instead. Offset-aware values are converted to UTC. If
+    `timezone` is given, naive values are taken as wall-clock times in that
+    zone and converted to UTC as well (ambiguous DST times become NaT,
+    non-existent ones are shifted forward). Unparseable values become NaT.
+
+    Returns:
+        timestamps: parsed naive datetime64[ns] Series.
+        fmt: the detected format, or None if inference was used.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        parsed, fmt = values, None
+    else:
+        if fmt is None:
+            fmt = detect_timestamp_format(values)
+        if fmt is not None:
+            # ISO layouts go through pandas' dedicated ISO 8601 parser, which
+            # is faster than strptime with the equivalent pattern.
+            parse_format = "ISO8601" if fmt.startswith("%Y-%m-%d") else fmt
+            parsed = pd.to_datetime(values, format=parse_format, errors="coerce", utc="%z" in fmt)
+        else:
+            parsed = pd.to_datetime(values, errors="coerce")
+
+    if getattr(parsed.dt, "tz", None) is not None:
+        parsed = parsed.dt.tz_convert("UTC").dt.tz_localize(None)
+    elif timezone is not None:
+        parsed = parsed.dt.tz_localize(timezone, ambiguous="NaT", nonexistent="shift_forward")
+        parsed = parsed.dt.tz_convert("UTC").dt.tz_localize(None)
+
+    return parsed.astype(TIMESTAMP_DTYPE), fmt
+
+
+def _month_categories(timestamps: pd.Series) -> pd.Categorical:
+    """
+    'YYYY-MM' month labels as a categorical, formatting each distinct month once.
+    """
+    codes, months = pd.factorize(timestamps.dt.to_period("M"))
+    return pd.Categorical.from_codes(codes, categories=months.astype(str))
+
+
+def _unify_categoricals(frames: List[pd.DataFrame]) -> None:
+    """
+    Give every frame the same categories for each categorical column, so that
+    pd.concat keeps them categorical instead of falling back to object.
+
+    Categories are sorted, so groupbys over them come out in alphabetical
+    order whatever order the files introduced them in.
+    """
+    for column in CATEGORICAL_COLUMNS:
+        present = [df[column] for df in frames if column in df.columns]
+        if not present:
+            continue
+        categories = pd.api.types.union_categoricals(
+            [pd.Categorical(series) for series in present], sort_categories=True, ignore_order=True
+        ).categories
+        for df in frames:
+            if column in df.columns:
+                df[column] = pd.Categorical(df[column], categories=categories)
+
+
+def combine_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenate per-file frames (as returned by load_csv_file) into one
+    time-sorted frame, keeping the categorical columns categorical.
+    """
+    _unify_categoricals(frames)
+    df_combined = pd.concat(frames, ignore_index=True)
+
+    # Sort by time for convenience
+    return df_combined.sort_values(by="timestamp")
+
+
+def _line_numbers(n_rows: int, skipped_lines: List[int], first_line: int = 2) -> np.ndarray:
+    """
+    Physical line of each parsed row, stepping over the malformed lines the
+    parser skipped; without skips the first row sits on first_line (just
+    below the header for a whole file). Assumes one line per record and no
+    blank lines, which the parsers drop without reporting.
+    """
+    rows = np.arange(n_rows)
+    skipped = np.sort(np.asarray(skipped_lines, dtype=np.int64))
+    # Rows that precede each skipped line; row i sits after every skipped line with fewer
+    rows_before = skipped - first_line - np.arange(len(skipped))
+    return rows + first_line + np.searchsorted(rows_before, rows, side="right")
+
+
+def _reject_frame(file_name: str, lines, reason, values) -> pd.DataFrame:
+    return pd.DataFrame({
+        "file": file_name,
+        "line": pd.array(lines, dtype="Int64"),
+        "reason": reason,
+        "value": pd.array(values, dtype=object),
+    }, columns=REJECT_COLUMNS)
+
+
+def _empty_rejects() -> pd.DataFrame:
+    return _reject_frame("", [], [], [])
+
+
+def _validate_rows(
+    df: pd.DataFrame,
+    raw_timestamps: pd.Series,
+    raw_kwh: pd.Series,
+    line_numbers: np.ndarray,
+    file_name: str,
+) -> Tuple[pd.DataFrame, List[pd.DataFrame]]:
+    """
+    Check every row against the schema with one vectorized mask per rule and
+    split off the failures. A row is rejected for the first rule it breaks.
+    """
+    checks = [
+        ("missing timestamp", raw_timestamps.isna(), raw_timestamps),
+        ("unparseable timestamp", df["timestamp"].isna() & raw_timestamps.notna(), raw_timestamps),
+        ("missing kwh", raw_kwh.isna(), raw_kwh),
+        ("non-numeric kwh", df["kwh"].isna() & raw_kwh.notna(), raw_kwh),
+    ]
+    if "building" in df.columns:
+        checks.append(("missing building", df["building"].isna(), df["building"]))
+
+    rejected = np.zeros(len(df), dtype=bool)
+    parts = []
+    for reason, failed, values in checks:
+        failed = failed.to_numpy(dtype=bool) & ~rejected
+        count = int(failed.sum())
+        if count:
+            parts.append(_reject_frame(file_name, line_numbers[failed], reason, values.to_numpy()[failed]))
+            rejected |= failed
+
+    return (df[~rejected] if rejected.any() else df), parts
+
+
+def clean_rows(
+    df: pd.DataFrame,
+    bad_lines: List[BadLine],
+    file_name: str,
+    timezone: Optional[str] = None,
+    kwh_dtype: str = DEFAULT_KWH_DTYPE,
+    fmt: Optional[str] = None,
+    first_line: int = 2,
+) -> Tuple[pd.DataFrame, List[pd.DataFrame], Optional[str]]:
+    """
+    Parse the raw 'timestamp' and 'kwh' columns of rows a CSV reader returned
+    and split off the rows that fail validation.
+
+    Works on a whole file or on one chunk of it: `first_line` is the line the
+    first row would sit on if no line had been skipped (2 for a whole file),
+    and `fmt` can pass on the timestamp format detected on an earlier chunk.
+
+    Returns:
+        df: the rows that passed validation.
+        rejects: REJECT_COLUMNS frames, the malformed lines the reader skipped
+            first and then one per failed rule (see rejection_messages).
+        fmt: the timestamp format used, or None if inference was used.
+    """
+    reject_parts = []
+    if bad_lines:
+        reject_parts.append(_reject_frame(
+            file_name,
+            [b.line for b in bad_lines],
+            [f"malformed line: {b.reason}" for b in bad_lines],
+            [b.text for b in bad_lines],
+        ))
+    if any(b.line is None for b in bad_lines):
+        # Skipped lines at unknown positions make every row's line number unreliable
+        line_numbers = np.full(len(df), None, dtype=object)
+    else:
+        line_numbers = _line_numbers(len(df), [b.line for b in bad_lines], first_line)
+
+    raw_timestamps = df["timestamp"]
+    df["timestamp"], fmt = parse_timestamps(raw_timestamps, timezone, fmt)
+
+    # Coerce junk kwh values to NaN so the column is always numeric, never object
+    raw_kwh = df["kwh"]
+    df["kwh"] = pd.to_numeric(raw_kwh, errors="coerce").astype(kwh_dtype)
+
+    df, row_rejects = _validate_rows(df, raw_timestamps, raw_kwh, line_numbers, file_name)
+    return df, reject_parts + row_rejects, fmt
+
+
+def rejection_messages(file_name: str, rejects: List[pd.DataFrame]) -> List[Tuple[int, str]]:
+    """
+    One warning per reason for a file's rejects as returned by clean_rows;
+    frames of the same reason (e.g. from successive chunks) are counted together.
+    """
+    counts: Dict[str, int] = {}
+    for part in rejects:
+        if len(part):
+            reason = part["reason"].iat[0]
+            key = "malformed" if reason.startswith("malformed line") else reason
+            counts[key] = counts.get(key, 0) + len(part)
+
+    return [
+        (logging.WARNING, f"File {file_name}: rejected {count} malformed line(s).") if key == "malformed" else
+        (logging.WARNING, f"File {file_name}: rejected {count} row(s) with {key}.")
+        for key, count in counts.items()
+    ]
 
-def load_energy_data(data_dir: str = "data") -> Tuple[pd.DataFrame, List[str]]:
+
+def load_csv_file(
+    csv_file: Path,
+    cache_dir: Optional[Path] = None,
+    kwh_dtype: str = DEFAULT_KWH_DTYPE,
+    timezone: Optional[str] = None,
+    reader: str = "pandas",
+) -> FileLoad:
+    """
+    Read one CSV file with the given reader backend, normalize it to the
+    ingestion schema and split off rows that fail validation.
+
+    `reader` must be a concrete backend name (see resolve_reader).
+
+    Runs in the calling process or inside a worker, so it never logs directly;
+    instead it returns (level, message) pairs that the caller logs in order.
+
+    If cache_dir is given, an unchanged file is served (with its rejects)
+    from the columnar cache and a freshly parsed one is written back to it.
+
+    Returns a FileLoad; its df is normalized to the ingestion schema.
+    """
+    messages: List[Tuple[int, str]] = []
+    fingerprint = None
+    # Parse options that change the cached result; a mismatch is a cache miss
+    cache_options = {"timezone": timezone, "kwh_dtype": kwh_dtype, "reader": reader}
+
+    if cache_dir is not None:
+        try:
+            cached = load_cached_frame(csv_file, cache_dir, cache_options)
+        except Exception as e:
+            cached = None
+            messages.append((logging.WARNING, f"Ignoring unreadable cache entry for {csv_file.name}: {e}"))
+        if cached is not None:
+            messages.append((logging.DEBUG, f"Cache hit: {csv_file.name}"))
+            rejects = load_cached_rejects(csv_file, cache_dir)
+            if rejects is None:
+                rejects = _empty_rejects()
+            elif len(rejects):
+                messages.append((
+                    logging.WARNING, f"File {csv_file.name}: {len(rejects)} row(s) rejected (cached)."
+                ))
+            return FileLoad(cached, messages, rejects, cache_hit=True)
+        messages.append((logging.DEBUG, f"Cache miss: {csv_file.name}"))
+        fingerprint = file_fingerprint(csv_file)
+
+    try:
+        # Malformed lines are skipped by the reader and reported back for quarantine
+        df, bad_lines = CSV_READERS[reader](csv_file, {column: "category" for column in CATEGORICAL_COLUMNS})
+
+        # Ensure required columns exist
+        if "kwh" not in df.columns:
+            messages.append((logging.WARNING, f"File {csv_file.name} missing 'kwh' column. Skipped."))
+            return FileLoad(None, messages, _empty_rejects())
+
+        # Handle timestamp
+        if "timestamp" not in df.columns:
+            messages.append((logging.WARNING, f"File {csv_file.name} missing 'timestamp' column. Skipped."))
+            return FileLoad(None, messages, _empty_rejects())
+
+        df, reject_parts, fmt = clean_rows(df, bad_lines, csv_file.name, timezone, kwh_dtype)
+        messages.append((
+            logging.DEBUG,
+            f"File {csv_file.name}: timestamp format {fmt!r}" if fmt else
+            f"File {csv_file.name}: no fixed timestamp format detected, inferring per value",
+        ))
+        messages += rejection_messages(csv_file.name, reject_parts)
+        rejects = pd.concat(reject_parts, ignore_index=True) if reject_parts else _empty_rejects()
+        if len(reject_parts) > 1:
+            rejects = rejects.sort_values("line", kind="stable", na_position="last", ignore_index=True)
+
+        # If building column missing → infer from filename (e.g. 'library_jan.csv' → 'library')
+        if "building" not in df.columns:
+            building_name = csv_file.stem   # filename without extension
+            df["building"] = pd.Categorical.from_codes(
+                np.zeros(len(df), dtype=np.int8), categories=[building_name]
+            )
+
+        # If month column missing → infer from timestamp
+        if "month" not in df.columns:
+            df["month"] = _month_categories(df["timestamp"])
+
+        if cache_dir is not None:
+            try:
+                store_cached_frame(csv_file, cache_dir, df, fingerprint, cache_options, rejects=rejects)
+            except Exception as e:
+                messages.append((logging.WARNING, f"Could not cache {csv_file.name}: {e}"))
+
+        return FileLoad(df, messages, rejects)
+
+    except FileNotFoundError:
+        messages.append((logging.ERROR, f"File not found: {csv_file}"))
+    except pd.errors.EmptyDataError:
+        messages.append((logging.WARNING, f"Empty or invalid CSV file: {csv_file}"))
+    except Exception as e:
+        messages.append((logging.ERROR, f"Error reading {csv_file.name}: {e}"))
+
+    return FileLoad(None, messages, _empty_rejects())
+
+
+def write_quarantine(rejects: List[pd.DataFrame], quarantine_path: str) -> None:
+    """
+    Replace the quarantine file with this run's rejects (header only if there are none).
+    """
+    path = Path(quarantine_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    non_empty = [frame for frame in rejects if len(frame)]
+    combined = pd.concat(non_empty, ignore_index=True) if non_empty else _empty_rejects()
+    with atomic_path(path) as tmp_path:
+        combined.to_csv(tmp_path, index=False)
+
+
+def _load_reading_log(log_path: Path, kwh_dtype: str) -> pd.DataFrame:
+    """
+    All readings of a ReadingLog, time-sorted like the CSV path's result.
+    """
+    log = ReadingLog(str(log_path))
+    if not len(log):
+        raise ValueError(f"Reading log {log_path} is empty.")
+    df = log.to_frame(kwh_dtype=kwh_dtype)
+    logger.info("Mapped %d readings of %d building(s) from reading log %s", len(log), len(log.buildings), log_path)
+    # A log appended in time order needs no sort, and stays a zero-copy view
+    return df if log.time_sorted else df.sort_values(by="timestamp")
+
+
+@instrumented
+def load_energy_data(
+    data_dir: str = "data",
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+    use_processes: bool = True,
+    use_cache: bool = False,
+    cache_dir: Optional[str] = None,
+    kwh_dtype: str = DEFAULT_KWH_DTYPE,
+    timezone: Optional[str] = None,
+    reader: str = DEFAULT_READER,
+    quarantine_path: Optional[str] = None,
+) -> Tuple[pd.DataFrame, List[str]]:
     """
     Read all CSV files from a directory and combine them into a single DataFrame.
 
@@ -21,71 +465,224 @@ def load_energy_data(data_dir: str = "data") -> Tuple[pd.DataFrame, List[str]]:
     If 'building' is missing, it is inferred from filename.
     If 'month' is missing, it is inferred from timestamp.
 
+    Files are processed in filename order. With parallel=True, files are parsed
+    and normalized concurrently (process pool by default, thread pool if
+    use_processes=False) with up to max_workers workers; results are still
+    combined in filename order, so the output matches the serial path.
+
+    With use_cache=True, each normalized file is kept in a per-file columnar
+    cache (default: '<data_dir>/.energy_cache') keyed by path, size, mtime and
+    content hash; only new or changed files are parsed from CSV. Cache hits
+    and misses are logged, and cache problems are reported in error_logs.
+
+    Columns follow an explicit schema: 'building' and 'month' are categoricals,
+    'kwh' is kwh_dtype ('float32' or 'float64') and 'timestamp' is
+    datetime64[ns]. Unparseable timestamps and kwh values are counted and
+    reported in error_logs.
+
+    Each file's timestamp format is detected once from a sample and parsed
+    with that explicit format (see parse_timestamps); downstream code can rely
+    on 'timestamp' already being typed. If timezone is given, naive
+    timestamps are treated as local to it and everything is normalized to
+    naive UTC; offset-aware timestamps are always normalized to naive UTC.
+
+    Files are parsed by the `reader` backend (see energy_dashboard.readers;
+    the default C parser reports the line number of every malformed line).
+    Malformed lines and rows with a missing or invalid timestamp, kwh or
+    building are rejected rather than dropped silently: each reject is
+    counted in error_logs and, if quarantine_path is given, written there
+    with its file, line number and reason.
+
+    If data_dir is a reading log (see energy_dashboard.readinglog) instead of
+    a folder of CSVs, its readings are memory-mapped rather than parsed; they
+    were validated when appended, so nothing is rejected, and the frame has
+    no 'month' column.
+
     Returns:
         df_combined: merged DataFrame of all buildings.
         error_logs: list of error messages for missing / corrupt files.
     """
+    df_combined, error_logs, _ = _load_energy_data(
+        data_dir=data_dir,
+        parallel=parallel,
+        max_workers=max_workers,
+        use_processes=use_processes,
+        use_cache=use_cache,
+        cache_dir=cache_dir,
+        kwh_dtype=kwh_dtype,
+        timezone=timezone,
+        reader=reader,
+        quarantine_path=quarantine_path,
+    )
+    return df_combined, error_logs
+
+
+@instrumented
+def load_energy_data_with_stats(
+    data_dir: str = "data",
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+    use_processes: bool = True,
+    use_cache: bool = False,
+    cache_dir: Optional[str] = None,
+    kwh_dtype: str = DEFAULT_KWH_DTYPE,
+    timezone: Optional[str] = None,
+    reader: str = DEFAULT_READER,
+    quarantine_path: Optional[str] = None,
+) -> LoadResult:
+    """
+    Same as load_energy_data, but also returns how many rows of each file
+    were accepted and rejected (see LoadResult).
+    """
+    return _load_energy_data(
+        data_dir=data_dir,
+        parallel=parallel,
+        max_workers=max_workers,
+        use_processes=use_processes,
+        use_cache=use_cache,
+        cache_dir=cache_dir,
+        kwh_dtype=kwh_dtype,
+        timezone=timezone,
+        reader=reader,
+        quarantine_path=quarantine_path,
+    )
+
+
+def _load_energy_data(
+    data_dir: str,
+    parallel: bool,
+    max_workers: Optional[int],
+    use_processes: bool,
+    use_cache: bool,
+    cache_dir: Optional[str],
+    kwh_dtype: str,
+    timezone: Optional[str],
+    reader: str,
+    quarantine_path: Optional[str],
+) -> LoadResult:
     data_path = Path(data_dir)
     if not data_path.exists():
         raise FileNotFoundError(f"Data directory not found: {data_dir}")
+    if kwh_dtype not in KWH_DTYPES:
+        raise ValueError(f"kwh_dtype must be one of {KWH_DTYPES}, got {kwh_dtype!r}")
+
+    if is_reading_log(data_dir):
+        df_combined = _load_reading_log(data_path, kwh_dtype)
+        if quarantine_path is not None:
+            write_quarantine([], quarantine_path)
+        file_stats = pd.DataFrame([(data_path.name, len(df_combined), 0)], columns=FILE_STATS_COLUMNS)
+        return LoadResult(df_combined, [], file_stats)
+
+    csv_files = sorted(f for f in data_path.iterdir() if f.suffix.lower() == ".csv")
+
+    resolved_cache_dir = None
+    if use_cache:
+        resolved_cache_dir = Path(cache_dir) if cache_dir else data_path / DEFAULT_CACHE_DIRNAME
+    load_file = partial(
+        load_csv_file,
+        cache_dir=resolved_cache_dir,
+        kwh_dtype=kwh_dtype,
+        timezone=timezone,
+        reader=resolve_reader(reader),
+    )
 
-    csv_files = [f for f in data_path.iterdir() if f.suffix.lower() == ".csv"]
+    if parallel and len(csv_files) > 1:
+        pool_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        with pool_cls(max_workers=max_workers) as pool:
+            # map() yields results in submission order, keeping output deterministic
+            results = list(pool.map(load_file, csv_files))
+    else:
+        results = [load_file(f) for f in csv_files]
 
     all_dfs = []
     error_logs = []
+    cache_hits = 0
+    all_rejects = []
+    file_stats = []
 
-    for csv_file in csv_files:
-        try:
-            # Try reading CSV; skip bad lines instead of failing.
-            df = pd.read_csv(csv_file, on_bad_lines="skip")
-
-            # Ensure required columns exist
-            if "kwh" not in df.columns:
-                msg = f"File {csv_file.name} missing 'kwh' column. Skipped."
+    for csv_file, (df, messages, rejects, cache_hit) in zip(csv_files, results):
+        for level, msg in messages:
+            if level >= logging.WARNING:
                 error_logs.append(msg)
-                logger.warning(msg)
-                continue
+            logger.log(level, msg)
+        cache_hits += cache_hit
+        if df is not None:
+            all_dfs.append(df)
+        all_rejects.append(rejects)
+        file_stats.append((csv_file.name, 0 if df is None else len(df), len(rejects)))
 
-            # Handle timestamp
-            if "timestamp" not in df.columns:
-                msg = f"File {csv_file.name} missing 'timestamp' column. Skipped."
-                error_logs.append(msg)
-                logger.warning(msg)
-                continue
+    if use_cache:
+        logger.info(
+            "Ingestion cache: %d hit(s), %d miss(es)", cache_hits, len(csv_files) - cache_hits
+        )
 
-            df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
-            df = df.dropna(subset=["timestamp"])
+    if quarantine_path is not None:
+        write_quarantine(all_rejects, quarantine_path)
 
-            # If building column missing → infer from filename (e.g. 'library_jan.csv' → 'library')
-            if "building" not in df.columns:
-                building_name = csv_file.stem   # filename without extension
-                df["building"] = building_name
+    if not all_dfs:
+        raise ValueError("No valid CSV files were loaded from the data directory.")
 
-            # If month column missing → infer from timestamp
-            if "month" not in df.columns:
-                df["month"] = df["timestamp"].dt.to_period("M").astype(str)
+    df_combined = combine_frames(all_dfs)
 
-            all_dfs.append(df)
+    return LoadResult(df_combined, error_logs, pd.DataFrame(file_stats, columns=FILE_STATS_COLUMNS))
 
-        except FileNotFoundError:
-            msg = f"File not found: {csv_file}"
-            error_logs.append(msg)
-            logger.error(msg)
-        except pd.errors.EmptyDataError:
-            msg = f"Empty or invalid CSV file: {csv_file}"
-            error_logs.append(msg)
+
+@instrumented
+def append_to_reading_log(
+    data_dir: str = "data",
+    log_path: str = "output/readings.log",
+    kwh_dtype: str = DEFAULT_KWH_DTYPE,
+    timezone: Optional[str] = None,
+    reader: str = DEFAULT_READER,
+    quarantine_path: Optional[str] = None,
+) -> Tuple[int, List[str]]:
+    """
+    Append every CSV in data_dir that the reading log has not seen yet.
+
+    Files are parsed and validated exactly as in load_energy_data and each is
+    committed to the log on its own, so an interrupted run loses at most the
+    file in progress. Files are recognized by name and content hash: an
+    already appended file is skipped, and one whose content changed since it
+    was appended is reported and skipped too, as the log is append-only.
+
+    Returns:
+        appended: number of readings appended.
+        error_logs: list of problems, as in load_energy_data.
+    """
+    data_path = Path(data_dir)
+    if not data_path.exists():
+        raise FileNotFoundError(f"Data directory not found: {data_dir}")
+
+    log = ReadingLog(log_path)
+    resolved_reader = resolve_reader(reader)
+    appended = 0
+    error_logs = []
+    all_rejects = []
+
+    for csv_file in sorted(f for f in data_path.iterdir() if f.suffix.lower() == ".csv"):
+        source_hash = content_hash(csv_file)
+        if log.has_source(csv_file.name, source_hash):
+            logger.debug("Already in reading log: %s", csv_file.name)
+            continue
+        if log.has_source(csv_file.name):
+            msg = f"File {csv_file.name} changed since it was appended to the reading log. Skipped."
             logger.warning(msg)
-        except Exception as e:
-            msg = f"Error reading {csv_file.name}: {e}"
             error_logs.append(msg)
-            logger.exception(msg)
+            continue
 
-    if not all_dfs:
-        raise ValueError("No valid CSV files were loaded from the data directory.")
-
-    df_combined = pd.concat(all_dfs, ignore_index=True)
+        df, messages, rejects, _ = load_csv_file(
+            csv_file, kwh_dtype=kwh_dtype, timezone=timezone, reader=resolved_reader
+        )
+        for level, msg in messages:
+            if level >= logging.WARNING:
+                error_logs.append(msg)
+            logger.log(level, msg)
+        all_rejects.append(rejects)
+        if df is not None:
+            appended += log.append(df, source=csv_file.name, source_hash=source_hash)
 
-    # Sort by time for convenience
-    df_combined = df_combined.sort_values(by="timestamp")
+    if quarantine_path is not None:
+        write_quarantine(all_rejects, quarantine_path)
 
-    return df_combined, error_logs
\ No newline at end of file
+    logger.info("Reading log %s: %d readings appended, %d in total", log_path, appended, len(log))
+    return appended, error_logs
@@ -0,0 +1,177 @@
+# energy_dashboard/instrumentation.py
+
+"""
+Opt-in per-stage timing and memory instrumentation.
+
+Disabled by default: `stage()` and `instrumented` then cost one attribute
+check per call. Enable with `enable()` (optionally with memory tracking,
+which uses tracemalloc and is noticeably slower).
+"""
+
+import functools
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Callable, Iterator, List, Optional
+
+
+@dataclass
+class StageRecord:
+    name: str
+    wall_seconds: float
+    cpu_seconds: float
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    peak_mb: Optional[float] = None
+
+
+class _Recorder:
+    def __init__(self):
+        self.enabled = False
+        self.track_memory = False
+        self.records: List[StageRecord] = []
+        # Highest traced memory seen so far by each open stage, innermost last
+        self.peak_stack: List[int] = []
+
+
+_recorder = _Recorder()
+
+
+def enable(track_memory: bool = False) -> None:
+    """
+    Start recording. Clears records from any previous run.
+    """
+    _recorder.enabled = True
+    _recorder.track_memory = track_memory
+    _recorder.records = []
+    _recorder.peak_stack = []
+    if track_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def disable() -> None:
+    _recorder.enabled = False
+    if _recorder.track_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _recorder.track_memory = False
+
+
+def is_enabled() -> bool:
+    return _recorder.enabled
+
+
+def records() -> List[StageRecord]:
+    return list(_recorder.records)
+
+
+def _row_count(obj) -> Optional[int]:
+    """
+    Best-effort row count: len() of a DataFrame, or of the first element of a tuple result.
+    """
+    if isinstance(obj, tuple) and obj:
+        obj = obj[0]
+    if hasattr(obj, "shape") and hasattr(obj, "__len__"):
+        return len(obj)
+    return None
+
+
+class _StageHandle:
+    """
+    Yielded by stage(); lets the caller report row counts.
+    """
+
+    def __init__(self):
+        self.rows_in: Optional[int] = None
+        self.rows_out: Optional[int] = None
+
+
+@contextmanager
+def stage(name: str) -> Iterator[_StageHandle]:
+    """
+    Record wall time, CPU time and (optionally) peak memory of a block.
+
+        with stage("aggregation") as s:
+            s.rows_in = len(df)
+            ...
+    """
+    handle = _StageHandle()
+    if not _recorder.enabled:
+        yield handle
+        return
+
+    # Nested stages share tracemalloc's single peak counter. Before a stage
+    # resets it, the peak so far is folded into the enclosing stage's entry
+    # on peak_stack, and the stage's own peak is folded in again when it ends.
+    mem_start = 0
+    if _recorder.track_memory:
+        if _recorder.peak_stack:
+            _recorder.peak_stack[-1] = max(_recorder.peak_stack[-1], tracemalloc.get_traced_memory()[1])
+        tracemalloc.reset_peak()
+        mem_start = tracemalloc.get_traced_memory()[0]
+        _recorder.peak_stack.append(mem_start)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield handle
+    finally:
+        record = StageRecord(
+            name=name,
+            wall_seconds=time.perf_counter() - wall_start,
+            cpu_seconds=time.process_time() - cpu_start,
+            rows_in=handle.rows_in,
+            rows_out=handle.rows_out,
+        )
+        if _recorder.track_memory:
+            peak = max(_recorder.peak_stack.pop(), tracemalloc.get_traced_memory()[1])
+            if _recorder.peak_stack:
+                _recorder.peak_stack[-1] = max(_recorder.peak_stack[-1], peak)
+            record.peak_mb = max(0, peak - mem_start) / 2**20
+        _recorder.records.append(record)
+
+
+def instrumented(func: Callable) -> Callable:
+    """
+    Decorator recording each call of a public energy_dashboard function as a stage.
+
+    Rows in/out are taken from the first positional argument and the return
+    value when they are DataFrames (or tuples starting with one).
+    """
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _recorder.enabled:
+            return func(*args, **kwargs)
+        with stage(name) as s:
+            s.rows_in = _row_count(args[0]) if args else None
+            result = func(*args, **kwargs)
+            s.rows_out = _row_count(result)
+        return result
+
+    return wrapper
+
+
+def summary_table() -> str:
+    """
+    Format recorded stages as a fixed-width text table.
+    """
+    header = f"{'stage':<44} {'wall s':>9} {'cpu s':>9} {'rows in':>10} {'rows out':>10} {'peak MB':>9}"
+    lines = [header, "-" * len(header)]
+
+    def fmt(value, spec):
+        return format(value, spec) if value is not None else "-"
+
+    for r in _recorder.records:
+        lines.append(
+            f"{r.name:<44} {r.wall_seconds:>9.3f} {r.cpu_seconds:>9.3f} "
+            f"{fmt(r.rows_in, 'd'):>10} {fmt(r.rows_out, 'd'):>10} {fmt(r.peak_mb, '.1f'):>9}"
+        )
+    return "\n".join(lines)
+
+
+def export_json(path: str) -> str:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([asdict(r) for r in _recorder.records], f, indent=2)
+    return path
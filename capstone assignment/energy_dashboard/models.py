@@ -1,32 +1,188 @@
 # energy_dashboard/models.py
 
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import TYPE_CHECKING, List, Dict, Tuple
 
+import numpy as np
 import pandas as pd
 
+if TYPE_CHECKING:
+    from energy_dashboard.readinglog import ReadingLog
 
-@dataclass
+
+@dataclass(slots=True)
 class MeterReading:
+    """
+    Lightweight view of a single reading; created on demand from a Building's arrays.
+    """
     timestamp: pd.Timestamp
     kwh: float
 
 
 class Building:
+    """
+    A building and its meter readings.
+
+    Readings are stored column-wise as contiguous arrays: int64 epoch
+    nanoseconds in `timestamps` and float64 kWh in `kwh`. Appended batches
+    are buffered and joined with one concatenate when the arrays are next
+    read, so adding readings one at a time stays linear.
+
+    Range queries (readings_between, range_summary) binary-search the
+    timestamps, so they cost O(log n + k) for k readings in the range. The
+    first query sorts the arrays by time if appends left them out of order.
+    """
+
     def __init__(self, name: str):
         self.name = name
-        self.meter_readings: List[MeterReading] = []
+        self._timestamps = np.empty(0, dtype=np.int64)
+        self._kwh = np.empty(0, dtype=np.float64)
+        # (timestamps, kwh) batches appended since the arrays were last read
+        self._pending: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._pending_count = 0
+        self._time_sorted = True
+
+    def __len__(self) -> int:
+        return len(self._kwh) + self._pending_count
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        self._flush()
+        return self._timestamps
+
+    @property
+    def kwh(self) -> np.ndarray:
+        self._flush()
+        return self._kwh
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        batches = self._pending
+        if len(self._kwh):
+            batches = [(self._timestamps, self._kwh)] + batches
+        if len(batches) == 1:
+            self._timestamps, self._kwh = batches[0]
+        else:
+            self._timestamps = np.concatenate([t for t, _ in batches])
+            self._kwh = np.concatenate([k for _, k in batches])
+        self._pending = []
+        self._pending_count = 0
+
+    def _last_timestamp(self):
+        if self._pending:
+            return self._pending[-1][0][-1]
+        return self._timestamps[-1] if len(self._timestamps) else None
+
+    @property
+    def meter_readings(self) -> List[MeterReading]:
+        """
+        Materialize readings as MeterReading objects (for small buildings / debugging).
+        """
+        return [self._reading_at(i) for i in range(len(self))]
+
+    def _reading_at(self, i: int) -> MeterReading:
+        return MeterReading(pd.Timestamp(int(self.timestamps[i])), float(self.kwh[i]))
 
     def add_reading(self, reading: MeterReading) -> None:
-        self.meter_readings.append(reading)
+        self.add_readings(
+            np.array([pd.Timestamp(reading.timestamp).value], dtype=np.int64),
+            np.array([reading.kwh], dtype=np.float64),
+        )
+
+    def add_readings(self, timestamps: np.ndarray, kwh: np.ndarray) -> None:
+        """
+        Append a batch of readings (int64 epoch ns timestamps, float64 kWh).
+        """
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        if len(timestamps) == 0:
+            return
+
+        # Appending an ordered batch after the current last reading keeps the index valid
+        in_order = bool(np.all(timestamps[1:] >= timestamps[:-1]))
+        last = self._last_timestamp()
+        if last is not None and timestamps[0] < last:
+            in_order = False
+        self._time_sorted = self._time_sorted and in_order
+
+        self._pending.append((np.ascontiguousarray(timestamps), np.ascontiguousarray(kwh, dtype=np.float64)))
+        self._pending_count += len(timestamps)
+
+    def _ensure_time_order(self) -> None:
+        if not self._time_sorted:
+            order = np.argsort(self.timestamps, kind="stable")
+            self._timestamps = self._timestamps[order]
+            self._kwh = self._kwh[order]
+            self._time_sorted = True
+
+    def _range_bounds(self, start=None, end=None) -> Tuple[int, int]:
+        """
+        Positions of the half-open time range [start, end); None means unbounded.
+        """
+        self._ensure_time_order()
+        lo = 0 if start is None else int(np.searchsorted(self.timestamps, pd.Timestamp(start).value, "left"))
+        hi = len(self.timestamps) if end is None else int(
+            np.searchsorted(self.timestamps, pd.Timestamp(end).value, "left")
+        )
+        return lo, max(lo, hi)
+
+    def readings_between(self, start=None, end=None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Array views (timestamps ns, kWh) of readings with start <= timestamp < end.
+        """
+        lo, hi = self._range_bounds(start, end)
+        return self.timestamps[lo:hi], self.kwh[lo:hi]
+
+    def range_summary(self, start=None, end=None) -> Dict[str, float | int | str]:
+        """
+        Total, mean, peak and count of readings with start <= timestamp < end.
+        """
+        lo, hi = self._range_bounds(start, end)
+        kwh = self.kwh[lo:hi]
+        if len(kwh) == 0:
+            return {
+                "building": self.name,
+                "total_kwh": 0.0,
+                "mean_kwh": float("nan"),
+                "peak_kwh": 0.0,
+                "peak_time": "N/A",
+                "readings_count": 0,
+            }
+
+        peak = lo + int(np.argmax(kwh))
+        return {
+            "building": self.name,
+            "total_kwh": float(kwh.sum()),
+            "mean_kwh": float(kwh.mean()),
+            "peak_kwh": float(self.kwh[peak]),
+            "peak_time": str(pd.Timestamp(int(self.timestamps[peak]))),
+            "readings_count": len(kwh),
+        }
 
     def calculate_total_consumption(self) -> float:
-        return sum(r.kwh for r in self.meter_readings)
+        return float(self.kwh.sum())
 
     def calculate_peak_load(self) -> MeterReading | None:
-        if not self.meter_readings:
-            return None
-        return max(self.meter_readings, key=lambda r: r.kwh)
+        # Earliest among equal maxima, like top_peaks and the peak reports
+        peaks = self.top_peaks(1)
+        return peaks[0] if peaks else None
+
+    def top_peaks(self, k: int = 5) -> List[MeterReading]:
+        """
+        The k largest readings, largest first (earliest first among equal values).
+        """
+        # Missing readings (NaN) would make the cut-off NaN, so they never rank
+        valid = np.flatnonzero(~np.isnan(self.kwh))
+        n = len(valid)
+        take = min(k, n)
+        if take <= 0:
+            return []
+        # Partial selection: only readings at least as large as the k-th largest
+        # are sorted, so all ties at the cut-off compete on time
+        cutoff = np.partition(self.kwh[valid], n - take)[n - take]
+        candidates = valid[self.kwh[valid] >= cutoff]
+        winners = candidates[np.lexsort((self.timestamps[candidates], -self.kwh[candidates]))][:take]
+        return [self._reading_at(int(i)) for i in winners]
 
     def generate_report(self) -> Dict[str, float | str]:
         """
@@ -40,7 +196,7 @@ class Building:
             "total_kwh": total,
             "peak_kwh": peak.kwh if peak else 0.0,
             "peak_time": str(peak.timestamp) if peak else "N/A",
-            "readings_count": len(self.meter_readings),
+            "readings_count": len(self),
         }
         return report
 
@@ -56,20 +212,68 @@ class BuildingManager:
 
     def load_from_dataframe(self, df: pd.DataFrame) -> None:
         """
-        Convert rows from raw DataFrame into Building and MeterReading objects.
+        Load readings from a DataFrame into Buildings, one array slice per building.
+
+        Expects 'building', 'timestamp', 'kwh' columns. Buildings are created in
+        order of first appearance and keep their readings in row order.
+        """
+        if df.empty:
+            return
+
+        timestamps = df["timestamp"]
+        if not pd.api.types.is_datetime64_any_dtype(timestamps):
+            timestamps = pd.to_datetime(timestamps)
+        ts_ns = timestamps.to_numpy(dtype="datetime64[ns]").view(np.int64)
+        kwh = df["kwh"].to_numpy(dtype=np.float64)
+
+        codes, names = pd.factorize(df["building"])
+        self._load_grouped(codes, names, ts_ns, kwh)
+
+    def load_from_reading_log(self, log: "ReadingLog", start=None, end=None) -> None:
+        """
+        Load readings with start <= timestamp < end straight from a ReadingLog.
+
+        The log's array views and building ids are used as they are, so there
+        is no DataFrame, timestamp conversion or building factorization on the way.
+        """
+        ts_ns, ids, kwh = log.arrays(start, end)
+        if len(ts_ns):
+            self._load_grouped(ids, log.buildings, ts_ns, kwh)
+
+    def _load_grouped(self, codes: np.ndarray, names, ts_ns: np.ndarray, kwh: np.ndarray) -> None:
+        """
+        Add readings to Buildings by building code (names[code]; -1 = missing).
+        """
+        # Stable sort keeps each building's readings in their original row order
+        order = np.argsort(codes, kind="stable")
+        boundaries = np.flatnonzero(np.diff(codes[order])) + 1
+        starts = np.concatenate([[0], boundaries])
+        ends = np.concatenate([boundaries, [len(order)]])
+
+        for start, end in zip(starts, ends):
+            code = codes[order[start]]
+            if code < 0:
+                # Missing building name
+                continue
+            rows = order[start:end]
+            building = self.get_or_create_building(names[code])
+            building.add_readings(ts_ns[rows], kwh[rows])
 
-        Expects 'building', 'timestamp', 'kwh' columns.
+    def readings_between(self, building: str, start=None, end=None) -> pd.DataFrame:
         """
-        for _, row in df.iterrows():
-            building_name = row["building"]
-            timestamp = pd.to_datetime(row["timestamp"])
-            kwh = float(row["kwh"])
+        Readings of one building with start <= timestamp < end, as a DataFrame.
+        """
+        timestamps, kwh = self.buildings[building].readings_between(start, end)
+        return pd.DataFrame({"timestamp": timestamps.view("datetime64[ns]"), "kwh": kwh})
 
-            building = self.get_or_create_building(building_name)
-            building.add_reading(MeterReading(timestamp, kwh))
+    def range_summary(self, building: str, start=None, end=None) -> Dict[str, float | int | str]:
+        """
+        Total, mean, peak and count for one building over start <= timestamp < end.
+        """
+        return self.buildings[building].range_summary(start, end)
 
     def generate_all_reports(self) -> List[Dict[str, float | str]]:
         """
         Generate a report for each building.
         """
-        return [b.generate_report() for b in self.buildings.values()]
\ No newline at end of file
+        return [b.generate_report() for b in self.buildings.values()]
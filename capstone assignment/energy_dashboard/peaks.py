@@ -0,0 +1,239 @@
+# energy_dashboard/peaks.py
+
+"""
+Top-K peak loads for demand-charge analysis.
+
+- top_k_peaks:       the K largest readings of every building
+- campus_top_k:      the K largest single readings campus-wide
+- coincident_peaks:  the K intervals with the largest summed campus load
+                     (top_intervals selects them from interval_totals, which
+                     can be added up per building with sum_interval_totals)
+
+Selection partitions with np.partition, so only the K winners (plus any
+readings tied with the K-th) are ever sorted; equal loads rank earliest
+first. Per-building selection runs on all buildings at once: readings are
+laid out as a padded (buildings x readings) matrix and partitioned
+row-wise. Buildings are batched by reading count so padding stays small
+and the matrix stays under a fixed cell budget.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from energy_dashboard.instrumentation import instrumented
+
+DEFAULT_K = 5
+DEFAULT_INTERVAL = "1h"
+PEAK_COLUMNS = ["building", "rank", "timestamp", "kwh"]
+COINCIDENT_COLUMNS = ["rank", "timestamp", "kwh", "buildings"]
+
+# Max cells (float64) in one padded selection matrix
+_CELL_BUDGET = 1 << 22
+
+
+def _top_k_per_group(
+    codes: np.ndarray, values: np.ndarray, tiebreak: np.ndarray, n_groups: int, k: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Row positions, group ids and ranks (1 = largest) of each group's k largest
+    values. Equal values rank by ascending tiebreak (e.g. earliest timestamp).
+    """
+    if k <= 0 or len(values) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+
+    # Group rows contiguously, keeping their original order within a group
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.cumsum(counts) - counts
+    by_size = np.argsort(counts, kind="stable")
+
+    rows, groups, ranks = [], [], []
+    lo = 0
+    while lo < n_groups:
+        hi = lo + 1
+        while hi < n_groups and (hi + 1 - lo) * counts[by_size[hi]] <= _CELL_BUDGET:
+            hi += 1
+        batch = by_size[lo:hi]
+        lo = hi
+        width = int(counts[batch[-1]])
+        if width == 0:
+            continue
+
+        # Scatter the batch's readings into a -inf padded matrix, one row per group
+        sizes = counts[batch]
+        matrix_row = np.repeat(np.arange(len(batch)), sizes)
+        matrix_col = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        source = order[np.repeat(starts[batch], sizes) + matrix_col]
+        matrix = np.full((len(batch), width), -np.inf)
+        matrix[matrix_row, matrix_col] = values[source]
+        positions = np.full((len(batch), width), -1, dtype=np.int64)
+        positions[matrix_row, matrix_col] = source
+
+        take = min(k, width)
+        # Keep every value at least as large as the row's take-th largest, so
+        # ties at the cut-off are decided by tiebreak rather than by the partition
+        cutoff = np.partition(matrix, width - take, axis=1)[:, width - take]
+        candidate_row, candidate_col = np.nonzero((matrix >= cutoff[:, None]) & (positions >= 0))
+        candidate = positions[candidate_row, candidate_col]
+        # Only the candidates get sorted: by row, largest value, then tiebreak
+        by_rank = np.lexsort((tiebreak[candidate], -values[candidate], candidate_row))
+        candidate_row, candidate = candidate_row[by_rank], candidate[by_rank]
+        rank = np.arange(1, len(candidate) + 1) - np.searchsorted(candidate_row, candidate_row, side="left")
+        winners = rank <= take
+
+        rows.append(candidate[winners])
+        groups.append(batch[candidate_row[winners]])
+        ranks.append(rank[winners])
+
+    return np.concatenate(rows), np.concatenate(groups), np.concatenate(ranks)
+
+
+def _readings(df: pd.DataFrame):
+    readings = df.dropna(subset=["building", "timestamp", "kwh"])
+    codes, names = pd.factorize(readings["building"])
+    ts_ns = readings["timestamp"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    kwh = readings["kwh"].to_numpy(dtype=np.float64)
+    return codes, np.asarray(names, dtype=object), ts_ns, kwh
+
+
+@instrumented
+def top_k_peaks(df: pd.DataFrame, k: int = DEFAULT_K) -> pd.DataFrame:
+    """
+    The k largest readings of every building ('building', 'timestamp', 'kwh').
+
+    Returns PEAK_COLUMNS sorted by building and rank; buildings with fewer
+    than k readings contribute all of them. Equal readings rank earliest first.
+    """
+    codes, names, ts_ns, kwh = _readings(df)
+    rows, groups, ranks = _top_k_per_group(codes, kwh, ts_ns, len(names), k)
+    peaks = pd.DataFrame({
+        "building": names[groups],
+        "rank": ranks,
+        "timestamp": ts_ns[rows].view("datetime64[ns]"),
+        "kwh": kwh[rows],
+    })
+    return peaks.sort_values(["building", "rank"], ignore_index=True)
+
+
+@instrumented
+def campus_top_k(df: pd.DataFrame, k: int = DEFAULT_K) -> pd.DataFrame:
+    """
+    The k largest single readings across all buildings, as PEAK_COLUMNS.
+    """
+    codes, names, ts_ns, kwh = _readings(df)
+    rows, _, ranks = _top_k_per_group(np.zeros(len(kwh), dtype=np.int64), kwh, ts_ns, 1, k)
+    return pd.DataFrame({
+        "building": names[codes[rows]],
+        "rank": ranks,
+        "timestamp": ts_ns[rows].view("datetime64[ns]"),
+        "kwh": kwh[rows],
+    })
+
+
+def interval_totals(df: pd.DataFrame, interval: str = DEFAULT_INTERVAL) -> pd.DataFrame:
+    """
+    Campus load summed per interval: 'timestamp' (interval start), 'kwh', 'buildings'.
+    """
+    step = pd.Timedelta(interval).value
+    if step <= 0:
+        raise ValueError(f"interval must be a positive duration, got {interval!r}")
+    codes, _, ts_ns, kwh = _readings(df)
+    interval_codes, starts = pd.factorize(ts_ns // step * step)
+    totals = np.bincount(interval_codes, weights=kwh, minlength=len(starts))
+    # Distinct buildings reporting in each interval (hash-based, no sort)
+    n_buildings = codes.max(initial=0) + 1
+    _, pairs = pd.factorize(interval_codes.astype(np.int64) * n_buildings + codes)
+    buildings = np.bincount(np.asarray(pairs) // n_buildings, minlength=len(starts))
+    return pd.DataFrame({
+        "timestamp": np.asarray(starts, dtype=np.int64).view("datetime64[ns]"),
+        "kwh": totals,
+        "buildings": buildings,
+    })
+
+
+def sum_interval_totals(parts: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Add up interval_totals of readings from disjoint sets of buildings (e.g.
+    one building each), giving the interval_totals of all of them.
+    """
+    parts = [part for part in parts if len(part)]
+    if not parts:
+        return pd.DataFrame({
+            "timestamp": np.empty(0, dtype="datetime64[ns]"),
+            "kwh": np.empty(0),
+            "buildings": np.empty(0, dtype=np.int64),
+        })
+    return pd.concat(parts, ignore_index=True).groupby("timestamp", sort=False).sum().reset_index()
+
+
+def top_intervals(totals: pd.DataFrame, k: int = DEFAULT_K) -> pd.DataFrame:
+    """
+    The k rows of an interval_totals frame with the largest load, as COINCIDENT_COLUMNS.
+    """
+    values = totals["kwh"].to_numpy()
+    starts = totals["timestamp"].to_numpy().view(np.int64)
+    rows, _, ranks = _top_k_per_group(np.zeros(len(values), dtype=np.int64), values, starts, 1, k)
+    peaks = totals.iloc[rows].reset_index(drop=True)
+    peaks.insert(0, "rank", ranks)
+    return peaks[COINCIDENT_COLUMNS]
+
+
+@instrumented
+def coincident_peaks(df: pd.DataFrame, k: int = DEFAULT_K, interval: str = DEFAULT_INTERVAL) -> pd.DataFrame:
+    """
+    The k intervals with the largest summed campus load, as COINCIDENT_COLUMNS.
+
+    Readings are bucketed into `interval`-long intervals (e.g. '15min', '1h')
+    so meters that report at slightly different times still coincide.
+    """
+    return top_intervals(interval_totals(df, interval), k)
+
+
+def load_at(df: pd.DataFrame, start, interval: str = DEFAULT_INTERVAL) -> pd.Series:
+    """
+    Each building's summed load in the interval beginning at `start`.
+    """
+    codes, names, ts_ns, kwh = _readings(df)
+    step = pd.Timedelta(interval).value
+    in_interval = ts_ns // step * step == pd.Timestamp(start).value
+    loads = np.bincount(codes[in_interval], weights=kwh[in_interval], minlength=len(names))
+    return pd.Series(loads, index=pd.Index(names, name="building"))
+
+
+def add_peak_columns(summary: pd.DataFrame, peaks: pd.DataFrame, loads_at_peak: pd.Series) -> pd.DataFrame:
+    """
+    Return a copy of a building summary with peak_kwh, peak_time, top_k_mean_kwh
+    (mean of the building's top-K readings) and kwh_at_campus_peak (its load
+    during the largest coincident campus interval, see load_at).
+    """
+    buildings = summary["building"].astype(object)
+    first = peaks[peaks["rank"] == 1].set_index("building").reindex(buildings)
+    top_mean = peaks.groupby("building")["kwh"].mean().reindex(buildings)
+    result = summary.copy()
+    result["peak_kwh"] = first["kwh"].to_numpy()
+    result["peak_time"] = first["timestamp"].to_numpy()
+    result["top_k_mean_kwh"] = top_mean.to_numpy()
+    result["kwh_at_campus_peak"] = loads_at_peak.reindex(buildings).fillna(0.0).to_numpy()
+    return result
+
+
+def describe_peaks(coincident: pd.DataFrame, campus_peaks: pd.DataFrame, interval: str = DEFAULT_INTERVAL) -> str:
+    """
+    Text for the summary report: the top coincident intervals and single readings.
+    """
+    if coincident.empty:
+        return "No readings."
+    lines = [f"Coincident campus peaks (load summed per {interval} interval):"]
+    lines += [
+        f"{row.rank}. {row.timestamp}: {row.kwh:.2f} kWh from {row.buildings} building(s)"
+        for row in coincident.itertuples(index=False)
+    ]
+    lines.append("Largest single readings:")
+    lines += [
+        f"{row.rank}. {row.building} at {row.timestamp}: {row.kwh:.2f} kWh"
+        for row in campus_peaks.itertuples(index=False)
+    ]
+    return "\n".join(lines)
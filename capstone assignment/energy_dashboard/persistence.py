@@ -1,25 +1,249 @@
 # energy_dashboard/persistence.py
 
+import gzip
+import io
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, Iterator, Optional, Tuple
 
 import pandas as pd
 
+from energy_dashboard.cache import content_hash
+from energy_dashboard.instrumentation import instrumented
 
-def save_cleaned_data(df: pd.DataFrame, output_dir: str = "output") -> str:
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-    output_path = Path(output_dir) / "cleaned_energy_data.csv"
-    df.to_csv(output_path, index=False)
-    return str(output_path)
+# Output format name -> file suffix. "parquet" needs pyarrow and "csv.zst"
+# needs zstandard; both are optional and only imported when used.
+OUTPUT_FORMATS = {
+    "csv": ".csv",
+    "csv.gz": ".csv.gz",
+    "csv.zst": ".csv.zst",
+    "parquet": ".parquet",
+}
+DEFAULT_CHUNK_ROWS = 250_000
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_LOCK_FILENAME = ".manifest.json.lock"
 
 
-def save_building_summary(summary_df: pd.DataFrame, output_dir: str = "output") -> str:
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-    output_path = Path(output_dir) / "building_summary.csv"
-    summary_df.to_csv(output_path, index=False)
+def _current_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def _fsync_dir(path: Path) -> None:
+    # Makes a rename inside path durable; Windows cannot open directories
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def _file_lock(lock_path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive lock on lock_path (created if missing), shared by every
+    thread and process that locks the same file.
+    """
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+@contextmanager
+def atomic_path(output_path: Path) -> Iterator[Path]:
+    """
+    Yield a temporary path next to output_path and rename it into place on
+    success, so readers never see a partially written file. The file and
+    then its directory are fsynced, so the rename survives a crash.
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{output_path.name}.", suffix=".tmp", dir=output_path.parent)
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    # mkstemp creates 0600 files; give the result the usual permissions
+    os.chmod(tmp_path, 0o666 & ~_current_umask())
+    try:
+        yield tmp_path
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, output_path)
+        _fsync_dir(output_path.parent)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _chunks(df: pd.DataFrame, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def _write_csv_chunks(df: pd.DataFrame, raw, chunk_rows: int) -> None:
+    text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    for i, chunk in enumerate(_chunks(df, chunk_rows)):
+        chunk.to_csv(text, index=False, header=(i == 0))
+    text.flush()
+    text.detach()
+
+
+def _write_parquet_chunks(df: pd.DataFrame, path: Path, chunk_rows: int) -> None:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("The 'parquet' output format requires pyarrow (pip install pyarrow).") from e
+
+    schema = pa.Schema.from_pandas(df.iloc[0:0], preserve_index=False)
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for chunk in _chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def update_manifest(output_dir: str, output_path: Path, df: pd.DataFrame, fmt: str) -> None:
+    """
+    Record row count, columns, size and SHA-256 of a written file in
+    output_dir/manifest.json (itself replaced atomically), keyed by its path
+    relative to output_dir.
+
+    The read-modify-write holds a lock file in output_dir, so concurrent
+    writers (threads, or processes such as watch mode and a batch run) never
+    drop each other's entries.
+    """
+    entry = {
+        "format": fmt,
+        "rows": len(df),
+        "columns": [str(c) for c in df.columns],
+        "bytes": output_path.stat().st_size,
+        "sha256": content_hash(output_path),
+        "written_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+    manifest_path = Path(output_dir) / MANIFEST_FILENAME
+    with _file_lock(Path(output_dir) / MANIFEST_LOCK_FILENAME):
+        manifest = {}
+        if manifest_path.exists():
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+
+        manifest[output_path.relative_to(output_dir).as_posix()] = entry
+
+        with atomic_path(manifest_path) as tmp_path:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def write_frame(
+    df: pd.DataFrame,
+    output_dir: str,
+    stem: str,
+    fmt: str = "csv",
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    subdir: Optional[str] = None,
+) -> str:
+    """
+    Write df to output_dir/<stem><suffix> (or output_dir/<subdir>/<stem><suffix>)
+    in the given format.
+
+    Rows are serialized chunk_rows at a time, so memory beyond df itself stays
+    bounded. The file is written to a temp path and renamed into place, and
+    the manifest is updated with its row count and checksum.
+    """
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {fmt!r}; choose from {sorted(OUTPUT_FORMATS)}")
+
+    output_path = Path(output_dir) / (subdir or "") / f"{stem}{OUTPUT_FORMATS[fmt]}"
+    with atomic_path(output_path) as tmp_path:
+        if fmt == "parquet":
+            _write_parquet_chunks(df, tmp_path, chunk_rows)
+        elif fmt == "csv.zst":
+            try:
+                import zstandard
+            except ImportError as e:
+                raise ImportError("The 'csv.zst' output format requires zstandard (pip install zstandard).") from e
+            with open(tmp_path, "wb") as raw, zstandard.ZstdCompressor().stream_writer(raw) as compressed:
+                _write_csv_chunks(df, compressed, chunk_rows)
+        elif fmt == "csv.gz":
+            # mtime=0 keeps the compressed bytes reproducible
+            with open(tmp_path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as compressed:
+                _write_csv_chunks(df, compressed, chunk_rows)
+        else:
+            with open(tmp_path, "wb") as raw:
+                _write_csv_chunks(df, raw, chunk_rows)
+
+    update_manifest(output_dir, output_path, df, fmt)
     return str(output_path)
 
 
+@instrumented
+def save_cleaned_data(
+    df: pd.DataFrame,
+    output_dir: str = "output",
+    fmt: str = "csv",
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> str:
+    return write_frame(df, output_dir, "cleaned_energy_data", fmt, chunk_rows)
+
+
+@instrumented
+def save_building_summary(
+    summary_df: pd.DataFrame,
+    output_dir: str = "output",
+    fmt: str = "csv",
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> str:
+    return write_frame(summary_df, output_dir, "building_summary", fmt, chunk_rows)
+
+
+@instrumented
+def save_rollups(
+    rollups: Dict[str, pd.DataFrame],
+    output_dir: str = "output",
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> str:
+    """
+    Write each rollup level to output_dir/rollups/<level>.csv, atomically and
+    recorded in output_dir's manifest like the other outputs.
+    """
+    for level, frame in rollups.items():
+        write_frame(frame, output_dir, level, "csv", chunk_rows, subdir="rollups")
+    return str(Path(output_dir) / "rollups")
+
+
+def load_rollups(rollup_dir: str) -> Dict[str, pd.DataFrame]:
+    """
+    Read back a pyramid written by save_rollups.
+    """
+    rollups = {}
+    for path in sorted(Path(rollup_dir).glob("*.csv")):
+        rollups[path.stem] = pd.read_csv(path, parse_dates=["timestamp"])
+    return rollups
+
+
+@instrumented
 def save_text_summary(
     output_dir: str,
     total_campus_kwh: float,
@@ -27,6 +251,8 @@ def save_text_summary(
     peak_time,
     daily_trend_comment: str,
     weekly_trend_comment: str,
+    anomaly_comment: Optional[str] = None,
+    peak_comment: Optional[str] = None,
 ) -> str:
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     output_path = Path(output_dir) / "summary.txt"
@@ -37,13 +263,43 @@ def save_text_summary(
         f"Total campus consumption: {total_campus_kwh:.2f} kWh\n",
         f"Highest-consuming building: {highest_building}\n",
         f"Peak load time (max single reading): {peak_time}\n\n",
+    ]
+    if peak_comment is not None:
+        lines += ["Peak Demand:\n", f"{peak_comment}\n\n"]
+    lines += [
         "Daily Trend Insights:\n",
         f"{daily_trend_comment}\n\n",
         "Weekly Trend Insights:\n",
         f"{weekly_trend_comment}\n",
     ]
+    if anomaly_comment is not None:
+        lines += ["\nAnomalies:\n", f"{anomaly_comment}\n"]
+
+    with atomic_path(output_path) as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+
+    return str(output_path)
+
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.writelines(lines)
+def save_report(aggregates, output_dir: str = "output") -> str:
+    """
+    Write summary.txt for an AggregationEngine: campus numbers, peak demand,
+    trend insights and anomalies.
+    """
+    from energy_dashboard.anomalies import describe_anomalies
+    from energy_dashboard.peaks import describe_peaks
+    from energy_dashboard.trends import generate_trend_comments
 
-    return str(output_path)
\ No newline at end of file
+    total_campus_kwh, highest_building, peak_time = aggregates.campus_numbers
+    daily_comment, weekly_comment = generate_trend_comments(aggregates.daily, aggregates.weekly)
+    return save_text_summary(
+        output_dir=output_dir,
+        total_campus_kwh=total_campus_kwh,
+        highest_building=highest_building,
+        peak_time=peak_time,
+        daily_trend_comment=daily_comment,
+        weekly_trend_comment=weekly_comment,
+        anomaly_comment=describe_anomalies(aggregates.anomalies),
+        peak_comment=describe_peaks(aggregates.coincident_peaks, aggregates.campus_peaks),
+    )
@@ -0,0 +1,40 @@
+# energy_dashboard/query.py
+
+from typing import Dict
+
+import pandas as pd
+
+from energy_dashboard.models import BuildingManager
+
+
+def build_reading_index(df: pd.DataFrame) -> BuildingManager:
+    """
+    Index cleaned readings ('building', 'timestamp', 'kwh') for range queries.
+
+    Build it once, then pass it to query_range for each question.
+    """
+    manager = BuildingManager()
+    manager.load_from_dataframe(df)
+    return manager
+
+
+def query_range(
+    index: BuildingManager,
+    building: str,
+    start=None,
+    end=None,
+    raw: bool = False,
+) -> Dict[str, float | int | str] | pd.DataFrame:
+    """
+    Answer a time-range question for one building without scanning all readings.
+
+    Returns the range summary (total, mean, peak, count) for
+    start <= timestamp < end, or the raw readings as a DataFrame if raw=True.
+    Unknown buildings raise KeyError.
+
+    Example: Library kWh between 09:00 and 17:00 on 2025-01-07
+        query_range(index, "Library", "2025-01-07 09:00", "2025-01-07 17:00")
+    """
+    if raw:
+        return index.readings_between(building, start, end)
+    return index.range_summary(building, start, end)
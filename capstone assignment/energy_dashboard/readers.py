@@ -0,0 +1,142 @@
+# energy_dashboard/readers.py
+
+"""
+Pluggable CSV reader backends for ingestion.
+
+- pandas:  pandas' C parser; always available (the default)
+- pyarrow: pandas with engine="pyarrow", which parses with multiple threads;
+           needs the optional pyarrow package and pandas 2.2 or later
+- auto:    pyarrow when it is usable, otherwise pandas
+
+Every backend returns the parsed frame together with the malformed lines it
+skipped, so ingestion can quarantine them instead of losing them silently.
+Only the pandas backend knows the line number of each skipped line; the
+multi-threaded pyarrow parser does not, so its rejects have no line numbers.
+iter_csv_pandas is the chunked form of the pandas backend used by streaming.
+"""
+
+import io
+import re
+import warnings
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+import pandas as pd
+
+DEFAULT_READER = "pandas"
+
+# First pandas release that accepts a callable on_bad_lines with engine="pyarrow"
+PYARROW_MIN_PANDAS = (2, 2)
+
+
+class BadLine(NamedTuple):
+    """
+    A line the parser skipped. `line` is the 1-based physical line number
+    (None when the engine does not report it); `text` is the raw line when known.
+    """
+
+    line: Optional[int]
+    reason: str
+    text: str
+
+
+_SKIPPED_LINE = re.compile(r"Skipping line (\d+): (.*)")
+
+
+def read_csv_pandas(path: Union[Path, io.StringIO], dtype: Dict[str, str]) -> Tuple[pd.DataFrame, List[BadLine]]:
+    # The C engine only reports skipped lines as a ParserWarning, one line each
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", pd.errors.ParserWarning)
+        df = pd.read_csv(path, on_bad_lines="warn", dtype=dtype)
+
+    bad_lines = []
+    for warning in caught:
+        if not issubclass(warning.category, pd.errors.ParserWarning):
+            warnings.warn_explicit(warning.message, warning.category, warning.filename, warning.lineno)
+            continue
+        for match in _SKIPPED_LINE.finditer(str(warning.message)):
+            bad_lines.append(BadLine(int(match.group(1)), match.group(2), ""))
+    return df, bad_lines
+
+
+def iter_csv_pandas(
+    path: Path,
+    dtype: Dict[str, str],
+    chunksize: int,
+) -> Iterator[Tuple[pd.DataFrame, List[BadLine]]]:
+    """
+    read_csv_pandas over successive blocks of at most `chunksize` lines, each
+    yielded with the malformed lines skipped in it (numbered within the whole
+    file). A header-only file yields one empty chunk.
+
+    Blocks are cut on line boundaries (one line per record, as ingestion
+    assumes) and each is parsed whole: pandas' own chunked C reader
+    (chunksize=) lets some lines with extra fields through as truncated rows.
+    """
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        header = f.readline()
+        block = list(islice(f, chunksize))
+        df, bad_lines = read_csv_pandas(io.StringIO(header + "".join(block)), dtype)
+        yield df, bad_lines
+
+        # Later blocks start with an empty row, dropped after parsing: pandas
+        # takes extra fields on the first row as an index column instead of
+        # skipping the line, which the batch path only risks on line 2
+        n_fields = len(pd.read_csv(io.StringIO(header), nrows=0).columns)
+        padded_header = header + "," * (n_fields - 1) + "\n"
+        first_line = 2 + len(block)
+        while True:
+            block = list(islice(f, chunksize))
+            if not block:
+                return
+            df, bad_lines = read_csv_pandas(io.StringIO(padded_header + "".join(block)), dtype)
+            yield df.iloc[1:].reset_index(drop=True), [b._replace(line=b.line + first_line - 3) for b in bad_lines]
+            first_line += len(block)
+
+
+def read_csv_pyarrow(path: Path, dtype: Dict[str, str]) -> Tuple[pd.DataFrame, List[BadLine]]:
+    bad_lines: List[BadLine] = []
+
+    def quarantine(row) -> str:
+        # row is a pyarrow.csv.InvalidRow; its number is unknown when multi-threaded
+        reason = f"expected {row.expected_columns} fields, saw {row.actual_columns}"
+        bad_lines.append(BadLine(row.number, reason, row.text))
+        return "skip"
+
+    # Keep timestamps as text so ingestion parses them exactly like the pandas backend
+    df = pd.read_csv(path, engine="pyarrow", on_bad_lines=quarantine, dtype={"timestamp": "str", **dtype})
+    return df, bad_lines
+
+
+CSV_READERS: Dict[str, Callable[[Path, Dict[str, str]], Tuple[pd.DataFrame, List[BadLine]]]] = {
+    "pandas": read_csv_pandas,
+    "pyarrow": read_csv_pyarrow,
+}
+
+
+def pyarrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _pandas_version() -> Tuple[int, int]:
+    major, minor = re.match(r"(\d+)\.(\d+)", pd.__version__).groups()
+    return int(major), int(minor)
+
+
+def resolve_reader(name: str = DEFAULT_READER) -> str:
+    """
+    Map 'auto' to a concrete backend and check that the requested one is usable.
+    """
+    pyarrow_usable = _pandas_version() >= PYARROW_MIN_PANDAS and pyarrow_available()
+    if name == "auto":
+        return "pyarrow" if pyarrow_usable else "pandas"
+    if name not in CSV_READERS:
+        raise ValueError(f"reader must be 'auto' or one of {sorted(CSV_READERS)}, got {name!r}")
+    if name == "pyarrow" and not pyarrow_usable:
+        raise ImportError("reader='pyarrow' needs the optional pyarrow package and pandas 2.2 or later")
+    return name
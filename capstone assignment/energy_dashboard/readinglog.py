@@ -0,0 +1,286 @@
+# energy_dashboard/readinglog.py
+
+"""
+Append-only binary reading log, read through memory-mapped array views.
+
+A log is a directory holding:
+- readings.bin: fixed-width 16-byte records (RECORD_DTYPE): int64 epoch-ns
+                timestamp, int32 building id, float32 kWh
+- index.npy:    sparse time index; the min and max timestamp of every
+                INDEX_BLOCK records, so time-range reads skip whole blocks
+- log.json:     the commit record: record count, building dictionary
+                (id -> name), sources appended so far and whether the
+                records are in time order
+
+Appends are crash-safe. Records are written after the committed end and
+fsynced, the index is replaced, and only then is log.json atomically
+replaced with the new count. Bytes past the committed count (a torn append)
+are ignored when the log is opened and overwritten by the next append.
+
+Reads never copy the records: timestamps, building_ids and kwh are strided
+views into the mapping, and to_frame wraps them without copying (only the
+building column is converted, to a categorical).
+
+One writer at a time; readers opened before an append keep seeing the log
+as it was when they opened it.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from energy_dashboard.persistence import atomic_path
+
+RECORD_DTYPE = np.dtype([("timestamp", "<i8"), ("building", "<i4"), ("kwh", "<f4")])
+# Records per sparse index entry
+INDEX_BLOCK = 1 << 16
+LOG_VERSION = 1
+
+DATA_FILENAME = "readings.bin"
+INDEX_FILENAME = "index.npy"
+COMMIT_FILENAME = "log.json"
+# Default location of the log inside the output directory
+DEFAULT_LOG_DIRNAME = "readings.log"
+
+
+def is_reading_log(path: str) -> bool:
+    """
+    True if path is a reading log directory (it has a commit record).
+    """
+    return (Path(path) / COMMIT_FILENAME).is_file()
+
+
+def _block_bounds(timestamps: np.ndarray) -> np.ndarray:
+    """
+    (blocks, 2) array of the min and max timestamp of each INDEX_BLOCK records.
+    """
+    n_blocks = -(-len(timestamps) // INDEX_BLOCK)
+    bounds = np.empty((n_blocks, 2), dtype=np.int64)
+    full = len(timestamps) // INDEX_BLOCK
+    if full:
+        blocks = np.ascontiguousarray(timestamps[: full * INDEX_BLOCK]).reshape(full, INDEX_BLOCK)
+        bounds[:full, 0] = blocks.min(axis=1)
+        bounds[:full, 1] = blocks.max(axis=1)
+    if n_blocks > full:
+        tail = timestamps[full * INDEX_BLOCK:]
+        bounds[full] = tail.min(), tail.max()
+    return bounds
+
+
+class ReadingLog:
+    """
+    An append-only reading log directory (see the module docstring).
+
+    Opening a log maps its committed records; a missing directory is an
+    empty log that is created by the first append().
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.buildings: List[str] = []
+        # source name -> content hash of what was appended under it
+        self.sources: Dict[str, str] = {}
+        self.time_sorted = True
+        self._count = 0
+        self._open()
+
+    def _open(self) -> None:
+        commit_path = self.path / COMMIT_FILENAME
+        if commit_path.exists():
+            with open(commit_path, "r", encoding="utf-8") as f:
+                commit = json.load(f)
+            if commit.get("version") != LOG_VERSION:
+                raise ValueError(f"Unsupported reading log version {commit.get('version')!r} in {self.path}")
+            self._count = int(commit["records"])
+            self.buildings = list(commit["buildings"])
+            self.sources = dict(commit["sources"])
+            self.time_sorted = bool(commit["time_sorted"])
+        self._building_ids = {name: i for i, name in enumerate(self.buildings)}
+
+        if self._count:
+            self._records = np.memmap(self.path / DATA_FILENAME, dtype=RECORD_DTYPE, mode="r", shape=(self._count,))
+        else:
+            self._records = np.empty(0, dtype=RECORD_DTYPE)
+
+        n_blocks = -(-self._count // INDEX_BLOCK)
+        index = None
+        if (self.path / INDEX_FILENAME).exists():
+            index = np.load(self.path / INDEX_FILENAME)
+        if index is None or len(index) < n_blocks:
+            # Missing or older than the commit: rebuild from the records
+            index = _block_bounds(self.timestamps)
+        # An index written by an append that never committed only has extra
+        # blocks or a widened last block, so trimming it keeps it correct
+        self._index = index[:n_blocks]
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def records(self) -> np.ndarray:
+        """
+        The committed records as a read-only structured array (RECORD_DTYPE).
+        """
+        return self._records
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._records["timestamp"]
+
+    @property
+    def building_ids(self) -> np.ndarray:
+        return self._records["building"]
+
+    @property
+    def kwh(self) -> np.ndarray:
+        return self._records["kwh"]
+
+    def _building_ids_for(self, names: pd.Index) -> np.ndarray:
+        """
+        Dictionary ids of names, adding unseen names (in memory until committed).
+        """
+        for name in names:
+            if name not in self._building_ids:
+                self._building_ids[name] = len(self.buildings)
+                self.buildings.append(name)
+        return np.array([self._building_ids[name] for name in names], dtype=np.int32)
+
+    def append(self, readings: pd.DataFrame, source: Optional[str] = None, source_hash: Optional[str] = None) -> int:
+        """
+        Append readings ('building', 'timestamp', 'kwh') and commit them.
+
+        Rows with a missing building, unparseable timestamp or non-numeric kWh
+        are ignored; the rest are appended in time order. If source is given it
+        is recorded with source_hash (see has_source). Returns the number of
+        readings appended.
+        """
+        timestamps = readings["timestamp"]
+        if not pd.api.types.is_datetime64_any_dtype(timestamps):
+            timestamps = pd.to_datetime(timestamps, errors="coerce")
+        batch = pd.DataFrame({
+            "building": readings["building"],
+            "timestamp": timestamps,
+            "kwh": pd.to_numeric(readings["kwh"], errors="coerce"),
+        }).dropna()
+
+        ts_ns = batch["timestamp"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+        order = np.argsort(ts_ns, kind="stable")
+        codes, names = pd.factorize(batch["building"])
+        buildings_before = len(self.buildings)
+        try:
+            records = np.empty(len(batch), dtype=RECORD_DTYPE)
+            records["timestamp"] = ts_ns[order]
+            records["building"] = self._building_ids_for(names)[codes[order]]
+            records["kwh"] = batch["kwh"].to_numpy()[order]
+            self._commit(records, source, source_hash)
+        except BaseException:
+            # Forget dictionary entries that were never committed
+            for name in self.buildings[buildings_before:]:
+                del self._building_ids[name]
+            del self.buildings[buildings_before:]
+            raise
+        return len(records)
+
+    def _commit(self, records: np.ndarray, source: Optional[str], source_hash: Optional[str]) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        committed_bytes = self._count * RECORD_DTYPE.itemsize
+
+        fd = os.open(self.path / DATA_FILENAME, os.O_RDWR | os.O_CREAT, 0o666)
+        with os.fdopen(fd, "r+b") as f:
+            # Drop whatever a crashed append left past the committed end
+            f.truncate(committed_bytes)
+            f.seek(committed_bytes)
+            f.write(memoryview(records).cast("B"))
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Re-index from the start of the last (partial) block onwards
+        first_block = self._count // INDEX_BLOCK
+        tail = np.concatenate([self.timestamps[first_block * INDEX_BLOCK:], records["timestamp"]])
+        index = np.concatenate([self._index[:first_block], _block_bounds(tail)])
+        with atomic_path(self.path / INDEX_FILENAME) as tmp_path:
+            with open(tmp_path, "wb") as f:
+                np.save(f, index)
+
+        time_sorted = self.time_sorted
+        if time_sorted and len(records) and self._count:
+            # While the log is in time order its last record is the latest
+            time_sorted = bool(records["timestamp"][0] >= self.timestamps[-1])
+        sources = dict(self.sources)
+        if source is not None:
+            sources[source] = source_hash
+        commit = {
+            "version": LOG_VERSION,
+            "records": self._count + len(records),
+            "buildings": self.buildings,
+            "sources": sources,
+            "time_sorted": time_sorted,
+        }
+        with atomic_path(self.path / COMMIT_FILENAME) as tmp_path:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(commit, f)
+
+        self._open()
+
+    def has_source(self, source: str, source_hash: Optional[str] = None) -> bool:
+        """
+        True if source was appended (with this hash, when one is given).
+        """
+        if source not in self.sources:
+            return False
+        return source_hash is None or self.sources[source] == source_hash
+
+    def _candidate_blocks(self, start_ns: int, end_ns: int) -> np.ndarray:
+        return np.flatnonzero((self._index[:, 1] >= start_ns) & (self._index[:, 0] < end_ns))
+
+    def _range_records(self, start=None, end=None) -> np.ndarray:
+        """
+        Records with start <= timestamp < end; a view when the log is in time
+        order, otherwise gathered from the blocks the sparse index selects.
+        """
+        if start is None and end is None:
+            return self._records
+        start_ns = np.iinfo(np.int64).min if start is None else pd.Timestamp(start).value
+        end_ns = np.iinfo(np.int64).max if end is None else pd.Timestamp(end).value
+        blocks = self._candidate_blocks(start_ns, end_ns)
+        if len(blocks) == 0:
+            return self._records[:0]
+
+        if self.time_sorted:
+            lo, hi = blocks[0] * INDEX_BLOCK, min((blocks[-1] + 1) * INDEX_BLOCK, self._count)
+            ts = self.timestamps[lo:hi]
+            return self._records[lo + np.searchsorted(ts, start_ns, "left"): lo + np.searchsorted(ts, end_ns, "left")]
+
+        parts = []
+        for block in blocks:
+            chunk = self._records[block * INDEX_BLOCK:(block + 1) * INDEX_BLOCK]
+            ts = chunk["timestamp"]
+            parts.append(chunk[(ts >= start_ns) & (ts < end_ns)])
+        return np.concatenate(parts)
+
+    def arrays(self, start=None, end=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (timestamps ns, building ids, kWh) of readings with start <= timestamp < end.
+        """
+        records = self._range_records(start, end)
+        return records["timestamp"], records["building"], records["kwh"]
+
+    def to_frame(self, start=None, end=None, kwh_dtype: str = "float32") -> pd.DataFrame:
+        """
+        Readings with start <= timestamp < end as a 'building', 'timestamp', 'kwh'
+        DataFrame, in log order.
+
+        'timestamp' and 'kwh' wrap the mapped records without copying (a
+        float64 kwh_dtype costs one conversion); 'building' is a categorical
+        over the building dictionary.
+        """
+        ts_ns, ids, kwh = self.arrays(start, end)
+        return pd.DataFrame({
+            "building": pd.Categorical.from_codes(ids, categories=self.buildings, validate=False),
+            "timestamp": ts_ns.view("datetime64[ns]"),
+            "kwh": kwh.astype(kwh_dtype, copy=False),
+        }, copy=False)
@@ -0,0 +1,580 @@
+# energy_dashboard/server.py
+
+"""
+Local HTTP query service: load the data once, answer questions on demand.
+
+`python -m energy_dashboard serve` starts an asyncio HTTP/1.1 server
+(standard library only). GET endpoints, JSON unless noted:
+- /health:            data generation, reading count and cache statistics
+- /summary:           campus total, highest-consuming building, peak time
+- /buildings:         building summary with peak, anomaly and trend columns
+- /buildings/<name>:  one building; ?start=&end= adds a range summary
+- /daily, /weekly:    series, filtered by ?building=&start=&end=
+- /peaks:             top-K readings per building; ?k=&building=
+- /peaks/coincident:  top-K campus intervals; ?k=&interval=
+- /anomalies:         detected events; ?building=
+- /dashboard.png:     the rendered dashboard (PNG); ?fast=0|1&start=&end=
+
+start/end with a UTC offset are converted to naive UTC, like the readings.
+k must be at least 1 and interval a positive duration; anything else is a 400.
+
+Results come from one in-memory AggregationEngine and are kept in an LRU
+cache keyed by data generation, path and query. Concurrent requests for the
+same result share a single computation. Computations run one at a time on a
+background thread, so the event loop keeps answering from the cache (and
+matplotlib is only ever used from that thread). Responses carry an ETag; a
+request whose If-None-Match matches gets 304 Not Modified.
+
+data_dir is polled for changes. Once it has been quiet for `debounce`
+seconds the data is reloaded in the background, the new engine is swapped
+in and the cache is cleared, which also changes every ETag.
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import math
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import cached_property
+from pathlib import Path
+from typing import Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pandas as pd
+
+from energy_dashboard.ingestion import DEFAULT_KWH_DTYPE
+from energy_dashboard.readers import DEFAULT_READER
+from energy_dashboard.readinglog import COMMIT_FILENAME, is_reading_log
+from energy_dashboard.watch import Snapshot, scan_directory
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8050
+DEFAULT_CACHE_SIZE = 256
+# Longest accepted request line plus headers
+_MAX_HEAD_BYTES = 16 * 1024
+
+_REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Result(NamedTuple):
+    content_type: str
+    body: bytes
+    etag: str
+
+
+class ResultCache:
+    """
+    LRU cache of computed responses, counting hits and misses.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Result]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Result]:
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key: Hashable, result: Result) -> None:
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def _data_snapshot(data_dir: str) -> Snapshot:
+    """
+    What a reload depends on: the CSVs in data_dir, or a reading log's commit record.
+    """
+    if is_reading_log(data_dir):
+        st = (Path(data_dir) / COMMIT_FILENAME).stat()
+        return {str(Path(data_dir) / COMMIT_FILENAME): (st.st_mtime_ns, st.st_size)}
+    return scan_directory(data_dir)
+
+
+class _Dataset:
+    """
+    One loaded generation of the data. Only touched from the compute thread.
+    """
+
+    def __init__(self, generation: int, engine):
+        self.generation = generation
+        self.engine = engine
+        self.loaded_at = datetime.now(timezone.utc)
+
+    @cached_property
+    def reading_index(self):
+        from energy_dashboard.query import build_reading_index
+
+        return build_reading_index(self.engine.df)
+
+
+# ---------- Query parameters and encoding ----------
+
+Query = Dict[str, List[str]]
+
+
+def _param(query: Query, name: str) -> Optional[str]:
+    values = query.get(name)
+    return values[-1] if values else None
+
+
+def _int_param(query: Query, name: str, default: int) -> int:
+    value = _param(query, name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise HTTPError(400, f"'{name}' must be an integer, got {value!r}")
+    if number < 1:
+        raise HTTPError(400, f"'{name}' must be at least 1")
+    return number
+
+
+def _time_param(query: Query, name: str) -> Optional[pd.Timestamp]:
+    value = _param(query, name)
+    if value is None:
+        return None
+    try:
+        stamp = pd.Timestamp(value)
+    except ValueError:
+        raise HTTPError(400, f"'{name}' is not a timestamp: {value!r}")
+    if stamp.tzinfo is not None:
+        # Readings are naive UTC (see load_energy_data), so compare in UTC
+        stamp = stamp.tz_convert("UTC").tz_localize(None)
+    return stamp
+
+
+def _json(payload) -> Tuple[str, bytes]:
+    return "application/json", json.dumps(payload, default=str).encode("utf-8")
+
+
+def _frame_json(frame: pd.DataFrame) -> Tuple[str, bytes]:
+    return "application/json", frame.to_json(orient="records", date_format="iso").encode("utf-8")
+
+
+def _known_building(ds: _Dataset, building: Optional[str]) -> Optional[str]:
+    if building is not None and building not in set(ds.engine.building_summary["building"].astype(str)):
+        raise HTTPError(404, f"Unknown building {building!r}")
+    return building
+
+
+def _filter_series(frame: pd.DataFrame, query: Query, ds: _Dataset) -> pd.DataFrame:
+    building = _known_building(ds, _param(query, "building"))
+    start, end = _time_param(query, "start"), _time_param(query, "end")
+    mask = pd.Series(True, index=frame.index)
+    if building is not None:
+        mask &= frame["building"].astype(str) == building
+    if start is not None:
+        mask &= frame["timestamp"] >= start
+    if end is not None:
+        mask &= frame["timestamp"] < end
+    return frame[mask]
+
+
+# ---------- Routes: (dataset, path argument, query) -> (content type, body) ----------
+
+def _route_summary(ds: _Dataset, _, query: Query) -> Tuple[str, bytes]:
+    total, highest, peak_time = ds.engine.campus_numbers
+    return _json({
+        "total_campus_kwh": total,
+        "highest_building": highest,
+        "peak_time": None if pd.isna(peak_time) else pd.Timestamp(peak_time).isoformat(),
+        "buildings": len(ds.engine.building_summary),
+        "readings": len(ds.engine.df),
+    })
+
+
+def _route_buildings(ds: _Dataset, _, query: Query) -> Tuple[str, bytes]:
+    return _frame_json(ds.engine.export_summary)
+
+
+def _route_building(ds: _Dataset, building: str, query: Query) -> Tuple[str, bytes]:
+    _known_building(ds, building)
+    summary = ds.engine.export_summary
+    row = json.loads(summary[summary["building"].astype(str) == building].to_json(orient="records", date_format="iso"))[0]
+    payload = {"building": row}
+    start, end = _time_param(query, "start"), _time_param(query, "end")
+    if start is not None or end is not None:
+        in_range = ds.reading_index.range_summary(building, start, end)
+        payload["range"] = {
+            key: None if isinstance(value, float) and math.isnan(value) else value
+            for key, value in in_range.items()
+        }
+    return _json(payload)
+
+
+def _route_daily(ds: _Dataset, _, query: Query) -> Tuple[str, bytes]:
+    return _frame_json(_filter_series(ds.engine.daily, query, ds))
+
+
+def _route_weekly(ds: _Dataset, _, query: Query) -> Tuple[str, bytes]:
+    return _frame_json(_filter_series(ds.engine.weekly, query, ds))
+
+
+def _route_peaks(ds: _Dataset, _, query: Query) -> Tuple[str, bytes]:
+    from energy_dashboard.peaks import DEFAULT_K, top_k_peaks
+
+    k = _int_param(query, "k", DEFAULT_K)
+    peaks = ds.engine.peaks if k == DEFAULT_K else top_k_peaks(ds.engine.df, k)
+    building = _known_building(ds, _param(query, "building"))
+    if building is not None:
+        peaks = peaks[peaks["building"].astype(str) == building]
+    return _frame_json(peaks)
+
+
+def _route_coincident(ds: _Dataset, _, query: Query) -> Tuple[str, bytes]:
+    from energy_dashboard.peaks import DEFAULT_INTERVAL, DEFAULT_K, coincident_peaks
+
+    k = _int_param(query, "k", DEFAULT_K)
+    interval = _param(query, "interval") or DEFAULT_INTERVAL
+    try:
+        step = pd.Timedelta(interval)
+    except ValueError:
+        raise HTTPError(400, f"'interval' is not a duration: {interval!r}")
+    if pd.isna(step) or step <= pd.Timedelta(0):
+        raise HTTPError(400, f"'interval' must be a positive duration, got {interval!r}")
+    if k == DEFAULT_K and interval == DEFAULT_INTERVAL:
+        return _frame_json(ds.engine.coincident_peaks)
+    return _frame_json(coincident_peaks(ds.engine.df, k, interval))
+
+
+def _route_anomalies(ds: _Dataset, _, query: Query) -> Tuple[str, bytes]:
+    events = ds.engine.anomalies
+    building = _known_building(ds, _param(query, "building"))
+    if building is not None:
+        events = events[events["building"].astype(str) == building]
+    return _frame_json(events)
+
+
+def _route_dashboard(ds: _Dataset, _, query: Query) -> Tuple[str, bytes]:
+    from energy_dashboard.visualization import create_dashboard
+
+    fast = _param(query, "fast") not in ("0", "false", "no")
+    png = io.BytesIO()
+    create_dashboard(
+        ds.engine.daily,
+        ds.engine.weekly,
+        ds.engine.building_summary,
+        output_path=png,
+        rollups=ds.engine.rollups,
+        start=_time_param(query, "start"),
+        end=_time_param(query, "end"),
+        fast=fast,
+    )
+    return "image/png", png.getvalue()
+
+
+Route = Callable[[_Dataset, Optional[str], Query], Tuple[str, bytes]]
+
+ROUTES: Dict[str, Route] = {
+    "/summary": _route_summary,
+    "/buildings": _route_buildings,
+    "/daily": _route_daily,
+    "/weekly": _route_weekly,
+    "/peaks": _route_peaks,
+    "/peaks/coincident": _route_coincident,
+    "/anomalies": _route_anomalies,
+    "/dashboard.png": _route_dashboard,
+}
+# Routes taking the rest of the path as an argument, e.g. /buildings/<name>
+PREFIX_ROUTES: Dict[str, Route] = {
+    "/buildings/": _route_building,
+}
+
+
+def _resolve(path: str) -> Tuple[Route, Optional[str]]:
+    if path in ROUTES:
+        return ROUTES[path], None
+    for prefix, route in PREFIX_ROUTES.items():
+        if path.startswith(prefix) and len(path) > len(prefix):
+            return route, path[len(prefix):]
+    raise HTTPError(404, f"No such endpoint: {path}")
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison, as RFC 9110 prescribes for If-None-Match
+    return "*" in candidates or etag in [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+
+
+class QueryService:
+    """
+    Serves the endpoints above for data_dir (a folder of CSVs or a reading log).
+
+    Loading uses load_energy_data with the given options; see run() / serve().
+    """
+
+    def __init__(
+        self,
+        data_dir: str = "data",
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        poll_interval: float = 2.0,
+        debounce: float = 1.0,
+        use_cache: bool = False,
+        kwh_dtype: str = DEFAULT_KWH_DTYPE,
+        timezone: Optional[str] = None,
+        reader: str = DEFAULT_READER,
+    ):
+        if not Path(data_dir).is_dir():
+            raise FileNotFoundError(f"Data directory not found: {data_dir}")
+        self.data_dir = data_dir
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self.use_cache = use_cache
+        self.kwh_dtype = kwh_dtype
+        self.timezone = timezone
+        self.reader = reader
+        self.cache = ResultCache(cache_size)
+        self._dataset: Optional[_Dataset] = None
+        self._snapshot: Snapshot = {}
+        # key -> computation in progress, shared by every request that needs it
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        # One thread: computations never race on the engine's cached results
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="energy-query")
+
+    # ---------- Data ----------
+
+    def _load_dataset(self, generation: int) -> _Dataset:
+        from energy_dashboard.aggregation import AggregationEngine
+        from energy_dashboard.ingestion import load_energy_data
+
+        df, error_logs = load_energy_data(
+            self.data_dir,
+            use_cache=self.use_cache,
+            kwh_dtype=self.kwh_dtype,
+            timezone=self.timezone,
+            reader=self.reader,
+        )
+        for err in error_logs:
+            logger.warning("  - %s", err)
+        engine = AggregationEngine(df.dropna(subset=["timestamp", "kwh", "building"]))
+        # Everything most endpoints share is computed up front, once per load
+        for result in ("daily", "weekly", "building_summary", "campus_numbers"):
+            getattr(engine, result)
+        return _Dataset(generation, engine)
+
+    async def reload(self) -> None:
+        """
+        Load data_dir again in the background and swap it in, clearing the cache.
+        """
+        loop = asyncio.get_running_loop()
+        snapshot = _data_snapshot(self.data_dir)
+        generation = self._dataset.generation + 1 if self._dataset else 1
+        dataset = await loop.run_in_executor(self._executor, self._load_dataset, generation)
+        self._dataset, self._snapshot = dataset, snapshot
+        self.cache.clear()
+        logger.info("Loaded %d readings from '%s' (generation %d)", len(dataset.engine.df), self.data_dir, generation)
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            current = _data_snapshot(self.data_dir)
+            if current == self._snapshot:
+                continue
+            # Debounce: wait for a quiet period so a burst of copies reloads once
+            while True:
+                await asyncio.sleep(self.debounce)
+                latest = _data_snapshot(self.data_dir)
+                if latest == current:
+                    break
+                current = latest
+            try:
+                await self.reload()
+            except Exception:
+                logger.exception("Reload of '%s' failed; still serving the previous data", self.data_dir)
+                self._snapshot = current
+
+    # ---------- Requests ----------
+
+    async def _compute(self, key: Hashable, dataset: _Dataset, route: Route, arg, query: Query) -> Result:
+        loop = asyncio.get_running_loop()
+        content_type, body = await loop.run_in_executor(self._executor, route, dataset, arg, query)
+        etag = f'"{dataset.generation}-{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+        result = Result(content_type, body, etag)
+        if dataset is self._dataset:
+            self.cache.put(key, result)
+        return result
+
+    async def result(self, path: str, query: Query) -> Result:
+        """
+        The response body for path and query, from the cache when possible.
+        """
+        route, arg = _resolve(path)
+        dataset = self._dataset
+        key = (dataset.generation, path, tuple(sorted((name, tuple(values)) for name, values in query.items())))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._compute(key, dataset, route, arg, query))
+            self._pending[key] = pending
+
+            def forget(done, key=key):
+                if self._pending.get(key) is done:
+                    del self._pending[key]
+
+            pending.add_done_callback(forget)
+        # A client that disconnects must not cancel the computation others wait on
+        return await asyncio.shield(pending)
+
+    def _health(self) -> Tuple[str, bytes]:
+        dataset = self._dataset
+        return _json({
+            "status": "ok",
+            "generation": dataset.generation,
+            "loaded_at": dataset.loaded_at.isoformat(timespec="seconds"),
+            "readings": len(dataset.engine.df),
+            "cache": {"entries": len(self.cache), "hits": self.cache.hits, "misses": self.cache.misses},
+        })
+
+    async def handle(self, method: str, target: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Answer one request: (status, response headers, body).
+        """
+        if method not in ("GET", "HEAD"):
+            return self._error(405, f"Method {method} not allowed", {"Allow": "GET, HEAD"})
+
+        parts = urlsplit(target)
+        path = unquote(parts.path).rstrip("/") or "/"
+        query = parse_qs(parts.query)
+        if path == "/health":
+            content_type, body = self._health()
+            return 200, {"Content-Type": content_type, "Cache-Control": "no-store"}, body
+
+        try:
+            result = await self.result(path, query)
+        except HTTPError as e:
+            return self._error(e.status, e.message)
+        except Exception:
+            logger.exception("Error answering %s", target)
+            return self._error(500, "Internal server error")
+
+        response_headers = {"ETag": result.etag, "Cache-Control": "no-cache"}
+        if _etag_matches(headers.get("if-none-match"), result.etag):
+            return 304, response_headers, b""
+        response_headers["Content-Type"] = result.content_type
+        return 200, response_headers, result.body
+
+    @staticmethod
+    def _error(status: int, message: str, extra: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        content_type, body = _json({"error": message})
+        return status, {"Content-Type": content_type, **(extra or {})}, body
+
+    # ---------- HTTP ----------
+
+    @staticmethod
+    def _encode(status: int, headers: Dict[str, str], body: bytes, keep_alive: bool, head_only: bool) -> bytes:
+        lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        lines.append(f"Content-Length: {len(body)}")
+        lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        return head if head_only or status == 304 else head + body
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(self._encode(*self._error(431, "Request head too large"), False, False))
+                    break
+
+                request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+                try:
+                    method, target, version = request_line.split(" ")
+                except ValueError:
+                    writer.write(self._encode(*self._error(400, "Malformed request line"), False, False))
+                    break
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                # Requests are GET/HEAD; drain any body so the next request parses
+                length = headers.get("content-length", "0")
+                if length.isdigit() and int(length):
+                    await reader.readexactly(int(length))
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+                status, response_headers, body = await self.handle(method, target, headers)
+                logger.debug("%s %s -> %d", method, target, status)
+                writer.write(self._encode(status, response_headers, body, keep_alive, method == "HEAD"))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, ready: Optional[asyncio.Event] = None) -> None:
+        """
+        Load the data, then serve until cancelled. Sets `ready` once listening.
+        """
+        await self.reload()
+        server = await asyncio.start_server(self._serve_connection, host, port, limit=_MAX_HEAD_BYTES, backlog=1024)
+        watcher = asyncio.create_task(self._watch())
+        addresses = ", ".join(f"{sock.getsockname()[0]}:{sock.getsockname()[1]}" for sock in server.sockets)
+        logger.info("Serving '%s' on http://%s (Ctrl+C to stop)", self.data_dir, addresses)
+        if ready is not None:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        try:
+            asyncio.run(self.serve(host, port))
+        except KeyboardInterrupt:
+            logger.info("Stopped serving '%s'", self.data_dir)
@@ -0,0 +1,296 @@
+# energy_dashboard/store.py
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from energy_dashboard.aggregation import expand_period_buckets, week_bucket
+
+# Default location of the persisted store inside the output directory.
+DEFAULT_STORE_FILENAME = "aggregate_store.json"
+
+
+class AggregateStore:
+    """
+    Incrementally maintained daily/weekly/per-building aggregates.
+
+    Readings are folded in with append(); each call costs O(batch), not
+    O(everything seen so far). Buckets are keyed by building and period, so
+    out-of-order and late readings land in the right bucket regardless of
+    arrival order.
+
+    The calculate_daily_totals / calculate_weekly_aggregates /
+    building_wise_summary functions accept a store via their `store`
+    argument and read from it instead of recomputing.
+    """
+
+    def __init__(self):
+        # (building, period start as epoch ns) -> kWh
+        self._daily: Dict[Tuple[str, int], float] = {}
+        self._weekly: Dict[Tuple[str, int], float] = {}
+        # building -> [sum, min, max, count]
+        self._stats: Dict[str, List[float]] = {}
+        # Campus peak single reading: (kwh, epoch ns, building)
+        self._peak: Tuple[float, int, str] | None = None
+
+    def __len__(self) -> int:
+        """
+        Number of readings folded into the store so far.
+        """
+        return int(sum(stats[3] for stats in self._stats.values()))
+
+    @staticmethod
+    def _clean(readings: pd.DataFrame) -> pd.DataFrame:
+        timestamps = readings["timestamp"]
+        if not pd.api.types.is_datetime64_any_dtype(timestamps):
+            timestamps = pd.to_datetime(timestamps, errors="coerce")
+        batch = pd.DataFrame({
+            "building": readings["building"],
+            "timestamp": timestamps,
+            "kwh": pd.to_numeric(readings["kwh"], errors="coerce"),
+        })
+        return batch.dropna(subset=["building", "timestamp", "kwh"])
+
+    @staticmethod
+    def _fold_buckets(target: Dict[Tuple[str, int], float], partial: pd.Series) -> None:
+        for (building, period), kwh in partial.items():
+            key = (building, pd.Timestamp(period).value)
+            target[key] = target.get(key, 0.0) + float(kwh)
+
+    def append(self, readings: pd.DataFrame) -> int:
+        """
+        Fold a batch of readings ('building', 'timestamp', 'kwh') into the store.
+
+        Rows with a missing building, unparseable timestamp or non-numeric kWh
+        are ignored. Returns the number of readings accepted.
+        """
+        batch = self._clean(readings)
+        if batch.empty:
+            return 0
+
+        days = batch["timestamp"].dt.normalize()
+        weeks = week_bucket(batch["timestamp"])
+        self._fold_buckets(self._daily, batch.groupby([batch["building"], days], observed=True)["kwh"].sum())
+        self._fold_buckets(self._weekly, batch.groupby([batch["building"], weeks], observed=True)["kwh"].sum())
+
+        partial = batch.groupby("building", observed=True)["kwh"].agg(["sum", "min", "max", "count"])
+        for building, row in partial.iterrows():
+            stats = self._stats.get(building)
+            if stats is None:
+                self._stats[building] = [float(row["sum"]), float(row["min"]), float(row["max"]), int(row["count"])]
+            else:
+                stats[0] += float(row["sum"])
+                stats[1] = min(stats[1], float(row["min"]))
+                stats[2] = max(stats[2], float(row["max"]))
+                stats[3] += int(row["count"])
+
+        # Ties go to the earliest reading, like idxmax over time-sorted data
+        peak_kwh = batch["kwh"].max()
+        at_peak = batch[batch["kwh"] == peak_kwh]
+        first = at_peak["timestamp"].idxmin()
+        candidate = (float(peak_kwh), pd.Timestamp(at_peak.at[first, "timestamp"]).value, at_peak.at[first, "building"])
+        if self._peak is None or (candidate[0], -candidate[1]) > (self._peak[0], -self._peak[1]):
+            self._peak = candidate
+
+        return len(batch)
+
+    def _bucket_series(self, buckets: Dict[Tuple[str, int], float]) -> pd.Series:
+        if not buckets:
+            return pd.Series(dtype=float)
+        index = pd.MultiIndex.from_tuples(
+            [(building, pd.Timestamp(period)) for building, period in buckets],
+            names=["building", "timestamp"],
+        )
+        return pd.Series(list(buckets.values()), index=index)
+
+    def daily_frame(self) -> pd.DataFrame:
+        """
+        Same layout as calculate_daily_totals.
+        """
+        return expand_period_buckets(self._bucket_series(self._daily), "D", "daily_kwh")
+
+    def weekly_frame(self) -> pd.DataFrame:
+        """
+        Same layout as calculate_weekly_aggregates.
+        """
+        return expand_period_buckets(self._bucket_series(self._weekly), "W", "weekly_kwh")
+
+    def summary_frame(self) -> pd.DataFrame:
+        """
+        Same layout as building_wise_summary.
+        """
+        rows = [
+            {
+                "building": building,
+                "total_kwh": total,
+                "mean_kwh": total / count,
+                "min_kwh": low,
+                "max_kwh": high,
+                "readings_count": int(count),
+            }
+            for building, (total, low, high, count) in sorted(self._stats.items())
+        ]
+        columns = ["building", "total_kwh", "mean_kwh", "min_kwh", "max_kwh", "readings_count"]
+        return pd.DataFrame(rows, columns=columns)
+
+    def campus_numbers(self) -> Tuple[float, str, pd.Timestamp]:
+        """
+        Total campus consumption, highest consuming building and peak load time.
+        """
+        if not self._stats:
+            return 0.0, "N/A", pd.NaT
+        total = float(sum(stats[0] for stats in self._stats.values()))
+        highest = max(sorted(self._stats), key=lambda b: self._stats[b][0])
+        peak_time = pd.Timestamp(self._peak[1]) if self._peak else pd.NaT
+        return total, highest, peak_time
+
+    def save(self, path: str) -> str:
+        """
+        Persist the store as JSON, writing to a temp file and renaming it into place.
+        """
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            "daily": [[b, p, v] for (b, p), v in self._daily.items()],
+            "weekly": [[b, p, v] for (b, p), v in self._weekly.items()],
+            "stats": self._stats,
+            "peak": list(self._peak) if self._peak else None,
+        }
+        tmp_path = target.with_name(target.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, target)
+        return str(target)
+
+    @classmethod
+    def load(cls, path: str) -> "AggregateStore":
+        """
+        Load a store saved with save(). A missing file yields an empty store.
+        """
+        store = cls()
+        if not Path(path).exists():
+            return store
+
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        store._daily = {(b, int(p)): float(v) for b, p, v in state["daily"]}
+        store._weekly = {(b, int(p)): float(v) for b, p, v in state["weekly"]}
+        store._stats = {b: list(stats) for b, stats in state["stats"].items()}
+        store._peak = tuple(state["peak"]) if state["peak"] else None
+        return store
+
+
+class SourceAggregateStore:
+    """
+    Aggregates over readings grouped by source (e.g. one CSV file).
+
+    Each source keeps its own partial AggregateStore, so a source can be
+    replaced or removed, not just appended to. An update recomputes only the
+    daily/weekly buckets and buildings that the source's old or new readings
+    touch, summing the partials of the sources that share them; the cost
+    depends on the size of the changed source, not on the whole store.
+
+    The combined aggregates are kept in an AggregateStore and read through
+    the same daily_frame / weekly_frame / summary_frame / campus_numbers
+    methods, so this can be passed wherever a store is read from.
+    """
+
+    def __init__(self):
+        self._combined = AggregateStore()
+        self._sources: Dict[str, AggregateStore] = {}
+        # building -> sources with readings for it
+        self._building_sources: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._combined)
+
+    def sources(self) -> List[str]:
+        return sorted(self._sources)
+
+    def daily_frame(self) -> pd.DataFrame:
+        return self._combined.daily_frame()
+
+    def weekly_frame(self) -> pd.DataFrame:
+        return self._combined.weekly_frame()
+
+    def summary_frame(self) -> pd.DataFrame:
+        return self._combined.summary_frame()
+
+    def campus_numbers(self) -> Tuple[float, str, pd.Timestamp]:
+        return self._combined.campus_numbers()
+
+    def replace_source(self, source: str, readings: pd.DataFrame) -> int:
+        """
+        Set the readings of one source, replacing whatever it held before.
+
+        Returns the number of readings accepted (see AggregateStore.append).
+        """
+        partial = AggregateStore()
+        accepted = partial.append(readings)
+        old = self._sources.get(source)
+        self._sources[source] = partial
+        self._refresh(source, old, partial)
+        return accepted
+
+    def remove_source(self, source: str) -> bool:
+        """
+        Drop a source and its readings. Returns False if it was not present.
+        """
+        old = self._sources.pop(source, None)
+        if old is None:
+            return False
+        self._refresh(source, old, None)
+        return True
+
+    def _holders(self, building: str) -> List[AggregateStore]:
+        # Sorted so sums and tie-breaks do not depend on update order
+        return [self._sources[s] for s in sorted(self._building_sources.get(building, ()))]
+
+    def _refresh(self, source: str, old: Optional[AggregateStore], new: Optional[AggregateStore]) -> None:
+        changed = [partial for partial in (old, new) if partial is not None]
+
+        touched = set()
+        for partial in changed:
+            touched.update(partial._stats)
+        for building in touched:
+            holders = self._building_sources.setdefault(building, set())
+            if new is not None and building in new._stats:
+                holders.add(source)
+            else:
+                holders.discard(source)
+            if not holders:
+                del self._building_sources[building]
+
+        for attr in ("_daily", "_weekly"):
+            combined = getattr(self._combined, attr)
+            keys = set()
+            for partial in changed:
+                keys.update(getattr(partial, attr))
+            for key in keys:
+                values = [getattr(p, attr)[key] for p in self._holders(key[0]) if key in getattr(p, attr)]
+                if values:
+                    combined[key] = float(sum(values))
+                else:
+                    combined.pop(key, None)
+
+        for building in touched:
+            rows = [p._stats[building] for p in self._holders(building)]
+            if not rows:
+                self._combined._stats.pop(building, None)
+                continue
+            self._combined._stats[building] = [
+                float(sum(r[0] for r in rows)),
+                min(r[1] for r in rows),
+                max(r[2] for r in rows),
+                int(sum(r[3] for r in rows)),
+            ]
+
+        peak = None
+        for name in sorted(self._sources):
+            candidate = self._sources[name]._peak
+            if candidate is not None and (peak is None or (candidate[0], -candidate[1]) > (peak[0], -peak[1])):
+                peak = candidate
+        self._combined._peak = peak
@@ -0,0 +1,221 @@
+# energy_dashboard/streaming.py
+
+import logging
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from energy_dashboard.aggregation import expand_period_buckets, week_bucket
+from energy_dashboard.ingestion import (
+    DEFAULT_KWH_DTYPE,
+    KWH_DTYPES,
+    clean_rows,
+    rejection_messages,
+    write_quarantine,
+)
+from energy_dashboard.instrumentation import instrumented
+from energy_dashboard.readers import BadLine, iter_csv_pandas
+from energy_dashboard.readinglog import is_reading_log
+
+logger = logging.getLogger(__name__)
+
+# Readings per chunk; bounds peak memory independently of file size.
+DEFAULT_CHUNKSIZE = 500_000
+
+
+class _RunningAggregates:
+    """
+    Running partial aggregates folded from successive chunks.
+
+    Holds at most one value per (building, day), (building, week) and
+    building, so its size depends on the number of buildings and days,
+    not on the number of readings.
+    """
+
+    def __init__(self):
+        self.daily: Optional[pd.Series] = None
+        self.weekly: Optional[pd.Series] = None
+        self.totals: Optional[pd.DataFrame] = None
+
+    @staticmethod
+    def _add(running: Optional[pd.Series], partial: pd.Series) -> pd.Series:
+        if running is None:
+            return partial
+        return running.add(partial, fill_value=0)
+
+    def fold(self, chunk: pd.DataFrame) -> None:
+        """
+        Fold one cleaned chunk ('building', 'timestamp', 'kwh') into the running state.
+        """
+        if chunk.empty:
+            return
+
+        days = chunk["timestamp"].dt.normalize()
+        weeks = week_bucket(chunk["timestamp"])
+
+        daily = chunk.groupby([chunk["building"], days], observed=True)["kwh"].sum()
+        weekly = chunk.groupby([chunk["building"], weeks], observed=True)["kwh"].sum()
+        totals = chunk.groupby("building", observed=True)["kwh"].agg(["sum", "count", "min", "max"])
+        self._combine(daily, weekly, totals)
+
+    def merge(self, other: "_RunningAggregates") -> None:
+        """
+        Fold another running state (e.g. one complete file) into this one.
+        """
+        if other.totals is not None:
+            self._combine(other.daily, other.weekly, other.totals)
+
+    def _combine(self, daily: pd.Series, weekly: pd.Series, totals: pd.DataFrame) -> None:
+        self.daily = self._add(self.daily, daily)
+        self.weekly = self._add(self.weekly, weekly)
+        if self.totals is None:
+            self.totals = totals
+        else:
+            combined = pd.concat([self.totals, totals])
+            self.totals = combined.groupby(level=0).agg(
+                {"sum": "sum", "count": "sum", "min": "min", "max": "max"}
+            )
+
+    def daily_frame(self) -> pd.DataFrame:
+        return expand_period_buckets(self.daily, "D", "daily_kwh")
+
+    def weekly_frame(self) -> pd.DataFrame:
+        return expand_period_buckets(self.weekly, "W", "weekly_kwh")
+
+    def summary_frame(self) -> pd.DataFrame:
+        columns = ["building", "total_kwh", "mean_kwh", "min_kwh", "max_kwh", "readings_count"]
+        if self.totals is None:
+            return pd.DataFrame(columns=columns)
+
+        totals = self.totals.sort_index()
+        summary = pd.DataFrame({
+            "building": totals.index,
+            "total_kwh": totals["sum"].values,
+            "mean_kwh": (totals["sum"] / totals["count"]).values,
+            "min_kwh": totals["min"].values,
+            "max_kwh": totals["max"].values,
+            "readings_count": totals["count"].astype(int).values,
+        })
+        return summary[columns]
+
+
+def _clean_chunk(
+    chunk: pd.DataFrame,
+    bad_lines: List[BadLine],
+    csv_file: Path,
+    first_line: int,
+    fmt: Optional[str] = None,
+    timezone: Optional[str] = None,
+    kwh_dtype: str = DEFAULT_KWH_DTYPE,
+) -> Tuple[pd.DataFrame, List[pd.DataFrame], Optional[str]]:
+    """
+    Apply the same cleaning as the batch path (clean_rows) to one chunk.
+
+    Returns the cleaned chunk, its rejects and the timestamp format used, so
+    the format detected on a file's first chunk can be reused for the rest.
+    """
+    chunk, rejects, fmt = clean_rows(chunk, bad_lines, csv_file.name, timezone, kwh_dtype, fmt, first_line)
+    if "building" not in chunk.columns:
+        chunk = chunk.assign(building=csv_file.stem)
+    return chunk[["building", "timestamp", "kwh"]], rejects, fmt
+
+
+@instrumented
+def stream_energy_aggregates(
+    data_dir: str = "data",
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    kwh_dtype: str = DEFAULT_KWH_DTYPE,
+    timezone: Optional[str] = None,
+    quarantine_path: Optional[str] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, List[str]]:
+    """
+    Streaming alternative to load_energy_data + the aggregation functions.
+
+    Reads each CSV in chunks of `chunksize` rows and folds every chunk into
+    running daily, weekly and per-building aggregates. The full combined
+    DataFrame is never built. A file's chunks are folded into a partial of
+    their own that is merged only once the whole file has been read, so a
+    file that fails partway contributes nothing, as in the batch path.
+
+    Rows are validated, reported and (with quarantine_path) quarantined
+    exactly as load_energy_data does; kwh_dtype and timezone mean the same too.
+
+    Returns:
+        daily: same layout as calculate_daily_totals.
+        weekly: same layout as calculate_weekly_aggregates.
+        summary: same layout as building_wise_summary.
+        error_logs: list of error messages for missing / corrupt files and rejected rows.
+    """
+    data_path = Path(data_dir)
+    if not data_path.exists():
+        raise FileNotFoundError(f"Data directory not found: {data_dir}")
+    if kwh_dtype not in KWH_DTYPES:
+        raise ValueError(f"kwh_dtype must be one of {KWH_DTYPES}, got {kwh_dtype!r}")
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be positive, got {chunksize}")
+    if is_reading_log(data_dir):
+        raise ValueError(f"{data_dir} is a reading log; load it with load_energy_data instead of streaming it.")
+
+    csv_files = sorted(f for f in data_path.iterdir() if f.suffix.lower() == ".csv")
+
+    running = _RunningAggregates()
+    error_logs: List[str] = []
+    all_rejects: List[pd.DataFrame] = []
+    files_loaded = 0
+
+    for csv_file in csv_files:
+        try:
+            fmt = None
+            file_running = _RunningAggregates()
+            file_rejects: List[pd.DataFrame] = []
+            # Line the next chunk's first row would sit on if no more lines were skipped
+            next_line = 2
+            loaded = False
+            for i, (chunk, bad_lines) in enumerate(iter_csv_pandas(csv_file, {}, chunksize)):
+                if i == 0:
+                    missing = [c for c in ("kwh", "timestamp") if c not in chunk.columns]
+                    if missing:
+                        msg = f"File {csv_file.name} missing '{missing[0]}' column. Skipped."
+                        error_logs.append(msg)
+                        logger.warning(msg)
+                        break
+                    loaded = True
+                n_lines = len(chunk) + len(bad_lines)
+                cleaned, rejects, fmt = _clean_chunk(
+                    chunk, bad_lines, csv_file, next_line, fmt, timezone, kwh_dtype
+                )
+                next_line += n_lines
+                file_rejects += rejects
+                file_running.fold(cleaned)
+            if loaded:
+                for _, msg in rejection_messages(csv_file.name, file_rejects):
+                    error_logs.append(msg)
+                    logger.warning(msg)
+                if file_rejects:
+                    all_rejects.append(pd.concat(file_rejects, ignore_index=True).sort_values(
+                        "line", kind="stable", na_position="last", ignore_index=True
+                    ))
+                running.merge(file_running)
+                files_loaded += 1
+
+        except FileNotFoundError:
+            msg = f"File not found: {csv_file}"
+            error_logs.append(msg)
+            logger.error(msg)
+        except pd.errors.EmptyDataError:
+            msg = f"Empty or invalid CSV file: {csv_file}"
+            error_logs.append(msg)
+            logger.warning(msg)
+        except Exception as e:
+            msg = f"Error reading {csv_file.name}: {e}"
+            error_logs.append(msg)
+            logger.exception(msg)
+
+    if quarantine_path is not None:
+        write_quarantine(all_rejects, quarantine_path)
+
+    if files_loaded == 0:
+        raise ValueError("No valid CSV files were loaded from the data directory.")
+
+    return running.daily_frame(), running.weekly_frame(), running.summary_frame(), error_logs
@@ -0,0 +1,180 @@
+# energy_dashboard/trends.py
+
+"""
+Least-squares trend fits for every building (and the campus) at once.
+
+fit_trends regresses each group's values on time and reports the slope
+(kWh per period), the fitted percent change over the group's span, the
+slope's t-statistic and R². All groups are fitted together from a handful
+of np.bincount sums, so the cost is a few passes over the rows however many
+buildings there are.
+
+A trend counts as increasing/decreasing only when |t| >= t_threshold
+(2.0 by default, roughly 95% confidence for a few weeks of daily data);
+otherwise it is reported as stable.
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+TREND_COLUMNS = ["points", "slope", "change_pct", "t_stat", "r_squared", "trend"]
+PERIOD_DAYS = {"D": 1, "W": 7}
+PERIOD_NAMES = {"D": "day", "W": "week"}
+
+_NS_PER_DAY = 86_400_000_000_000
+
+
+def _batched_fit(codes: np.ndarray, x: np.ndarray, y: np.ndarray, n_groups: int) -> dict:
+    """
+    Per-group simple linear regression of y on x; codes are group ids in [0, n_groups).
+    """
+    n = np.bincount(codes, minlength=n_groups).astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_x = np.bincount(codes, weights=x, minlength=n_groups) / n
+        mean_y = np.bincount(codes, weights=y, minlength=n_groups) / n
+        # Centered second pass keeps the sums well conditioned
+        dx = x - mean_x[codes]
+        dy = y - mean_y[codes]
+        sxx = np.bincount(codes, weights=dx * dx, minlength=n_groups)
+        sxy = np.bincount(codes, weights=dx * dy, minlength=n_groups)
+        syy = np.bincount(codes, weights=dy * dy, minlength=n_groups)
+        x_min = np.full(n_groups, np.inf)
+        x_max = np.full(n_groups, -np.inf)
+        np.minimum.at(x_min, codes, x)
+        np.maximum.at(x_max, codes, x)
+
+        slope = np.where(sxx > 0, sxy / sxx, np.nan)
+        sse = np.clip(syy - slope * sxy, 0.0, None)
+        std_err = np.sqrt(sse / (n - 2) / sxx)
+        t_stat = np.where(n > 2, slope / std_err, np.nan)
+        r_squared = np.where(syy > 0, 1.0 - sse / syy, np.nan)
+
+        fitted_start = mean_y + slope * (x_min - mean_x)
+        change = slope * (x_max - x_min)
+        change_pct = np.where(fitted_start > 0, 100.0 * change / fitted_start, np.nan)
+
+    return {
+        "points": n.astype(np.int64),
+        "slope": slope,
+        "change_pct": change_pct,
+        "t_stat": t_stat,
+        "r_squared": r_squared,
+    }
+
+
+def _classify(points: np.ndarray, t_stat: np.ndarray, min_points: int, t_threshold: float) -> np.ndarray:
+    trend = np.full(len(points), "stable", dtype=object)
+    trend[t_stat >= t_threshold] = "increasing"
+    trend[t_stat <= -t_threshold] = "decreasing"
+    trend[points < min_points] = "insufficient data"
+    return trend
+
+
+def fit_trends(
+    frame: pd.DataFrame,
+    value_col: str,
+    period: str = "D",
+    group_col: str = "building",
+    min_points: int = 3,
+    t_threshold: float = 2.0,
+) -> pd.DataFrame:
+    """
+    Fit value_col against 'timestamp' for every group_col value.
+
+    frame is in the layout of calculate_daily_totals / calculate_weekly_aggregates;
+    period ('D' or 'W') sets the slope unit to kWh per day or per week.
+    Returns one row per group with group_col and TREND_COLUMNS; groups with
+    fewer than min_points points get NaN fits and trend 'insufficient data'.
+    """
+    rows = frame.dropna(subset=[group_col, "timestamp", value_col])
+    if rows.empty:
+        return pd.DataFrame(columns=[group_col] + TREND_COLUMNS)
+
+    codes, groups = pd.factorize(rows[group_col], sort=True)
+    ts_ns = rows["timestamp"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+    # Periods since the earliest timestamp: small numbers, slope per period
+    x = (ts_ns - ts_ns.min()) / (_NS_PER_DAY * PERIOD_DAYS[period])
+    y = rows[value_col].to_numpy(dtype=np.float64)
+
+    fit = _batched_fit(codes, x, y, len(groups))
+    too_short = fit["points"] < min_points
+    for column in ("slope", "change_pct", "t_stat", "r_squared"):
+        fit[column][too_short] = np.nan
+    result = pd.DataFrame({group_col: np.asarray(groups, dtype=object), **fit})
+    result["trend"] = _classify(result["points"].to_numpy(), result["t_stat"].to_numpy(), min_points, t_threshold)
+    return result
+
+
+def campus_trend(frame: pd.DataFrame, value_col: str, period: str = "D", **kwargs) -> Optional[pd.Series]:
+    """
+    Trend of the campus total (value_col summed over buildings per timestamp),
+    or None if there is no data.
+    """
+    totals = frame.groupby("timestamp")[value_col].sum().reset_index()
+    if totals.empty:
+        return None
+    totals["building"] = "campus"
+    return fit_trends(totals, value_col, period, **kwargs).iloc[0]
+
+
+def add_trend_columns(summary: pd.DataFrame, daily_df: pd.DataFrame, weekly_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a copy of a building summary with daily and weekly slope, percent
+    change, t-statistic and trend label columns.
+    """
+    result = summary.copy()
+    buildings = summary["building"].astype(object)
+    for frame, value_col, period, prefix in (
+        (daily_df, "daily_kwh", "D", "daily"),
+        (weekly_df, "weekly_kwh", "W", "weekly"),
+    ):
+        fits = fit_trends(frame, value_col, period).set_index("building").reindex(buildings)
+        result[f"{prefix}_slope_kwh_per_{PERIOD_NAMES[period]}"] = fits["slope"].to_numpy()
+        result[f"{prefix}_change_pct"] = fits["change_pct"].to_numpy()
+        result[f"{prefix}_t_stat"] = fits["t_stat"].to_numpy()
+        result[f"{prefix}_trend"] = fits["trend"].fillna("insufficient data").to_numpy()
+    return result
+
+
+def _describe(fit, period: str, label: str) -> str:
+    unit = PERIOD_NAMES[period]
+    if fit is None or fit["trend"] == "insufficient data":
+        return f"Not enough data to determine {label} trends."
+    detail = (
+        f"{fit['slope']:+.2f} kWh/{unit}, {fit['change_pct']:+.1f}% over the period; "
+        f"t={fit['t_stat']:.1f}, R^2={fit['r_squared']:.2f}"
+    )
+    if fit["trend"] == "stable":
+        return f"Overall {label} consumption shows no significant trend ({detail})."
+    return f"Overall {label} consumption shows a significant {fit['trend']} trend ({detail})."
+
+
+def _top_movers(fits: pd.DataFrame, period: str, limit: int) -> List[str]:
+    """
+    Lines for the buildings with the largest significant percent changes.
+    """
+    moving = fits[fits["trend"].isin(["increasing", "decreasing"])]
+    moving = moving.loc[moving["change_pct"].abs().sort_values(ascending=False, kind="stable").index].head(limit)
+    unit = PERIOD_NAMES[period]
+    return [
+        f"- {row.building}: {row.trend}, {row.slope:+.2f} kWh/{unit} ({row.change_pct:+.1f}%, t={row.t_stat:.1f})"
+        for row in moving.itertuples(index=False)
+    ]
+
+
+def generate_trend_comments(daily_df: pd.DataFrame, weekly_df: pd.DataFrame, limit: int = 5) -> Tuple[str, str]:
+    """
+    Human-readable campus trend comments for the daily and weekly series, each
+    followed by the buildings with the strongest significant trends.
+    """
+    comments = []
+    for frame, value_col, period, label in (
+        (daily_df, "daily_kwh", "D", "daily"),
+        (weekly_df, "weekly_kwh", "W", "weekly"),
+    ):
+        lines = [_describe(campus_trend(frame, value_col, period), period, label)]
+        lines += _top_movers(fit_trends(frame, value_col, period), period, limit)
+        comments.append("\n".join(lines))
+    return comments[0], comments[1]
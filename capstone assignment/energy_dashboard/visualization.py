@@ -1,16 +1,78 @@
 # energy_dashboard/visualization.py
 
-from typing import Optional
+import math
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 
+from energy_dashboard.aggregation import rollup_window
+from energy_dashboard.instrumentation import instrumented
 
+# Fast mode defaults: points kept per series (about one per horizontal pixel
+# of a 6-inch axis at 100 dpi) and buildings drawn individually.
+DEFAULT_PIXEL_BUDGET = 600
+DEFAULT_TOP_N = 10
+OTHERS_LABEL = "others"
+
+
+def downsample_minmax(x: np.ndarray, y: np.ndarray, pixel_budget: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Shape-preserving downsampling for line plots.
+
+    Splits the series into pixel_budget // 2 equal-count buckets and keeps
+    the minimum and maximum point of each (in original order), so spikes and
+    dips stay visible. Series already within budget are returned unchanged.
+    """
+    n = len(y)
+    n_buckets = max(1, pixel_budget // 2)
+    if n <= pixel_budget:
+        return x, y
+
+    bucket = np.arange(n) * n_buckets // n
+    # Sorting by (bucket, y) puts each bucket's min first and max last
+    order = np.lexsort((y, bucket))
+    sorted_buckets = bucket[order]
+    starts = np.flatnonzero(np.r_[True, sorted_buckets[1:] != sorted_buckets[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    keep = np.unique(np.concatenate([order[starts], order[ends]]))
+    return x[keep], y[keep]
+
+
+def _top_buildings(totals: pd.Series, top_n: int) -> List[str]:
+    return list(totals.sort_values(ascending=False, kind="stable").index[:top_n])
+
+
+def _with_others(values: pd.Series, top: List[str], combine: str) -> pd.Series:
+    """
+    Keep per-building values for `top` and fold the rest into one 'others' entry.
+    """
+    values = values.copy()
+    values.index = values.index.astype(str)
+    rest = values[~values.index.isin(top)]
+    kept = values[values.index.isin(top)].reindex(top)
+    if rest.empty:
+        return kept
+    return pd.concat([kept, pd.Series({OTHERS_LABEL: getattr(rest, combine)()})])
+
+
+@instrumented
 def create_dashboard(
     daily_df: pd.DataFrame,
     weekly_df: pd.DataFrame,
     building_summary: pd.DataFrame,
     output_path: str = "output/dashboard.png",
+    rollups: Optional[Dict[str, pd.DataFrame]] = None,
+    start=None,
+    end=None,
+    max_points: int = 500,
+    fast: bool = False,
+    pixel_budget: int = DEFAULT_PIXEL_BUDGET,
+    top_n: int = DEFAULT_TOP_N,
 ) -> None:
     """
     Create a multi-chart dashboard:
@@ -18,7 +80,19 @@ def create_dashboard(
     - Bar chart: average weekly usage per building
     - Scatter plot: peak (max) daily usage per building
 
-    Saves the figure as dashboard.png.
+    If a rollup pyramid (see build_rollup_pyramid) is passed, the line chart
+    instead shows the [start, end) window at the finest level that fits in
+    max_points buckets, without touching raw readings.
+
+    With fast=True, rendering cost stays roughly flat as data grows: only the
+    top_n buildings by consumption are drawn individually, the rest collapse
+    into an 'others' min-max band (and an 'others' bar/point), and every line
+    is min/max-downsampled to pixel_budget points.
+
+    Saves the figure as dashboard.png (output_path may also be a binary file
+    object, which receives PNG bytes). Uses matplotlib's object-oriented API
+    (no pyplot global state), so it is safe to call from worker threads or
+    processes.
     """
     # Ensure required columns exist
     required_daily = {"timestamp", "building", "daily_kwh"}
@@ -29,22 +103,59 @@ def create_dashboard(
     if not required_weekly.issubset(weekly_df.columns):
         raise ValueError(f"weekly_df must contain columns: {required_weekly}")
 
-    fig, axes = plt.subplots(1, 3, figsize=(18, 5))
+    fig = Figure(figsize=(18, 5))
+    axes = fig.subplots(1, 3)
+
+    top = None
+    if fast:
+        totals = daily_df.groupby("building", observed=True)["daily_kwh"].sum()
+        totals.index = totals.index.astype(str)
+        top = _top_buildings(totals, top_n)
 
     # 1. Line chart - daily consumption over time for all buildings
     ax1 = axes[0]
-    for building, group in daily_df.groupby("building"):
-        ax1.plot(group["timestamp"], group["daily_kwh"], label=building)
-    ax1.set_title("Daily Consumption Over Time")
+    if rollups is not None:
+        level, series_df = rollup_window(rollups, start, end, max_points)
+        series_col = "sum_kwh"
+    else:
+        level, series_df, series_col = "daily", daily_df, "daily_kwh"
+
+    if fast:
+        series_df = series_df.assign(building=series_df["building"].astype(str))
+        is_top = series_df["building"].isin(top)
+        for building, group in series_df[is_top].groupby("building", sort=False):
+            x, y = downsample_minmax(group["timestamp"].to_numpy(), group[series_col].to_numpy(), pixel_budget)
+            ax1.plot(x, y, label=building, linewidth=0.8)
+        others = series_df[~is_top]
+        if not others.empty:
+            band = others.groupby("timestamp")[series_col].agg(["min", "max"])
+            x = band.index.to_numpy()
+            x_lo, low = downsample_minmax(x, band["min"].to_numpy(), pixel_budget)
+            x_hi, high = downsample_minmax(x, band["max"].to_numpy(), pixel_budget)
+            # Both envelopes on a common x grid for fill_between
+            grid = np.union1d(x_lo, x_hi)
+            low = band["min"].reindex(grid).to_numpy()
+            high = band["max"].reindex(grid).to_numpy()
+            n_others = others["building"].nunique()
+            ax1.fill_between(grid, low, high, color="grey", alpha=0.3,
+                             label=f"{OTHERS_LABEL} ({n_others} buildings, min-max)")
+    else:
+        for building, group in series_df.groupby("building", observed=True):
+            ax1.plot(group["timestamp"], group[series_col], label=building)
+    ax1.set_title(f"{level.capitalize()} Consumption Over Time")
     ax1.set_xlabel("Date")
-    ax1.set_ylabel("Daily kWh")
+    ax1.set_ylabel(f"{level.capitalize()} kWh")
     ax1.tick_params(axis="x", rotation=45)
     ax1.legend(fontsize=8)
 
     # 2. Bar chart - average weekly usage per building
     ax2 = axes[1]
-    weekly_mean = weekly_df.groupby("building")["weekly_kwh"].mean().reset_index()
-    ax2.bar(weekly_mean["building"], weekly_mean["weekly_kwh"])
+    weekly_mean = weekly_df.groupby("building", observed=True)["weekly_kwh"].mean()
+    if fast:
+        weekly_mean = _with_others(weekly_mean, top, "mean")
+    weekly_mean = weekly_mean.reset_index()
+    weekly_mean.columns = ["building", "weekly_kwh"]
+    ax2.bar(weekly_mean["building"].astype(str), weekly_mean["weekly_kwh"])
     ax2.set_title("Average Weekly Usage by Building")
     ax2.set_xlabel("Building")
     ax2.set_ylabel("Average Weekly kWh")
@@ -52,8 +163,12 @@ def create_dashboard(
 
     # 3. Scatter plot - peak daily consumption per building
     ax3 = axes[2]
-    peak_daily = daily_df.groupby("building")["daily_kwh"].max().reset_index()
-    ax3.scatter(peak_daily["building"], peak_daily["daily_kwh"])
+    peak_daily = daily_df.groupby("building", observed=True)["daily_kwh"].max()
+    if fast:
+        peak_daily = _with_others(peak_daily, top, "max")
+    peak_daily = peak_daily.reset_index()
+    peak_daily.columns = ["building", "daily_kwh"]
+    ax3.scatter(peak_daily["building"].astype(str), peak_daily["daily_kwh"])
     ax3.set_title("Peak Daily Consumption by Building")
     ax3.set_xlabel("Building")
     ax3.set_ylabel("Peak Daily kWh")
@@ -61,4 +176,124 @@ def create_dashboard(
 
     fig.tight_layout()
     fig.savefig(output_path, bbox_inches="tight")
-    plt.close(fig)
\ No newline at end of file
+
+
+def _safe_filename(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("._") or "building"
+
+
+def _render_building_dashboard(task: dict) -> str:
+    """
+    Render one building's 1x3 dashboard from its pre-sliced arrays.
+
+    Runs inside a worker process, so it only receives plain arrays and a
+    summary dict for its own building.
+    """
+    fig = Figure(figsize=(15, 4))
+    ax1, ax2, ax3 = fig.subplots(1, 3)
+
+    x, y = downsample_minmax(task["daily_ts"], task["daily_kwh"], task["pixel_budget"])
+    ax1.plot(x, y, linewidth=0.8)
+    ax1.set_title("Daily Consumption")
+    ax1.set_ylabel("Daily kWh")
+    ax1.tick_params(axis="x", rotation=45)
+
+    ax2.step(task["weekly_ts"], task["weekly_kwh"], where="pre", linewidth=0.8)
+    ax2.set_title("Weekly Consumption")
+    ax2.set_ylabel("Weekly kWh")
+    ax2.tick_params(axis="x", rotation=45)
+
+    ax3.axis("off")
+    lines = [f"{key}: {value:,.2f}" if isinstance(value, float) else f"{key}: {value}"
+             for key, value in task["summary"].items()]
+    ax3.text(0.0, 1.0, "\n".join(lines), va="top", family="monospace", fontsize=10)
+    ax3.set_title("Summary")
+
+    fig.suptitle(task["building"])
+    fig.tight_layout()
+    # Drop the version stamp so output bytes depend only on the data
+    fig.savefig(task["path"], metadata={"Software": None})
+    return task["path"]
+
+
+def _render_index(tasks: List[dict], path: str) -> str:
+    """
+    Small-multiples overview: one daily sparkline per building.
+    """
+    n = max(1, len(tasks))
+    cols = math.ceil(math.sqrt(n))
+    rows = math.ceil(n / cols)
+    fig = Figure(figsize=(2.4 * cols, 1.4 * rows))
+    axes = fig.subplots(rows, cols, squeeze=False).ravel()
+    for ax, task in zip(axes, tasks):
+        x, y = downsample_minmax(task["daily_ts"], task["daily_kwh"], 100)
+        ax.plot(x, y, linewidth=0.6)
+        ax.set_title(task["building"], fontsize=7)
+        ax.set_xticks([])
+        ax.tick_params(axis="y", labelsize=6)
+    for ax in axes[len(tasks):]:
+        ax.axis("off")
+    fig.tight_layout()
+    fig.savefig(path, metadata={"Software": None})
+    return path
+
+
+@instrumented
+def create_building_dashboards(
+    daily_df: pd.DataFrame,
+    weekly_df: pd.DataFrame,
+    building_summary: pd.DataFrame,
+    output_dir: str = "output/buildings",
+    max_workers: Optional[int] = None,
+    parallel: bool = True,
+    pixel_budget: int = DEFAULT_PIXEL_BUDGET,
+) -> List[str]:
+    """
+    Render one dashboard PNG per building plus an index.png overview.
+
+    Frames are split by building once in the parent; each worker process
+    gets only its own building's arrays. Buildings are rendered in sorted
+    order into '<output_dir>/<building>.png', so paths and file contents
+    are deterministic regardless of worker scheduling.
+
+    Returns the written paths: the index first, then one per building.
+    """
+    out_path = Path(output_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+
+    daily_by_building = {str(b): g for b, g in daily_df.groupby("building", observed=True)}
+    weekly_by_building = {str(b): g for b, g in weekly_df.groupby("building", observed=True)}
+    summaries = {
+        str(row["building"]): {k: v for k, v in row.items() if k != "building"}
+        for row in building_summary.to_dict("records")
+    }
+
+    tasks = []
+    used_names = set()
+    for building in sorted(daily_by_building):
+        filename = _safe_filename(building)
+        if filename in used_names:
+            filename = f"{filename}_{len(used_names)}"
+        used_names.add(filename)
+
+        daily = daily_by_building[building]
+        weekly = weekly_by_building.get(building, weekly_df.iloc[0:0])
+        tasks.append({
+            "building": building,
+            "path": str(out_path / f"{filename}.png"),
+            "daily_ts": daily["timestamp"].to_numpy(),
+            "daily_kwh": daily["daily_kwh"].to_numpy(),
+            "weekly_ts": weekly["timestamp"].to_numpy(),
+            "weekly_kwh": weekly["weekly_kwh"].to_numpy(),
+            "summary": summaries.get(building, {}),
+            "pixel_budget": pixel_budget,
+        })
+
+    if parallel and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            building_paths = list(pool.map(_render_building_dashboard, tasks))
+    else:
+        building_paths = [_render_building_dashboard(task) for task in tasks]
+
+    index_path = _render_index(tasks, str(out_path / "index.png"))
+    return [index_path] + building_paths
@@ -0,0 +1,435 @@
+# energy_dashboard/watch.py
+
+"""
+Watch mode: keep output/ current while CSVs are added to, changed in or
+removed from the data directory.
+
+Changes are noticed through inotify on Linux (called through libc, so no
+extra dependency) and by polling the directory elsewhere. A burst of changes
+is debounced into one update: only the changed files are re-read, only the
+buckets and buildings they touch are recomputed (see SourceAggregateStore),
+and then summary.txt, building_summary.csv and the quarantine file are
+rewritten as the `all` command writes them.
+
+Peaks, anomalies and rollups need the readings themselves, so they are kept
+per building and recomputed only for the buildings the changed files hold,
+from every file holding such a building; files that did not change are read
+again for that (from the ingestion cache with use_cache). No parsed frames
+are kept between updates. Daily and weekly sums are added up per file and
+coincident campus loads per building, so trend and peak figures can differ
+from `all` in the last digit.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import sys
+import time
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import pandas as pd
+
+from energy_dashboard.aggregation import ROLLUP_COLUMNS, ROLLUP_LEVELS, AggregationEngine
+from energy_dashboard.anomalies import ANOMALY_COLUMNS
+from energy_dashboard.cache import DEFAULT_CACHE_DIRNAME
+from energy_dashboard.ingestion import (
+    DEFAULT_KWH_DTYPE,
+    FileLoad,
+    combine_frames,
+    load_csv_file,
+    write_quarantine,
+)
+from energy_dashboard.peaks import PEAK_COLUMNS, campus_top_k, interval_totals, sum_interval_totals, top_intervals
+from energy_dashboard.readers import DEFAULT_READER, resolve_reader
+from energy_dashboard.store import SourceAggregateStore
+
+logger = logging.getLogger(__name__)
+
+# CSV path -> (mtime in ns, size in bytes)
+Snapshot = Dict[str, Tuple[int, int]]
+
+# inotify(7) events that can add, change or remove a file in the directory
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+
+def scan_directory(data_dir: str) -> Snapshot:
+    """
+    Stat every CSV file directly inside data_dir.
+    """
+    snapshot: Snapshot = {}
+    with os.scandir(data_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and Path(entry.name).suffix.lower() == ".csv":
+                st = entry.stat()
+                snapshot[entry.path] = (st.st_mtime_ns, st.st_size)
+    return snapshot
+
+
+def diff_snapshots(old: Snapshot, new: Snapshot) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Returns (added, modified, removed) paths, each sorted.
+    """
+    added = sorted(set(new) - set(old))
+    removed = sorted(set(old) - set(new))
+    modified = sorted(path for path in set(old) & set(new) if old[path] != new[path])
+    return added, modified, removed
+
+
+class _PollingWaiter:
+    """
+    Fallback notifier: sleeps and reports nothing, so every wakeup is followed by a rescan.
+    """
+
+    polling = True
+
+    def wait(self, timeout: float) -> bool:
+        time.sleep(timeout)
+        return False
+
+    def close(self) -> None:
+        pass
+
+
+class _InotifyWaiter:
+    """
+    Linux notifier: wait() returns True as soon as the directory reports an event.
+    """
+
+    polling = False
+
+    def __init__(self, data_dir: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        if libc.inotify_add_watch(self._fd, os.fsencode(data_dir), _WATCH_MASK) < 0:
+            err = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(err, os.strerror(err))
+
+    def wait(self, timeout: float) -> bool:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return False
+        # Drain the queue; the caller rescans the directory instead of decoding events
+        try:
+            while os.read(self._fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def _make_waiter(data_dir: str, use_inotify: bool):
+    if use_inotify and sys.platform.startswith("linux"):
+        try:
+            return _InotifyWaiter(data_dir)
+        except (OSError, AttributeError) as e:
+            logger.info("inotify unavailable (%s), polling '%s' instead", e, data_dir)
+    return _PollingWaiter()
+
+
+class BuildingResults(NamedTuple):
+    """
+    The reading-level results of one building: its anomaly events, top-K
+    peaks, campus interval_totals share and (None unless the dashboard is
+    rendered) rollup pyramid.
+    """
+
+    anomalies: pd.DataFrame
+    peaks: pd.DataFrame
+    intervals: pd.DataFrame
+    rollups: Optional[Dict[str, pd.DataFrame]]
+
+
+def _concat(frames: List[pd.DataFrame], columns: List[str]) -> pd.DataFrame:
+    frames = [frame for frame in frames if len(frame)]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+class _WatchedAggregates(AggregationEngine):
+    """
+    AggregationEngine over a SourceAggregateStore and per-building results
+    instead of the readings, so export_summary, save_report and the dashboard
+    are built as for the `all` command. Per-building frames are concatenated
+    in building order, which is the order the combined computations use.
+    """
+
+    def __init__(self, store: SourceAggregateStore, results: Dict[str, BuildingResults]):
+        super().__init__(None, store=store)
+        self.buildings = sorted(results)
+        self.results = [results[building] for building in self.buildings]
+
+    @cached_property
+    def rollups(self) -> Dict[str, pd.DataFrame]:
+        return {
+            level: _concat([result.rollups[level] for result in self.results], ROLLUP_COLUMNS)
+            for level in ROLLUP_LEVELS
+        }
+
+    @cached_property
+    def anomalies(self) -> pd.DataFrame:
+        return _concat([result.anomalies for result in self.results], ANOMALY_COLUMNS)
+
+    @cached_property
+    def peaks(self) -> pd.DataFrame:
+        return _concat([result.peaks for result in self.results], PEAK_COLUMNS)
+
+    @cached_property
+    def campus_peaks(self) -> pd.DataFrame:
+        # The campus-wide top K are among the buildings' top K
+        return campus_top_k(self.peaks)
+
+    @cached_property
+    def coincident_peaks(self) -> pd.DataFrame:
+        return top_intervals(sum_interval_totals([result.intervals for result in self.results]))
+
+    @cached_property
+    def loads_at_campus_peak(self) -> pd.Series:
+        if self.coincident_peaks.empty:
+            return pd.Series(dtype=float)
+        start = self.coincident_peaks["timestamp"].iloc[0]
+        loads = [
+            float(result.intervals.loc[result.intervals["timestamp"] == start, "kwh"].sum())
+            for result in self.results
+        ]
+        return pd.Series(loads, index=pd.Index(self.buildings, name="building"))
+
+
+class DataDirWatcher:
+    """
+    Keeps a SourceAggregateStore (one source per CSV file), each building's
+    BuildingResults and the outputs in sync with data_dir.
+
+    sync() applies whatever changed since the last call; run() loops forever,
+    waiting for changes and debouncing bursts until data_dir has been quiet
+    for `debounce` seconds. With dashboard=True the fast dashboard is also
+    re-rendered after each update.
+
+    Rows rejected while parsing are written to quarantine_path (default:
+    <output_dir>/quarantine.csv), replaced on every update.
+    """
+
+    def __init__(
+        self,
+        data_dir: str = "data",
+        output_dir: str = "output",
+        debounce: float = 1.0,
+        poll_interval: float = 2.0,
+        use_inotify: bool = True,
+        use_cache: bool = False,
+        kwh_dtype: str = DEFAULT_KWH_DTYPE,
+        timezone: Optional[str] = None,
+        reader: str = DEFAULT_READER,
+        quarantine_path: Optional[str] = None,
+        dashboard: bool = False,
+    ):
+        if not Path(data_dir).is_dir():
+            raise FileNotFoundError(f"Data directory not found: {data_dir}")
+        self.data_dir = data_dir
+        self.output_dir = output_dir
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.cache_dir = Path(data_dir) / DEFAULT_CACHE_DIRNAME if use_cache else None
+        self.kwh_dtype = kwh_dtype
+        self.timezone = timezone
+        self.reader = resolve_reader(reader)
+        self.quarantine_path = quarantine_path or str(Path(output_dir) / "quarantine.csv")
+        self.dashboard = dashboard
+        self.store = SourceAggregateStore()
+        # path -> the buildings the file holds and its rejected rows
+        self._buildings: Dict[str, Set[str]] = {}
+        self._rejects: Dict[str, pd.DataFrame] = {}
+        # building -> its reading-level results
+        self._results: Dict[str, BuildingResults] = {}
+        self._snapshot: Snapshot = {}
+
+    def _load(self, path: str) -> FileLoad:
+        load = load_csv_file(
+            Path(path),
+            cache_dir=self.cache_dir,
+            kwh_dtype=self.kwh_dtype,
+            timezone=self.timezone,
+            reader=self.reader,
+        )
+        if load.df is None:
+            return load
+        return load._replace(df=load.df.dropna(subset=["timestamp", "kwh", "building"]))
+
+    def _remove(self, path: str) -> Set[str]:
+        """
+        Forget a file; returns the buildings it held.
+        """
+        self.store.remove_source(path)
+        self._rejects.pop(path, None)
+        return self._buildings.pop(path, set())
+
+    def _reload(self, path: str, frames: Dict[str, pd.DataFrame]) -> Set[str]:
+        """
+        Re-read a file into the store (and its readings into frames); returns
+        the buildings it held before or holds now.
+        """
+        df, messages, rejects, _ = self._load(path)
+        for level, msg in messages:
+            logger.log(level, msg)
+        if df is None:
+            # A file that can no longer be read contributes nothing
+            touched = self._remove(path)
+        else:
+            self.store.replace_source(path, df)
+            frames[path] = df
+            touched = self._buildings.get(path, set())
+            self._buildings[path] = set(df["building"].unique())
+            touched = touched | self._buildings[path]
+        self._rejects[path] = rejects
+        return touched
+
+    def _refresh_buildings(self, buildings: Set[str], frames: Dict[str, pd.DataFrame]) -> None:
+        """
+        Recompute the BuildingResults of `buildings` from every file holding
+        them. frames holds the readings of the files read in this update;
+        other files holding one of the buildings are read again.
+
+        The buildings are computed together and the results split by building;
+        every result is grouped by building, so this equals one at a time.
+        """
+        for building in buildings:
+            self._results.pop(building, None)
+        parts = []
+        for path in sorted(p for p, held in self._buildings.items() if held & buildings):
+            df = frames[path] if path in frames else self._load(path).df
+            if df is not None:
+                parts.append(df[df["building"].isin(list(buildings))])
+        if not parts:
+            return
+
+        readings = combine_frames(parts)
+        engine = AggregationEngine(readings)
+
+        def by_building(frame: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+            groups = dict(list(frame.groupby("building", observed=True)))
+            return {building: groups.get(building, frame.iloc[:0]) for building in buildings}
+
+        anomalies, peaks = by_building(engine.anomalies), by_building(engine.peaks)
+        rollups = {level: by_building(frame) for level, frame in engine.rollups.items()} if self.dashboard else None
+        for building, group in readings.groupby("building", observed=True):
+            self._results[building] = BuildingResults(
+                anomalies=anomalies[building],
+                peaks=peaks[building],
+                intervals=interval_totals(group),
+                rollups={level: rollups[level][building] for level in rollups} if rollups else None,
+            )
+
+    def sync(self, snapshot: Optional[Snapshot] = None) -> bool:
+        """
+        Re-read added and modified files, drop removed ones and rewrite the
+        outputs. Returns False (and writes nothing) if nothing changed.
+        """
+        started = time.perf_counter()
+        if snapshot is None:
+            snapshot = scan_directory(self.data_dir)
+        added, modified, removed = diff_snapshots(self._snapshot, snapshot)
+        if not (added or modified or removed) and self._snapshot:
+            return False
+
+        frames: Dict[str, pd.DataFrame] = {}
+        touched: Set[str] = set()
+        for path in removed:
+            touched |= self._remove(path)
+        for path in added + modified:
+            touched |= self._reload(path, frames)
+        self._refresh_buildings(touched, frames)
+        self._snapshot = snapshot
+
+        self.write_outputs()
+        logger.info(
+            "Updated outputs in %.2fs (%d added, %d modified, %d removed)",
+            time.perf_counter() - started, len(added), len(modified), len(removed),
+        )
+        return True
+
+    def write_outputs(self) -> None:
+        """
+        Rewrite the quarantine file, building_summary.csv and summary.txt (and
+        the dashboard) from the store and the per-building results, through
+        the same builders as the `all` command.
+        """
+        from energy_dashboard.persistence import save_building_summary, save_report
+
+        rejects = [self._rejects[path] for path in sorted(self._rejects)]
+        write_quarantine(rejects, self.quarantine_path)
+        rejected = sum(len(frame) for frame in rejects)
+        if rejected:
+            logger.info("Rejected %d row(s); see %s", rejected, self.quarantine_path)
+
+        if not self._results:
+            logger.warning("No valid CSV files in '%s'; summaries not updated", self.data_dir)
+            return
+
+        aggregates = _WatchedAggregates(self.store, self._results)
+        save_building_summary(aggregates.export_summary, self.output_dir)
+        save_report(aggregates, self.output_dir)
+        if self.dashboard:
+            from energy_dashboard.visualization import create_dashboard
+
+            create_dashboard(
+                aggregates.daily,
+                aggregates.weekly,
+                aggregates.building_summary,
+                str(Path(self.output_dir) / "dashboard.png"),
+                rollups=aggregates.rollups,
+                fast=True,
+            )
+
+    def _settle(self, waiter, current: Snapshot) -> Snapshot:
+        """
+        Wait until data_dir has been quiet for `debounce` seconds; returns the final snapshot.
+        """
+        while True:
+            events = waiter.wait(self.debounce)
+            latest = scan_directory(self.data_dir)
+            if not events and latest == current:
+                return latest
+            current = latest
+
+    def run(self, max_updates: Optional[int] = None) -> None:
+        """
+        Sync once, then keep syncing on changes until interrupted (or after
+        max_updates updates following the initial one).
+        """
+        waiter = _make_waiter(self.data_dir, self.use_inotify)
+        logger.info(
+            "Watching '%s' (%s); press Ctrl+C to stop",
+            self.data_dir, "polling" if waiter.polling else "inotify",
+        )
+        updates = 0
+        try:
+            self.sync()
+            while max_updates is None or updates < max_updates:
+                events = waiter.wait(self.poll_interval)
+                if not events and not waiter.polling:
+                    continue
+                current = scan_directory(self.data_dir)
+                if current == self._snapshot:
+                    continue
+                if self.sync(self._settle(waiter, current)):
+                    updates += 1
+        except KeyboardInterrupt:
+            logger.info("Stopped watching '%s'", self.data_dir)
+        finally:
+            waiter.close()